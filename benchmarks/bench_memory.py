@@ -0,0 +1,47 @@
+"""Memory benchmark of the services of a beacon.
+
+Execute 'python benchmarks/bench_memory.py --help' for guidance.
+"""
+
+import argparse
+import tracemalloc
+from typing import List
+
+from mdns_beacon.beacon import Beacon
+
+PROPERTIES = {"path": "/index.html", "version": "1.0.0", "owner": "mdns-beacon"}
+
+
+def bench_memory(aliases: int) -> None:
+    """Print the memory used by a beacon with `aliases` aliases and its services."""
+    names = [f"sub{i}.example" for i in range(aliases)]
+    tracemalloc.start()
+    beacon = Beacon(aliases=names, properties=PROPERTIES)
+    beacon_size = tracemalloc.get_traced_memory()[0]
+    services = len(beacon.services)
+    total_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(
+        f"{services:>7} services, beacon {beacon_size / 2**20:8.2f} MiB, "
+        f"total {total_size / 2**20:8.2f} MiB, {total_size / services:7.0f} bytes per service"
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--aliases",
+        type=int,
+        nargs="+",
+        default=[1_000, 10_000, 100_000],
+        help="Number of aliases.",
+    )
+    args = parser.parse_args()
+    sizes: List[int] = args.aliases
+    for aliases in sizes:
+        bench_memory(aliases=aliases)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Microbenchmark of the services construction of a beacon.
+
+Execute 'python benchmarks/bench_services.py --help' for guidance.
+"""
+
+import argparse
+import timeit
+
+from mdns_beacon.beacon import Beacon, _build_host
+
+
+def bench_services(aliases: int, repeat: int) -> None:
+    """Print the best time to build the services of a beacon with `aliases` aliases."""
+    beacon = Beacon(aliases=[f"sub{i}.example" for i in range(aliases)])
+
+    def _build(clear_slugs: bool) -> None:
+        if clear_slugs:
+            _build_host.cache_clear()
+        beacon._services = None
+        assert len(beacon.services) == aliases  # noqa: S101
+
+    results = {
+        "cold (slugify)": min(timeit.repeat(lambda: _build(True), number=1, repeat=repeat)),
+        "warm (cached slugs)": min(timeit.repeat(lambda: _build(False), number=1, repeat=repeat)),
+        "cached services": min(timeit.repeat(lambda: beacon.services, number=1000, repeat=repeat))
+        / 1000,
+    }
+    for name, seconds in results.items():
+        print(f"{aliases} services, {name:<20} {seconds * 1e6:12.1f} us")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--aliases", type=int, default=10_000, help="Number of aliases.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of repetitions.")
+    args = parser.parse_args()
+    bench_services(aliases=args.aliases, repeat=args.repeat)
+
+
+if __name__ == "__main__":
+    main()
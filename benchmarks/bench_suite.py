@@ -0,0 +1,177 @@
+"""Benchmark suite of the beacons, the listener and the listen layout.
+
+Runs against zeroconf instances bound to the loopback interface only and
+writes the results as JSON, to compare releases.
+
+Execute 'python benchmarks/bench_suite.py --help' for guidance.
+"""
+
+import argparse
+import concurrent.futures
+import io
+import json
+import platform
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from importlib.metadata import version
+from typing import Any, Callable, Dict, List
+
+from rich.console import Console
+from rich.live import Live
+from zeroconf import IPVersion, ServiceInfo, ServiceStateChange, Zeroconf
+
+from mdns_beacon import __version__
+from mdns_beacon.beacon import Beacon
+from mdns_beacon.cli.layouts import ListenLayout
+from mdns_beacon.listener import BeaconListener
+from mdns_beacon.pool import zeroconf_pool
+
+LOOPBACK = ["127.0.0.1"]
+SERVICE_TYPE = "_bench._tcp.local."
+REFRESHES = 10
+
+
+def _beacon(aliases: int) -> Beacon:
+    """Build a beacon with `aliases` aliases served on the loopback interface."""
+    beacon = Beacon(aliases=[f"sub{i}.bench" for i in range(aliases)], type_="bench")
+    beacon._zeroconf = zeroconf_pool.acquire(ip_version=IPVersion.V4Only, interfaces=LOOPBACK)
+    return beacon
+
+
+def _result(
+    name: str, aliases: int, seconds: float, **extra: Any  # noqa: ANN401
+) -> Dict[str, Any]:
+    """Build a benchmark result, printing a human readable summary to stderr."""
+    print(f"{name:<24} {aliases:>6} aliases {seconds * 1e3:12.1f} ms", file=sys.stderr)
+    return {"name": name, "aliases": aliases, "seconds": seconds, **extra}
+
+
+def bench_register(aliases: int) -> List[Dict[str, Any]]:
+    """Time the registration (`Beacon._execute`) and unregistration (`Beacon.stop`)."""
+    beacon = _beacon(aliases)
+    start = time.perf_counter()
+    beacon._execute()
+    registered = time.perf_counter()
+    beacon.stop()
+    stopped = time.perf_counter()
+    return [
+        _result("register", aliases, registered - start, rate=aliases / (registered - start)),
+        _result(
+            "unregister", aliases, stopped - registered, rate=aliases / (stopped - registered)
+        ),
+    ]
+
+
+def bench_discovery(aliases: int, timeout: float) -> List[Dict[str, Any]]:
+    """Time the discovery of the services of a beacon by a listener."""
+    beacon = _beacon(aliases)
+    beacon._execute()
+    discovered = set()
+    done = threading.Event()
+
+    def _on_change(
+        zeroconf: Zeroconf, service_type: str, name: str, state_change: ServiceStateChange
+    ) -> None:
+        if state_change is ServiceStateChange.Added:
+            discovered.add(name)
+            if len(discovered) >= aliases:
+                done.set()
+
+    listener = BeaconListener(handlers=[_on_change], services=[SERVICE_TYPE])
+    listener._zeroconf = Zeroconf(interfaces=LOOPBACK, ip_version=IPVersion.V4Only)
+    try:
+        start = time.perf_counter()
+        listener._execute()
+        done.wait(timeout)
+        seconds = time.perf_counter() - start
+    finally:
+        listener.stop()
+        beacon.stop()
+    return [
+        _result(
+            "discovery",
+            aliases,
+            seconds,
+            discovered=len(discovered),
+            rate=len(discovered) / seconds,
+        )
+    ]
+
+
+def bench_render(aliases: int) -> List[Dict[str, Any]]:
+    """Time `ListenLayout` showing resolved services and refreshing the full table.
+
+    The services are resolved beforehand, to isolate the layout cost.
+    """
+    infos = Beacon(aliases=[f"sub{i}.bench" for i in range(aliases)], type_="bench").services
+    console = Console(file=io.StringIO(), width=200, force_terminal=True)
+    results = []
+    with Live(
+        console=console, auto_refresh=False, redirect_stdout=False, redirect_stderr=False
+    ) as live:
+        layout = ListenLayout(live=live)
+
+        def _update(info: ServiceInfo) -> None:
+            resolved: "concurrent.futures.Future[Any]" = concurrent.futures.Future()
+            resolved.set_result(info)
+            layout._on_resolved(resolved)
+
+        results.append(_timed("render update", aliases, infos, _update))
+        results.append(
+            _timed("render refresh", aliases, infos[:REFRESHES], lambda info: live.refresh())
+        )
+        layout.scheduler.cancel()
+    return results
+
+
+def _timed(
+    name: str, aliases: int, infos: List[ServiceInfo], call: Callable[[ServiceInfo], None]
+) -> Dict[str, Any]:
+    """Time a call per service."""
+    start = time.perf_counter()
+    for info in infos:
+        call(info)
+    seconds = time.perf_counter() - start
+    return _result(name, aliases, seconds, calls=len(infos), per_call=seconds / len(infos))
+
+
+def run(aliases: List[int], timeout: float) -> Dict[str, Any]:
+    """Run the suite for each number of aliases."""
+    results = []
+    for count in aliases:
+        results.extend(bench_register(count))
+        results.extend(bench_discovery(count, timeout=timeout))
+        results.extend(bench_render(count))
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "mdns_beacon": __version__,
+        "zeroconf": version("zeroconf"),
+        "results": results,
+    }
+
+
+def main() -> None:
+    """Run the benchmark suite."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--aliases", type=int, nargs="+", default=[10, 100], help="Number of aliases."
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=30, help="Maximum discovery time (in seconds)."
+    )
+    parser.add_argument("--output", help="JSON results file (default: stdout).")
+    args = parser.parse_args()
+    report = json.dumps(run(aliases=args.aliases, timeout=args.timeout), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf8") as output:
+            output.write(report)
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
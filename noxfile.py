@@ -12,7 +12,7 @@ python_versions = ["3.10", "3.11", "3.12"]
 @session(python=python_versions)
 def tests(session: Session) -> None:
     """Run the test suite."""
-    session.install(".")
+    session.install(".[yaml]")
     session.install(
         "invoke",
         "pytest",
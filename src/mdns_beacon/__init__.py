@@ -1,8 +1,34 @@
-"""Top-level package for mdns-beacon."""
+"""Top-level package for mdns-beacon.
 
-from .beacon import Beacon  # noqa: F401
-from .listener import BeaconListener  # noqa: F401
+`Beacon` and `BeaconListener` are imported on first access (PEP 562), so
+importing the package (e.g. for `__version__`) does not load zeroconf.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .beacon import Beacon
+    from .listener import BeaconListener
 
 __author__ = """Federico Jaureguialzo"""
 __email__ = "fedejaure@gmail.com"
 __version__ = "1.0.0"
+
+__all__ = ["Beacon", "BeaconListener"]
+
+_LAZY_ATTRIBUTES = {"Beacon": ".beacon", "BeaconListener": ".listener"}
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Import the lazy attributes of the package on first access."""
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """List the attributes of the package, the lazy ones included."""
+    return sorted({*globals(), *_LAZY_ATTRIBUTES})
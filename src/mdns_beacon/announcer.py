@@ -0,0 +1,273 @@
+"""mDNS announcer module."""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Union
+
+from zeroconf import DNSOutgoing, ServiceInfo, Zeroconf
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Times each announcement is sent, same as zeroconf (RFC 6762 section 8.3)
+_BROADCASTS = 3
+# Same values as the private ones in `zeroconf.const`, which may change without notice
+_FLAGS_QR_RESPONSE = 0x8000
+_FLAGS_AA = 0x0400
+# Time between the announcements and between the goodbyes (in milliseconds)
+_REGISTER_TIME = 225
+_UNREGISTER_TIME = 125
+
+
+def add_broadcast_answers(
+    out: DNSOutgoing,
+    info: ServiceInfo,
+    ttl: Optional[int] = None,
+    broadcast_addresses: bool = True,
+) -> None:
+    """Add the records of a service to an outgoing message.
+
+    Args:
+        out: Outgoing message.
+        info: Service to announce.
+        ttl: TTL override for all the records (`0` to say goodbye).
+        broadcast_addresses: Whether to add the address records.
+    """
+    out.add_answer_at_time(info.dns_pointer(override_ttl=ttl), 0)
+    out.add_answer_at_time(info.dns_service(override_ttl=ttl), 0)
+    out.add_answer_at_time(info.dns_text(override_ttl=ttl), 0)
+    if broadcast_addresses:
+        for record in info.get_address_and_nsec_records(override_ttl=ttl):
+            out.add_answer_at_time(record, 0)
+
+
+def generate_broadcast(infos: Iterable[ServiceInfo], ttl: Optional[int] = None) -> DNSOutgoing:
+    """Generate a single outgoing message announcing many services.
+
+    Args:
+        infos: Services to announce.
+        ttl: TTL override for all the records (`0` to say goodbye).
+
+    Returns:
+        Outgoing message with the records of all the services.
+    """
+    out = DNSOutgoing(_FLAGS_QR_RESPONSE | _FLAGS_AA)
+    for info in infos:
+        add_broadcast_answers(out, info, ttl=ttl)
+    return out
+
+
+async def async_send_burst(zeroconf: Zeroconf, out: DNSOutgoing, interval: int) -> None:
+    """Send an outgoing message the protocol-mandated number of times.
+
+    The message is split into as few packets as fit in the MTU by zeroconf.
+
+    Args:
+        zeroconf: Zeroconf instance.
+        out: Outgoing message.
+        interval: Time between sends (in milliseconds).
+    """
+    for i in range(_BROADCASTS):
+        if i != 0:
+            await asyncio.sleep(interval / 1000)
+        zeroconf.async_send(out)
+
+
+async def async_bulk_unregister(zeroconf: Zeroconf, infos: Iterable[ServiceInfo]) -> None:
+    """Unregister many services sending all their goodbyes in a single burst.
+
+    Must be called from the zeroconf event loop.
+
+    Args:
+        zeroconf: Zeroconf instance.
+        infos: Services to unregister, the ones that are not registered
+            are skipped.
+    """
+    registry = zeroconf.registry
+    registered: List[ServiceInfo] = [
+        info for info in infos if registry.async_get_info_name(info.key) is not None
+    ]
+    if not registered:
+        return
+    registry.async_remove(registered)
+
+    out = DNSOutgoing(_FLAGS_QR_RESPONSE | _FLAGS_AA)
+    for info in registered:
+        # Keep the address records alive if another service still uses the same server
+        shared = bool(info.server_key and registry.async_get_infos_server(info.server_key))
+        add_broadcast_answers(out, info, ttl=0, broadcast_addresses=not shared)
+    logger.debug(
+        "Sending goodbyes for %(services_len)s services", {"services_len": len(registered)}
+    )
+    await async_send_burst(zeroconf, out, _UNREGISTER_TIME)
+
+
+class Announcer:
+    """mDNS announcement scheduler.
+
+    Probes services concurrently and groups the records of all of them in
+    shared DNS responses, for both the initial announcement and the periodic
+    re-announcement.
+
+    Note:
+        All the coroutines must run in the zeroconf event loop.
+
+    Attributes:
+        zeroconf: Zeroconf instance.
+        max_concurrency: Maximum number of services probed at the same time.
+        reannounce_interval: Amount of time between periodic re-announcements
+            (in seconds, `0` disables them).
+    """
+
+    _reannounce_task: Optional["asyncio.Task[None]"] = None
+
+    def __init__(
+        self,
+        zeroconf: Zeroconf,
+        max_concurrency: int = 32,
+        reannounce_interval: Union[int, float] = 0,
+    ) -> None:
+        """Init an announcer.
+
+        Args:
+            zeroconf: Zeroconf instance.
+            max_concurrency: Maximum number of services probed at the same time.
+            reannounce_interval: Amount of time between periodic re-announcements
+                (in seconds, `0` disables them).
+        """
+        self.zeroconf = zeroconf
+        self.max_concurrency = max_concurrency
+        self.reannounce_interval = reannounce_interval
+        self._infos: Dict[str, ServiceInfo] = {}
+
+    @property
+    def infos(self) -> List[ServiceInfo]:
+        """Services registered through the announcer."""
+        return list(self._infos.values())
+
+    async def _async_probe(
+        self, info: ServiceInfo, semaphore: asyncio.Semaphore, added: List[ServiceInfo]
+    ) -> None:
+        """Check the network for a unique service name and add it to the registry.
+
+        Args:
+            info: Service to probe.
+            semaphore: Semaphore bounding the number of concurrent probes.
+            added: Services added to the registry, `info` is appended once added.
+        """
+        start = time.perf_counter() if metrics.enabled else 0.0
+        async with semaphore:
+            logger.debug("Registering %(service_name)s", {"service_name": info.name})
+            info.set_server_if_missing()
+            await self.zeroconf.async_check_service(info, allow_name_change=False)
+            self.zeroconf.registry.async_add(info)
+            self._infos[info.key] = info
+            added.append(info)
+        if metrics.enabled:
+            metrics.registration_seconds.observe(time.perf_counter() - start, "register")
+            metrics.services_registered.inc()
+
+    async def async_register(self, infos: Iterable[ServiceInfo]) -> None:
+        """Register services and announce all of them together.
+
+        If any of the services fails to register, the ones already added to the
+        registry are removed before raising the error.
+
+        Args:
+            infos: Services to register.
+        """
+        infos = list(infos)
+        await self.zeroconf.async_wait_for_start()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        added: List[ServiceInfo] = []
+        try:
+            results = await asyncio.gather(
+                *(self._async_probe(info, semaphore, added) for info in infos),
+                return_exceptions=True,
+            )
+            errors = [result for result in results if isinstance(result, BaseException)]
+            if errors:
+                raise errors[0]
+        except BaseException:
+            self._rollback(added)
+            raise
+        await self.async_announce(infos)
+        if self.reannounce_interval and self._infos and not self._reannounce_task:
+            self._reannounce_task = asyncio.ensure_future(self._async_reannounce_forever())
+
+    def _rollback(self, infos: List[ServiceInfo]) -> None:
+        """Remove services that were added to the registry but never announced.
+
+        Args:
+            infos: Services to remove.
+        """
+        if not infos:
+            return
+        logger.debug(
+            "Rolling back %(services_len)s registered services", {"services_len": len(infos)}
+        )
+        self.zeroconf.registry.async_remove(infos)
+        for info in infos:
+            self._infos.pop(info.key, None)
+        if metrics.enabled:
+            metrics.services_registered.dec(amount=len(infos))
+
+    async def async_announce(self, infos: Optional[Iterable[ServiceInfo]] = None) -> None:
+        """Announce services in a single burst.
+
+        Args:
+            infos: Services to announce, defaults to all the registered ones.
+        """
+        infos = self.infos if infos is None else list(infos)
+        if infos:
+            await async_send_burst(self.zeroconf, generate_broadcast(infos), _REGISTER_TIME)
+
+    async def _async_reannounce_forever(self) -> None:
+        """Re-announce all the registered services periodically."""
+        while True:
+            await asyncio.sleep(self.reannounce_interval)
+            logger.debug(
+                "Re-announcing %(services_len)s services", {"services_len": len(self._infos)}
+            )
+            self.zeroconf.async_send(generate_broadcast(self.infos))
+
+    async def async_update(self, infos: Iterable[ServiceInfo]) -> None:
+        """Update registered services and announce all of them together.
+
+        Args:
+            infos: Services to update, with the same names as the registered ones.
+        """
+        infos = list(infos)
+        start = time.perf_counter() if metrics.enabled else 0.0
+        for info in infos:
+            logger.debug("Updating %(service_name)s", {"service_name": info.name})
+            info.set_server_if_missing()
+            self.zeroconf.registry.async_update(info)
+            self._infos[info.key] = info
+        await self.async_announce(infos)
+        if metrics.enabled and infos:
+            metrics.registration_seconds.observe(time.perf_counter() - start, "update")
+
+    async def async_unregister(self, infos: Iterable[ServiceInfo]) -> None:
+        """Unregister services sending their goodbyes in a single burst.
+
+        Args:
+            infos: Services to unregister.
+        """
+        infos = list(infos)
+        start = time.perf_counter() if metrics.enabled else 0.0
+        removed = sum(self._infos.pop(info.key, None) is not None for info in infos)
+        if not self._infos:
+            self.cancel()
+        await async_bulk_unregister(self.zeroconf, infos)
+        if metrics.enabled and removed:
+            metrics.registration_seconds.observe(time.perf_counter() - start, "unregister")
+            metrics.services_registered.dec(amount=removed)
+
+    def cancel(self) -> None:
+        """Cancel the periodic re-announcements."""
+        if self._reannounce_task:
+            self._reannounce_task.cancel()
+            self._reannounce_task = None
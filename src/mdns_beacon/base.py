@@ -1,50 +1,129 @@
 """Base mDNS Beacon module."""
 
 import asyncio
+import contextlib
 import logging
+import signal
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, Coroutine, Iterable, Optional, TypeVar
 
-from zeroconf import IPVersion, Zeroconf
+from zeroconf import InterfacesType, IPVersion, Zeroconf
+
+from .interfaces import select_interfaces
+from .pool import zeroconf_pool
+from .tracing import traced
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+B = TypeVar("B", bound="BaseBeacon")
+
 
 class BaseBeacon(ABC):
     """mDNS Beacon base class.
 
     Note:
-        Derived beacons must override the `_execute` method.
+        Derived beacons must override the `_execute` method, and may
+        override `async_start` to start from the event loop.
+
+        Beacons with the same IP version and interfaces share a zeroconf
+        instance, see `mdns_beacon.pool.ZeroconfPool`.
 
     Attributes:
         ip_version: IP protocol version to use.
+        interfaces: Network interface names, addresses or networks (CIDR
+            notation) to use, or `default` (all the interfaces if empty), see
+            `mdns_beacon.interfaces.select_interfaces`.
     """
 
     _zeroconf: Optional[Zeroconf] = None
 
-    def __init__(self, ip_version: Optional[IPVersion] = None) -> None:
+    def __init__(
+        self, ip_version: Optional[IPVersion] = None, *, interfaces: Optional[Iterable[str]] = None
+    ) -> None:
         """Init a mDNS Beacon instance.
 
         Args:
             ip_version: IP protocol version to use.
+            interfaces: Network interface names, addresses or networks (CIDR
+                notation) to use, or `default` (all the interfaces if empty).
         """
         self.ip_version = ip_version
+        self.interfaces = list(interfaces or [])
+
+    def _select_interfaces(self) -> InterfacesType:
+        """Select the network interfaces of the zeroconf instance.
+
+        Returns:
+            Zeroconf interface choice or interface addresses list.
+        """
+        return select_interfaces(self.interfaces, self.ip_version)
 
     @property
     def zeroconf(self) -> Zeroconf:
         """Zeroconf instance."""
         if not self._zeroconf:
-            self._zeroconf = Zeroconf(ip_version=self.ip_version)
+            self._zeroconf = zeroconf_pool.acquire(
+                ip_version=self.ip_version, interfaces=self._select_interfaces()
+            )
         return self._zeroconf
 
+    def _run_coroutine(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine in the zeroconf event loop and wait for its result.
+
+        Args:
+            coro: Coroutine to run.
+
+        Returns:
+            The coroutine result.
+        """
+        loop = self.zeroconf.loop
+        if loop is None:  # pragma: no cover
+            coro.close()
+            raise RuntimeError("Zeroconf event loop is not running")
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    async def _async_run_coroutine(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine in the zeroconf event loop, from a running event loop.
+
+        The coroutine is awaited directly when zeroconf runs in the caller
+        event loop, otherwise it is handed off to the zeroconf one.
+
+        Args:
+            coro: Coroutine to run.
+
+        Returns:
+            The coroutine result.
+        """
+        loop = self.zeroconf.loop
+        if loop is None:  # pragma: no cover
+            coro.close()
+            raise RuntimeError("Zeroconf event loop is not running")
+        if loop is asyncio.get_running_loop():
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    @traced()
     def stop(self) -> None:
         """Stop Beacon.
 
-        Ends zeroconf background threads, and prevent zeroconf instance from
-        servicing further queries.
+        Release the zeroconf instance, which ends its background threads and
+        stops servicing further queries once no other beacon uses it.
         """
         logger.debug("Stoping zeroconf")
-        self.zeroconf.close()
+        if self._zeroconf:
+            zeroconf_pool.release(self._zeroconf)
+        self._zeroconf = None
+
+    async def async_stop(self) -> None:
+        """Stop Beacon from a running event loop.
+
+        Asynchronous counterpart of `stop`, to be used when zeroconf runs in
+        the caller event loop.
+        """
+        logger.debug("Stoping zeroconf")
+        if self._zeroconf:
+            await zeroconf_pool.async_release(self._zeroconf)
         self._zeroconf = None
 
     @abstractmethod
@@ -54,13 +133,57 @@ class BaseBeacon(ABC):
         Method that derived beacons must override.
         """
 
-    def run_forever(self) -> None:
-        """Run beacon forever."""
-        self._execute()
-        logger.debug("Starting forever loop")
-        loop = asyncio.get_event_loop()
+    async def async_start(self) -> None:
+        """Start Beacon from a running event loop.
+
+        Executes the beacon work in a worker thread.
+        """
+        await asyncio.get_running_loop().run_in_executor(None, self._execute)
+
+    async def __aenter__(self: B) -> B:
+        """Start Beacon from a running event loop, see `serve`."""
+        await self._async_run_coroutine(self.async_start())
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Stop Beacon from a running event loop."""
+        loop = self._zeroconf.loop if self._zeroconf else None
+        if loop is None or loop is asyncio.get_running_loop():
+            await self.async_stop()
+        else:
+            # Zeroconf runs in its own thread, stopping blocks until done
+            await asyncio.get_running_loop().run_in_executor(None, self.stop)
+
+    async def serve(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Run Beacon in the running event loop until cancelled, or `stop` is set.
+
+        Zeroconf runs in the caller event loop, unless the beacon already
+        uses an instance running in its own thread.
+
+        Args:
+            stop: Event stopping the beacon once set.
+        """
+        async with self:
+            await (stop or asyncio.Event()).wait()
+
+    async def _async_run_forever(self) -> None:
+        """Serve Beacon until SIGTERM."""
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        # Signal handlers can only be set from the main thread, and not on Windows
+        with contextlib.suppress(NotImplementedError, RuntimeError):
+            loop.add_signal_handler(signal.SIGTERM, stop.set)
         try:
-            loop.run_forever()
+            await self.serve(stop)
         finally:
-            loop.run_until_complete(loop.shutdown_asyncgens())
-            loop.close()
+            with contextlib.suppress(NotImplementedError, RuntimeError):
+                loop.remove_signal_handler(signal.SIGTERM)
+
+    def run_forever(self) -> None:
+        """Run Beacon forever, from a new event loop shared with zeroconf.
+
+        SIGTERM stops the beacon, as SIGINT does before raising
+        `KeyboardInterrupt`.
+        """
+        logger.debug("Starting forever loop")
+        asyncio.run(self._async_run_forever())
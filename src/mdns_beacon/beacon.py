@@ -1,21 +1,62 @@
 """Beacon module."""
 
 import logging
-import time
+import sys
+from functools import lru_cache
 from ipaddress import IPv4Address, IPv6Address, ip_address
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, ClassVar, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
 
 from slugify import slugify
 from typing_extensions import Literal
-from zeroconf import IPVersion, ServiceInfo
+from zeroconf import InterfacesType, IPVersion, ServiceInfo
 
+from .announcer import Announcer
 from .base import BaseBeacon
+from .interfaces import select_interfaces
+from .readiness import readiness_gate
+from .tracing import traced
 
 logger = logging.getLogger(__name__)
 
 PROTOCOL = Literal["tcp", "udp"]
 
 
+@lru_cache(maxsize=2**14)
+def _build_host(name: str, separator: str, regex_pattern: str) -> str:
+    """Build the fully qualified host name for a given name (memoized).
+
+    Args:
+        name: Service name.
+        separator: Slug separator.
+        regex_pattern: Slug regex pattern of the characters to replace.
+
+    Returns:
+        Fully qualified service host name.
+    """
+    slug = slugify(name, separator=separator, regex_pattern=regex_pattern)
+    return f"{slug}.local."
+
+
+def _service_signature(info: ServiceInfo) -> Tuple[Any, ...]:
+    """Get the announced content of a service, to detect changes between services.
+
+    Args:
+        info: Service info.
+
+    Returns:
+        Tuple with the service records content.
+    """
+    return (
+        info.server,
+        info.port,
+        info.weight,
+        info.priority,
+        info.host_ttl,
+        info.text,
+        tuple(sorted(info.addresses_by_version(IPVersion.All))),
+    )
+
+
 class Beacon(BaseBeacon):
     """mDNS Beacon.
 
@@ -29,15 +70,45 @@ class Beacon(BaseBeacon):
         weight: Weight of the service.
         priority: Priority of the service.
         properties: Dict of properties (or a bytes object with the content of the `text` field).
-        delay_startup: Amount of time to wait before trying to start
-            the zeroconf service (in seconds).
+        delay_startup: Maximum amount of time to wait for the addresses
+            to be bindable before trying to start the zeroconf service
+            (in seconds).
+        max_concurrency: Maximum number of services registered at the
+            same time.
+        reannounce_interval: Amount of time between periodic re-announcements
+            of the services (in seconds, `0` disables them).
+        interfaces: Network interface names, addresses or networks (CIDR
+            notation) to use, or `default` (all the interfaces if empty).
         *args: Variable length argument list.
         **kwargs: Arbitrary keyword arguments.
+
+    Note:
+        Assigning any of the attributes the services are built from drops
+        the services cache, in place changes (e.g. `aliases.add`) do not.
+
+        The services are announced only on the interfaces on the same subnet
+        as any of the `addresses` (on all the selected interfaces if none is),
+        as of the beacon start.
     """
 
     _SLUG_REGEX_PATTERN = r"[^-a-z0-9_.]+"
     _SLUG_SEPARATOR = "-"
+    _SERVICE_ATTRIBUTES: ClassVar[FrozenSet[str]] = frozenset(
+        {
+            "aliases",
+            "addresses",
+            "port",
+            "type_",
+            "protocol",
+            "ttl",
+            "weight",
+            "priority",
+            "properties",
+        }
+    )
+    # None until the services are built, an empty list is a valid cache
     _services: Optional[List[ServiceInfo]] = None
+    _announcer: Optional[Announcer] = None
 
     def __init__(
         self,
@@ -52,6 +123,9 @@ class Beacon(BaseBeacon):
         properties: Optional[Union[bytes, Dict[str, Any]]] = None,
         delay_startup: int = 0,
         *args: Optional[IPVersion],
+        max_concurrency: int = 32,
+        reannounce_interval: Union[int, float] = 0,
+        interfaces: Optional[Iterable[str]] = None,
         **kwargs: Optional[IPVersion],
     ) -> None:
         """Init a mDNS Beacon instance.
@@ -67,12 +141,19 @@ class Beacon(BaseBeacon):
             priority: Priority of the service.
             properties: Dict of properties (or a bytes object with the
                 content of the `text` field) of the service.
-            delay_startup: Amount of time to wait before trying to start
-                the zeroconf service (in seconds).
+            delay_startup: Maximum amount of time to wait for the addresses
+                to be bindable before trying to start the zeroconf service
+                (in seconds).
+            max_concurrency: Maximum number of services registered at the
+                same time.
+            reannounce_interval: Amount of time between periodic re-announcements
+                of the services (in seconds, `0` disables them).
+            interfaces: Network interface names, addresses or networks (CIDR
+                notation) to use, or `default` (all the interfaces if empty).
             *args: Variable length argument list.
             **kwargs: Arbitrary keyword arguments.
         """
-        super().__init__(*args, **kwargs)
+        super().__init__(*args, interfaces=interfaces, **kwargs)
         self.aliases = set(aliases or [])
         self.addresses = set(addresses or [ip_address("127.0.0.1")])
         self.port = port
@@ -83,6 +164,24 @@ class Beacon(BaseBeacon):
         self.priority = priority
         self.properties = properties or b""
         self.delay_startup = delay_startup
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be greater than 0")
+        self.max_concurrency = max_concurrency
+        self.reannounce_interval = reannounce_interval
+
+    def __setattr__(self, name: str, value: object) -> None:
+        """Set an attribute, dropping the services cache if they are built from it."""
+        super().__setattr__(name, value)
+        if name in self._SERVICE_ATTRIBUTES:
+            super().__setattr__("_services", None)
+
+    def _select_interfaces(self) -> InterfacesType:
+        """Select the network interfaces on the same subnet as the beacon addresses.
+
+        Returns:
+            Zeroconf interface choice or interface addresses list.
+        """
+        return select_interfaces(self.interfaces, self.ip_version, self.addresses)
 
     def _build_service_host(self, name: str) -> str:
         """Build service host for a given name.
@@ -93,10 +192,7 @@ class Beacon(BaseBeacon):
         Returns:
             Fully qualified service host name.
         """
-        slug = slugify(
-            name, separator=self._SLUG_SEPARATOR, regex_pattern=self._SLUG_REGEX_PATTERN
-        )
-        return f"{slug}.local."
+        return _build_host(name, self._SLUG_SEPARATOR, self._SLUG_REGEX_PATTERN)
 
     def _build_service_name(self, name: str) -> str:
         """Build service name for a given name.
@@ -116,45 +212,217 @@ class Beacon(BaseBeacon):
 
     @property
     def services(self) -> List[ServiceInfo]:
-        """Services to register on the local network."""
-        if not self._services:
-            self._services = [
-                ServiceInfo(
-                    type_=self.service_type,
+        """Services to register on the local network.
+
+        All the services are built together on first access, as they are
+        registered together. They share the same type string, TXT buffer
+        (encoded by zeroconf for the first service) and address objects, but
+        each `ServiceInfo` keeps its own addresses lists.
+        """
+        if self._services is None:
+            service_type = sys.intern(self.service_type)
+            addresses = [addr.packed for addr in self.addresses]
+            text: Union[bytes, Dict[str, Any]] = self.properties
+            services = []
+            for alias in self.aliases:
+                info = ServiceInfo(
+                    type_=service_type,
                     name=self._build_service_name(alias),
-                    parsed_addresses=[str(addr) for addr in self.addresses],
+                    addresses=addresses,
                     port=self.port,
                     host_ttl=self.ttl,
                     weight=self.weight,
                     priority=self.priority,
-                    properties=self.properties,
+                    properties=text,
                     server=self._build_service_host(alias),
                 )
-                for alias in self.aliases
-            ]
+                text = info.text
+                services.append(info)
+            self._services = services
         return self._services
 
+    @property
+    def announcer(self) -> Announcer:
+        """Announcement scheduler of the beacon services."""
+        if not self._announcer:
+            self._announcer = Announcer(
+                self.zeroconf,
+                max_concurrency=self.max_concurrency,
+                reannounce_interval=self.reannounce_interval,
+            )
+        return self._announcer
+
+    async def async_register_services(self) -> None:
+        """Register all the services on the local network concurrently.
+
+        The services are announced together, packing their records in as few
+        packets as possible.
+        """
+        logger.info("Registering %(services_len)s services", {"services_len": len(self.aliases)})
+        await self.announcer.async_register(self.services)
+
+    async def async_unregister_services(self) -> None:
+        """Unregister all the announced services with a single goodbye burst."""
+        services = self.announcer.infos
+        logger.info("Unregistering %(services_len)s services", {"services_len": len(services)})
+        await self.announcer.async_unregister(services)
+
+    def _update(
+        self,
+        aliases: Optional[Iterable[str]] = None,
+        addresses: Optional[Iterable[Union[IPv4Address, IPv6Address]]] = None,
+        port: Optional[int] = None,
+        ttl: Optional[int] = None,
+        weight: Optional[int] = None,
+        priority: Optional[int] = None,
+        properties: Optional[Union[bytes, Dict[str, Any]]] = None,
+    ) -> None:
+        """Update the given beacon attributes.
+
+        Args:
+            aliases: Service alias name list.
+            addresses: IP addresses that the service runs on.
+            port: Port that the service runs on.
+            ttl: TTL used for the announce of the service.
+            weight: Weight of the service.
+            priority: Priority of the service.
+            properties: Dict of properties (or a bytes object with the
+                content of the `text` field) of the service.
+        """
+        if aliases is not None:
+            self.aliases = set(aliases)
+        if addresses is not None:
+            self.addresses = set(addresses) or {ip_address("127.0.0.1")}
+        if port is not None:
+            self.port = port
+        if ttl is not None:
+            self.ttl = ttl
+        if weight is not None:
+            self.weight = weight
+        if priority is not None:
+            self.priority = priority
+        if properties is not None:
+            self.properties = properties
+
+    async def async_reload(
+        self,
+        aliases: Optional[Iterable[str]] = None,
+        addresses: Optional[Iterable[Union[IPv4Address, IPv6Address]]] = None,
+        port: Optional[int] = None,
+        ttl: Optional[int] = None,
+        weight: Optional[int] = None,
+        priority: Optional[int] = None,
+        properties: Optional[Union[bytes, Dict[str, Any]]] = None,
+    ) -> None:
+        """Reload the beacon from a running event loop.
+
+        Diffs the new services against the registered ones: removed services
+        are unregistered, added ones are registered (probed) and changed ones
+        are updated in place, unchanged services are not touched.
+
+        Args:
+            aliases: Service alias name list.
+            addresses: IP addresses that the service runs on.
+            port: Port that the service runs on.
+            ttl: TTL used for the announce of the service.
+            weight: Weight of the service.
+            priority: Priority of the service.
+            properties: Dict of properties (or a bytes object with the
+                content of the `text` field) of the service.
+        """
+        old = {info.key: info for info in self.services}
+        self._update(aliases, addresses, port, ttl, weight, priority, properties)
+        new = {info.key: info for info in self.services}
+        if not self._announcer:
+            return
+
+        unchanged = {
+            key
+            for key in old.keys() & new.keys()
+            if _service_signature(old[key]) == _service_signature(new[key])
+        }
+        removed = [info for key, info in old.items() if key not in new]
+        added = [info for key, info in new.items() if key not in old]
+        changed = [info for key, info in new.items() if key in old and key not in unchanged]
+        # Keep the registered instances of the unchanged services
+        self._services = [old[key] if key in unchanged else info for key, info in new.items()]
+
+        logger.info(
+            "Reloading services: %(removed)s removed, %(added)s added, %(changed)s changed",
+            {"removed": len(removed), "added": len(added), "changed": len(changed)},
+        )
+        await self._announcer.async_unregister(removed)
+        await self._announcer.async_update(changed)
+        await self._announcer.async_register(added)
+
+    def reload(
+        self,
+        aliases: Optional[Iterable[str]] = None,
+        addresses: Optional[Iterable[Union[IPv4Address, IPv6Address]]] = None,
+        port: Optional[int] = None,
+        ttl: Optional[int] = None,
+        weight: Optional[int] = None,
+        priority: Optional[int] = None,
+        properties: Optional[Union[bytes, Dict[str, Any]]] = None,
+    ) -> None:
+        """Reload the beacon, re-registering only the changed services.
+
+        Args:
+            aliases: Service alias name list.
+            addresses: IP addresses that the service runs on.
+            port: Port that the service runs on.
+            ttl: TTL used for the announce of the service.
+            weight: Weight of the service.
+            priority: Priority of the service.
+            properties: Dict of properties (or a bytes object with the
+                content of the `text` field) of the service.
+        """
+        if not self._announcer:
+            self._update(aliases, addresses, port, ttl, weight, priority, properties)
+            return
+        self._run_coroutine(
+            self.async_reload(aliases, addresses, port, ttl, weight, priority, properties)
+        )
+
+    async def async_start(self) -> None:
+        """Start Beacon from a running event loop.
+
+        Asynchronous counterpart of `run_forever` without the forever loop,
+        zeroconf runs in the caller event loop.
+        """
+        await self.async_wait_ready()
+        await self.async_register_services()
+
+    async def async_stop(self) -> None:
+        """Stop Beacon from a running event loop.
+
+        Unregister all the announced services.
+        """
+        if self._announcer:
+            await self.async_unregister_services()
+        self._announcer = None
+        await super().async_stop()
+
+    @traced()
     def stop(self) -> None:
         """Stop Beacon.
 
         Unregister all the announced services.
         """
-        logger.info(
-            "Unregistering %(services_len)s services", {"services_len": len(self.services)}
-        )
-        for service in self.services:
-            logger.debug("Unregistering %(service_name)s", {"service_name": service.name})
-            self.zeroconf.unregister_service(service)
+        if self._announcer:
+            self._run_coroutine(self.async_unregister_services())
+        self._announcer = None
         super().stop()
 
-    def _wait(self) -> None:
-        """Wait before trying to start the zeroconf service."""
-        time.sleep(self.delay_startup)
+    async def async_wait_ready(self) -> bool:
+        """Wait until the addresses are bindable, at most `delay_startup` seconds.
+
+        Returns:
+            Whether all the addresses are bindable.
+        """
+        return await readiness_gate.async_wait(self.addresses, timeout=self.delay_startup)
 
+    @traced()
     def _execute(self) -> None:
         """Register aliases on the local network."""
-        self._wait()
-        logger.info("Registering %(services_len)s services", {"services_len": len(self.services)})
-        for service in self.services:
-            logger.debug("Registering %(service_name)s", {"service_name": service.name})
-            self.zeroconf.register_service(service)
+        self._run_coroutine(self.async_start())
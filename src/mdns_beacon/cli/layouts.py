@@ -1,14 +1,170 @@
 """Console layout for mdns-beacon."""
 
+import concurrent.futures
+import itertools
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Any, ClassVar, Dict, List, Optional, Tuple, Union
+from bisect import bisect_left, insort
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Sequence, Tuple, Union
 
 from rich.console import RenderableType
 from rich.live import Live
 from rich.spinner import Spinner
 from rich.table import Table
 from rich.text import Text
-from zeroconf import IPVersion, ServiceStateChange, Zeroconf
+from zeroconf import ServiceStateChange, Zeroconf
+from zeroconf.asyncio import AsyncServiceInfo
+
+from ..metrics import metrics
+from ..store import ServiceKey, ServiceRecord, ServiceStore
+from ..tracing import traced
+from . import options
+from .resolving import ResolvingHandler
+
+
+class RenderScheduler:
+    """Coalesce render requests, rendering at most `refresh_rate` times per second.
+
+    Attributes:
+        render: Function that renders the layout.
+        refresh_rate: Maximum number of renders per second.
+    """
+
+    def __init__(self, render: Callable[[], None], refresh_rate: float = 4) -> None:
+        """Init a render scheduler.
+
+        Args:
+            render: Function that renders the layout.
+            refresh_rate: Maximum number of renders per second.
+        """
+        if refresh_rate <= 0:
+            raise ValueError("refresh_rate must be greater than 0")
+        self.render = render
+        self.refresh_rate = refresh_rate
+        self._last_render = float("-inf")
+        self._pending = False
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def request(self) -> None:
+        """Request a render, right away or once the frame interval is over.
+
+        Requests made while a render is pending are coalesced into it.
+        """
+        with self._lock:
+            if self._pending:
+                return
+            self._pending = True
+            delay = self._last_render + 1 / self.refresh_rate - time.monotonic()
+            if delay > 0:
+                self._timer = threading.Timer(delay, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+                return
+        self._flush()
+
+    def _flush(self) -> None:
+        """Render the pending request."""
+        with self._lock:
+            self._pending = False
+            self._timer = None
+            self._last_render = time.monotonic()
+        self.render()
+
+    def cancel(self) -> None:
+        """Cancel the pending render."""
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+            self._pending = False
+            self._timer = None
+
+
+def _sort_value(value: Any) -> Tuple[int, Any, str]:  # noqa: ANN401
+    """Get a sort value comparable between the values of any service column."""
+    if isinstance(value, (int, float)):
+        return (0, value, "")
+    return (1, 0, str(value))
+
+
+class ServiceWindow:
+    """Sorted and filtered view of the services, to render a window of its rows.
+
+    The order is kept up to date on every change, so getting a window only
+    costs its size.
+
+    Attributes:
+        sort_by: Service column to sort by (arrival order if `None`).
+        filter_: Case insensitive text that one of the `columns` must contain.
+        columns: Service columns to filter.
+    """
+
+    def __init__(
+        self,
+        sort_by: Optional[str] = None,
+        filter_: Optional[str] = None,
+        columns: Sequence[str] = (),
+    ) -> None:
+        """Init a service window.
+
+        Args:
+            sort_by: Service column to sort by (arrival order if `None`).
+            filter_: Case insensitive text that one of the `columns` must contain.
+            columns: Service columns to filter.
+        """
+        self.sort_by = sort_by
+        self.filter_ = filter_.casefold() if filter_ else None
+        self.columns = columns
+        self._order: List[Tuple[Any, int, ServiceKey]] = []
+        self._keys: Dict[ServiceKey, Tuple[Any, int, ServiceKey]] = {}
+        self._arrivals: Dict[ServiceKey, int] = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of services in the view."""
+        return len(self._order)
+
+    def _matches(self, service: ServiceRecord) -> bool:
+        """Check whether a service passes the filter."""
+        return not self.filter_ or any(
+            self.filter_ in str(service[column]).casefold() for column in self.columns
+        )
+
+    def update(self, service_id: ServiceKey, service: Optional[ServiceRecord]) -> None:
+        """Add, update or remove (if `service` is `None`) a service of the view.
+
+        Args:
+            service_id: Service type and name.
+            service: Service record.
+        """
+        with self._lock:
+            key = self._keys.pop(service_id, None)
+            if key:
+                del self._order[bisect_left(self._order, key)]
+            if service is None:
+                self._arrivals.pop(service_id, None)
+                return
+            arrival = self._arrivals.setdefault(service_id, next(self._counter))
+            if self._matches(service):
+                sort_value = _sort_value(service[self.sort_by]) if self.sort_by else None
+                key = (sort_value, arrival, service_id)
+                insort(self._order, key)
+                self._keys[service_id] = key
+
+    def window(self, start: int, size: int) -> List[ServiceKey]:
+        """Get the type and name of a window of services.
+
+        Args:
+            start: Position of the first service.
+            size: Maximum number of services.
+
+        Returns:
+            Service types and names.
+        """
+        with self._lock:
+            return [service_id for *_, service_id in self._order[start : start + size]]
 
 
 class BaseLayout(ABC):
@@ -62,51 +218,82 @@ class BlinkLayout(BaseLayout):
         return layout
 
 
-class ListenLayout(BaseLayout):
+class ListenLayout(ResolvingHandler, BaseLayout):
     """Listen cli layout."""
 
-    services: ClassVar[Dict[str, Any]] = {}
-    TABLE_SERVICES_COLUMNS: ClassVar[Dict[str, str]] = {
-        "type": "Type",
-        "name": "Name",
-        "ipv4_address": "Address IPv4",
-        "ipv6_address": "Address IPv6",
-        "port": "Port",
-        "server": "Server",
-        "ttl": "TTL",
-        "weight": "Weight",
-        "priority": "Priority",
-        "text": "TXT",
-        "properties": "Properties",
-    }
-    DEFAULT_SHOW_COLUMNS = (
-        "type",
-        "name",
-        "ipv4_address",
-        "port",
-        "server",
-        "ttl",
-    )
+    TABLE_SERVICES_COLUMNS: ClassVar[Dict[str, str]] = options.SERVICE_COLUMNS
+    DEFAULT_SHOW_COLUMNS = options.DEFAULT_SHOW_COLUMNS
+
+    # Lines of the layout around the table rows: title, header, borders, caption and spinner
+    RESERVED_LINES: ClassVar[int] = 10
 
     spinner_text = "Listen for services (Press CTRL+C to quit) ..."
 
     def __init__(
         self,
         show_columns: Optional[Union[Tuple[str], List[str]]] = None,
+        max_concurrency: int = 32,
+        resolve_timeout: float = 3,
+        refresh_rate: float = 4,
+        sort_by: Optional[str] = None,
+        filter_: Optional[str] = None,
+        page: int = 0,
+        page_size: Optional[int] = None,
+        store: Optional[ServiceStore] = None,
         *args: Live,
         **kwargs: Live,
     ) -> None:
-        """Init listen layout."""
+        """Init listen layout.
+
+        Args:
+            show_columns: Service info to show.
+            max_concurrency: Maximum number of services resolved at the same time.
+            resolve_timeout: Maximum amount of time to resolve a service (in seconds).
+            refresh_rate: Maximum number of table renders per second, the
+                service changes between renders are coalesced.
+            sort_by: Service info to sort by (arrival order if `None`).
+            filter_: Case insensitive text that one of the shown service info
+                must contain.
+            page: Page of services to show (starting at `0`, the last page if
+                greater).
+            page_size: Number of services per page (fits the console height
+                if `None`).
+            store: Store of the discovered services (a new one if `None`).
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+        """
+        self.max_concurrency = max_concurrency
+        self.resolve_timeout = resolve_timeout
+        self.scheduler = RenderScheduler(self.render, refresh_rate=refresh_rate)
         self.show_columns = show_columns or self.DEFAULT_SHOW_COLUMNS
         if not set(self.show_columns).issubset(self.TABLE_SERVICES_COLUMNS.keys()):
             raise ValueError(
                 "Unknown fields %s", set(self.show_columns) - self.TABLE_SERVICES_COLUMNS.keys()
             )
+        if sort_by and sort_by not in self.TABLE_SERVICES_COLUMNS:
+            raise ValueError("Unknown sort field %s", sort_by)
+        self.page = page
+        self.page_size = page_size
+        self.services = store if store is not None else ServiceStore()
+        self._lock = threading.Lock()
+        self.window = ServiceWindow(sort_by=sort_by, filter_=filter_, columns=self.show_columns)
+        for service in self.services:
+            self.window.update(service.key, service)
         super().__init__(*args, **kwargs)
 
+    @property
+    def rows(self) -> int:
+        """Number of services per page."""
+        if self.page_size:
+            return self.page_size
+        return max(self.live.console.height - self.RESERVED_LINES, 1)
+
     @property
     def services_table(self) -> Table:
-        """Listen services table."""
+        """Listen services table.
+
+        Only the services of the current page are rendered.
+        """
         table = Table(expand=True)
         table.title = (
             "\n"
@@ -119,8 +306,17 @@ class ListenLayout(BaseLayout):
         for c in self.show_columns:
             table.add_column(self.TABLE_SERVICES_COLUMNS[c], no_wrap=True)
 
-        for index, service in enumerate(self.services.values()):
-            table.add_row(str(index), *[str(service[c]) for c in self.show_columns])
+        total, rows = len(self.window), self.rows
+        start = min(self.page, max(total - 1, 0) // rows) * rows
+        for index, service_id in enumerate(self.window.window(start, rows), start=start):
+            service = self.services.get(service_id)
+            if service:
+                table.add_row(str(index), *[str(service[c]) for c in self.show_columns])
+        if total > rows or self.window.filter_:
+            table.caption = (
+                f"{min(start + 1, total)}-{min(start + rows, total)} of {total} services"
+                f" (page {start // rows + 1}/{max(total - 1, 0) // rows + 1})"
+            )
         return table
 
     @property
@@ -131,32 +327,49 @@ class ListenLayout(BaseLayout):
         layout.add_row(self.spinner)
         return layout
 
+    def render(self) -> None:
+        """Render the layout."""
+        if not metrics.enabled:
+            self.live.update(self.renderable)
+            return
+        start = time.perf_counter()
+        self.live.update(self.renderable)
+        metrics.render_seconds.observe(time.perf_counter() - start)
+
+    @traced()
     def update_services(
         self, zeroconf: Zeroconf, service_type: str, name: str, state_change: ServiceStateChange
     ) -> None:
-        """On service state change handler."""
-        service_id = f"{name}_{service_type}"
+        """On service state change handler.
+
+        Returns right away, added and updated services are resolved
+        concurrently in the zeroconf event loop.
+        """
+        resolver = self._resolver_for(zeroconf)
         if state_change is ServiceStateChange.Removed:
-            self.services.pop(service_id, None)
+            resolver.cancel(service_type, name)
+            with self._lock:
+                removed = self.services.remove((service_type, name))
+                if removed:
+                    self.window.update(removed.key, None)
+            if removed:
+                self.scheduler.request()
         else:
-            info = zeroconf.get_service_info(service_type, name)
-            if info:
-                self.services[service_id] = {
-                    "type": info.type,
-                    "name": info.name,
-                    "ipv4_address": ",".join(info.parsed_addresses(IPVersion.V4Only)),
-                    "ipv6_address": ",".join(info.parsed_addresses(IPVersion.V6Only)),
-                    "port": info.port,
-                    "server": info.server,
-                    "ttl": info.host_ttl,
-                    "weight": info.weight,
-                    "priority": info.priority,
-                    "text": info.text.decode("utf8"),
-                    "properties": {
-                        (k.decode("utf8") if isinstance(k, bytes) else k): (
-                            v.decode("utf8") if isinstance(v, bytes) else v
-                        )
-                        for k, v in info.properties.items()
-                    },
-                }
-        self.live.update(self.renderable)
+            resolver.resolve(service_type, name).add_done_callback(self._on_resolved)
+
+    def _on_resolved(
+        self, future: "concurrent.futures.Future[Optional[AsyncServiceInfo]]"
+    ) -> None:
+        """Show a resolved service."""
+        if future.cancelled() or future.exception():
+            return
+        info = future.result()
+        if not info:
+            return
+        service = ServiceRecord.from_info(info)
+        with self._lock:
+            changed = self.services.upsert(service)
+            if changed:
+                self.window.update(service.key, service)
+        if changed:
+            self.scheduler.request()
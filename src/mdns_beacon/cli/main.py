@@ -1,29 +1,211 @@
 """Main script for mdns-beacon."""
 
+import contextlib
+import functools
+import signal
 from ipaddress import IPv4Address, IPv6Address
-from typing import Dict, Iterable, Tuple, Union
+from types import FrameType
+from typing import TYPE_CHECKING, Dict, Generator, Iterable, List, Optional, Set, Tuple, Union
 
 import click
 from click_option_group import MutuallyExclusiveOptionGroup, optgroup
-from rich.console import Console
-from rich.live import Live
 
-from mdns_beacon import Beacon, BeaconListener, __version__
-from mdns_beacon.beacon import PROTOCOL
-from mdns_beacon.cli.layouts import BlinkLayout, ListenLayout
+from mdns_beacon import __version__
+from mdns_beacon.cli.options import (
+    DEFAULT_SHOW_COLUMNS,
+    IP_VERSIONS,
+    OUTPUT_FORMATS,
+    SERVICE_COLUMNS,
+)
 from mdns_beacon.cli.types import IpAddress
 
-console = Console()
+if TYPE_CHECKING:  # pragma: no cover
+    import asyncio
+
+    from rich.console import Console
+    from zeroconf import IPVersion
+
+    from mdns_beacon.beacon import PROTOCOL, Beacon
+    from mdns_beacon.group import BeaconGroup
+
+# rich, zeroconf and the modules depending on them are imported by the commands
+# that use them, so `--help` and `--version` start fast.
+
+
+@functools.lru_cache(maxsize=None)
+def get_console() -> "Console":
+    """Get the console of the commands, created on first use."""
+    from rich.console import Console
+
+    return Console()
+
+
+_background_tasks: Set["asyncio.Task[None]"] = set()
+
+
+def _to_ip_version(
+    ctx: click.Context, param: click.Parameter, value: Optional[str]
+) -> Optional["IPVersion"]:
+    """Convert an IP version choice (IPv4 only, as zeroconf, if `None`)."""
+    if value is None:
+        return None
+    from zeroconf import IPVersion
+
+    return IPVersion[IP_VERSIONS[value]]
+
+
+def _check_interfaces(
+    ctx: click.Context, param: click.Parameter, value: Tuple[str, ...]
+) -> List[str]:
+    """Check the network interfaces exist and can be combined, for the command IP version."""
+    if not value:
+        return []
+    from mdns_beacon.interfaces import select_interfaces
+
+    try:
+        select_interfaces(value, ctx.params.get("ip_version"))
+    except ValueError as error:
+        raise click.BadParameter(str(error), ctx=ctx, param=param) from error
+    return list(value)
+
+
+def _reload_group(group: "BeaconGroup", beacons: List["Beacon"]) -> None:
+    """Reload a beacon group from a signal handler.
+
+    When the signal interrupts the group event loop, which can't be blocked
+    until reloaded, the reload is scheduled in it. Reload errors are printed.
+
+    Args:
+        group: Running beacon group.
+        beacons: New beacons of the group.
+    """
+    import asyncio
+
+    from zeroconf import Error as ZeroconfError
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        try:
+            group.reload(beacons)
+        except (ZeroconfError, ValueError) as error:
+            get_console().print(f"Configuration not fully reloaded: {error!r}")
+        else:
+            get_console().print("Configuration reloaded")
+        return
+
+    async def _async_reload() -> None:
+        try:
+            await group.async_reload(beacons)
+        except (ZeroconfError, ValueError) as error:
+            get_console().print(f"Configuration not fully reloaded: {error!r}")
+        else:
+            get_console().print("Configuration reloaded")
+
+    def _schedule() -> None:
+        task = loop.create_task(_async_reload())
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    loop.call_soon_threadsafe(_schedule)
+
+
+@contextlib.contextmanager
+def _reload_on_hangup(
+    group: "BeaconGroup", beacons: List["Beacon"], config: Optional[str]
+) -> Generator[None, None, None]:
+    """Reload the group beacons from the configuration file on SIGHUP.
+
+    Args:
+        group: Running beacon group.
+        beacons: Beacons of the group not defined in the configuration file.
+        config: Beacons configuration file.
+    """
+    if not config or not hasattr(signal, "SIGHUP"):
+        yield
+        return
+    from mdns_beacon.config import ConfigError, load_beacons
+
+    def _reload(signum: int, frame: Optional[FrameType]) -> None:
+        try:
+            new_beacons = [*beacons, *load_beacons(config, ip_version=group.ip_version)]
+        except ConfigError as error:
+            get_console().print(f"Configuration not reloaded: {error}")
+        else:
+            _reload_group(group, new_beacons)
+
+    previous = signal.signal(signal.SIGHUP, _reload)
+    try:
+        yield
+    finally:
+        signal.signal(signal.SIGHUP, previous)
 
 
 @click.group()
 @click.version_option(version=__version__)
-def main() -> None:
+@click.option(
+    "--metrics-port",
+    "metrics_port",
+    default=None,
+    type=click.IntRange(1, 65535),
+    help="Export runtime metrics (Prometheus text format) on this local HTTP port.",
+)
+@click.option(
+    "--profile",
+    "profile",
+    default=None,
+    type=click.Path(dir_okay=False, writable=True),
+    help=(
+        "Profile the command (all its threads) and write the report to this file on exit, "
+        "binary pstats data if it ends with .prof or .pstats, text otherwise."
+    ),
+)
+@click.option(
+    "--trace",
+    "trace",
+    default=None,
+    type=click.Path(dir_okay=False, writable=True),
+    help="Record the time spent in the hot callbacks and write it as Chrome trace JSON on exit.",
+)
+@click.pass_context
+def main(
+    ctx: click.Context,
+    metrics_port: Optional[int],
+    profile: Optional[str],
+    trace: Optional[str],
+) -> None:
     """Simple multicast DNS (mDNS) command line interface utility."""
+    if metrics_port is not None:
+        from mdns_beacon.metrics import metrics
+
+        try:
+            server = metrics.serve(metrics_port)
+        except OSError as error:
+            raise click.BadParameter(str(error), param_hint="'--metrics-port'") from error
+        ctx.call_on_close(server.server_close)
+        ctx.call_on_close(server.shutdown)
+    if trace:
+        from mdns_beacon.tracing import tracer
+
+        tracer.start()
+        ctx.call_on_close(lambda: tracer.dump(trace))
+        ctx.call_on_close(tracer.stop)
+    if profile:
+        from mdns_beacon.cli.profiling import Profiler
+
+        profiler = Profiler(profile)
+        profiler.start()
+        ctx.call_on_close(profiler.stop)
 
 
 @main.command()
-@click.argument("name")
+@click.argument("name", required=False)
+@click.option(
+    "--config",
+    "config",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Beacons configuration file (YAML, TOML, JSON or JSON Lines), reloaded on SIGHUP.",
+)
 @click.option(
     "--alias", "aliases", default=[], multiple=True, help="Alias to announce on the local network."
 )
@@ -91,42 +273,103 @@ def main() -> None:
         "In certain configurations, you may want to wait a given amount of time before "
         "trying to start the mDNS beacon. This is typically found when network interfaces "
         "appear only late during system startup and the interface startup priorities are "
-        "configured incorrectly. This setting takes any integer value between 0 and 300 seconds."
+        "configured incorrectly. The beacon starts as soon as its addresses are available, "
+        "waiting at most the given amount of time. This setting takes any integer value "
+        "between 0 and 300 seconds."
+    ),
+)
+@click.option(
+    "--reannounce-interval",
+    "reannounce_interval",
+    default=0,
+    type=click.FloatRange(min=0),
+    help="Seconds between periodic re-announcements of the services (0 disables them).",
+)
+@click.option(
+    "--ip-version",
+    "ip_version",
+    default=None,
+    type=click.Choice(choices=tuple(IP_VERSIONS), case_sensitive=False),
+    callback=_to_ip_version,
+    is_eager=True,
+    help="IP version to use (IPv4 only by default).",
+)
+@click.option(
+    "--interface",
+    "interfaces",
+    default=[],
+    multiple=True,
+    callback=_check_interfaces,
+    help=(
+        "Network interface name, address or network (CIDR notation) to announce on, or 'default' "
+        "(all the interfaces by default)."
     ),
 )
 def blink(
-    name: str,
+    name: Optional[str],
+    config: Optional[str],
     aliases: Iterable[str],
     addresses: Iterable[Union[IPv4Address, IPv6Address]],
     port: int,
     type_: str,
-    protocol: PROTOCOL,
+    protocol: "PROTOCOL",
     weight: int,
     priority: int,
     txt: bytes,
     properties: Dict[str, bytes],
     delay_startup: int,
+    reannounce_interval: float,
+    ip_version: Optional["IPVersion"],
+    interfaces: List[str],
 ) -> None:
     """Announce aliases on the local network."""
-    with Live(console=console, transient=True, auto_refresh=True) as live:
+    if not name and not config:
+        raise click.UsageError("Missing argument 'NAME' or option '--config'.")
+    from rich.live import Live
+
+    from mdns_beacon.beacon import Beacon
+    from mdns_beacon.cli.layouts import BlinkLayout
+    from mdns_beacon.config import ConfigError, load_beacons
+    from mdns_beacon.group import BeaconGroup
+
+    cli_beacons: List[Beacon] = []
+    if name:
+        cli_beacons.append(
+            Beacon(
+                aliases=[name, *aliases],
+                addresses=list(addresses),
+                port=port,
+                type_=type_,
+                protocol=protocol,
+                weight=weight,
+                priority=priority,
+                properties=properties or txt,
+                reannounce_interval=reannounce_interval,
+                ip_version=ip_version,
+            )
+        )
+    beacons = list(cli_beacons)
+    if config:
+        try:
+            beacons.extend(load_beacons(config, ip_version=ip_version))
+        except ConfigError as error:
+            raise click.BadParameter(str(error), param_hint="'--config'") from error
+
+    with Live(console=get_console(), transient=True, auto_refresh=True) as live:
         BlinkLayout(live=live)
-        beacon = Beacon(
-            aliases=[name, *aliases],
-            addresses=list(addresses),
-            port=port,
-            type_=type_,
-            protocol=protocol,
-            weight=weight,
-            priority=priority,
-            properties=properties or txt,
+        beacon = BeaconGroup(
+            beacons=beacons,
             delay_startup=delay_startup,
+            ip_version=ip_version,
+            interfaces=interfaces,
         )
-        try:
-            beacon.run_forever()
-        except KeyboardInterrupt:
-            console.print("Shutting down ...")
-        finally:
-            beacon.stop()
+        with _reload_on_hangup(beacon, cli_beacons, config):
+            try:
+                beacon.run_forever()
+            except KeyboardInterrupt:
+                get_console().print("Shutting down ...")
+            finally:
+                beacon.stop()
 
 
 @main.command()
@@ -140,23 +383,329 @@ def blink(
 @click.option(
     "--show",
     "show_columns",
-    type=click.Choice(list(ListenLayout.TABLE_SERVICES_COLUMNS.keys()), case_sensitive=True),
+    type=click.Choice(list(SERVICE_COLUMNS), case_sensitive=True),
     callback=lambda ctx, param, value: tuple({v: None for v in value}.keys()),
     multiple=True,
-    default=ListenLayout.DEFAULT_SHOW_COLUMNS,
+    default=DEFAULT_SHOW_COLUMNS,
     help="Service info to show.",
 )
-def listen(services: Iterable[str], show_columns: Tuple[str]) -> None:
+@click.option(
+    "--output",
+    "output",
+    type=click.Choice(["table", *OUTPUT_FORMATS], case_sensitive=True),
+    default="table",
+    help=(
+        "Output format, a live table or a record per service event streamed to stdout "
+        "(JSON Lines or CSV)."
+    ),
+)
+@click.option(
+    "--flush-interval",
+    "flush_interval",
+    default=1,
+    type=click.FloatRange(min=0.01),
+    help="Maximum amount of time the streamed records are buffered (in seconds).",
+)
+@click.option(
+    "--refresh-rate",
+    "refresh_rate",
+    default=4,
+    type=click.FloatRange(0.1, 60),
+    help=(
+        "Maximum number of screen refreshes per second, the changes of the services between "
+        "refreshes are coalesced."
+    ),
+)
+@click.option(
+    "--sort",
+    "sort_by",
+    type=click.Choice(list(SERVICE_COLUMNS), case_sensitive=True),
+    default=None,
+    help="Service info to sort the table by (arrival order by default).",
+)
+@click.option(
+    "--filter",
+    "filter_",
+    default=None,
+    help="Show only the services with a shown info containing the text (case insensitive).",
+)
+@click.option(
+    "--page",
+    "page",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Page of services of the table to show.",
+)
+@click.option(
+    "--page-size",
+    "page_size",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Number of services per page of the table (fits the terminal height by default).",
+)
+@click.option(
+    "--coalesce-window",
+    "coalesce_window",
+    default=None,
+    type=click.FloatRange(min=0),
+    help=(
+        "Coalesce the changes of each service within this amount of time, keeping its latest "
+        "state (in seconds)."
+    ),
+)
+@click.option(
+    "--types-cache",
+    "types_cache",
+    default=None,
+    type=click.Path(dir_okay=False),
+    help=(
+        "File caching the service types discovered on the local network between runs, "
+        "refreshed in background."
+    ),
+)
+@click.option(
+    "--ip-version",
+    "ip_version",
+    default=None,
+    type=click.Choice(choices=tuple(IP_VERSIONS), case_sensitive=False),
+    callback=_to_ip_version,
+    is_eager=True,
+    help="IP version to use (IPv4 only by default).",
+)
+@click.option(
+    "--interface",
+    "interfaces",
+    default=[],
+    multiple=True,
+    callback=_check_interfaces,
+    help=(
+        "Network interface name, address or network (CIDR notation) to listen on, or 'default' "
+        "(all the interfaces by default)."
+    ),
+)
+def listen(
+    services: Iterable[str],
+    show_columns: Tuple[str],
+    output: str,
+    flush_interval: float,
+    refresh_rate: float,
+    sort_by: Optional[str],
+    filter_: Optional[str],
+    page: int,
+    page_size: Optional[int],
+    coalesce_window: Optional[float],
+    types_cache: Optional[str],
+    ip_version: Optional["IPVersion"],
+    interfaces: List[str],
+) -> None:
     """Listen for services on the local network."""
-    with Live(console=console, transient=True, auto_refresh=True) as live:
-        layout = ListenLayout(live=live, show_columns=show_columns)
-        listener = BeaconListener(services=list(services), handlers=[layout.update_services])
+    from rich.live import Live
+
+    from mdns_beacon.cli.layouts import ListenLayout
+    from mdns_beacon.cli.outputs import OUTPUTS
+    from mdns_beacon.listener import BeaconListener
+    from mdns_beacon.service_types import ServiceTypesCache
+
+    cache = ServiceTypesCache(path=types_cache) if types_cache else None
+    if output in OUTPUTS:
+        stream = OUTPUTS[output](
+            stream=click.get_text_stream("stdout"),
+            columns=show_columns,
+            filter_=filter_,
+            flush_interval=flush_interval,
+        )
+        listener = BeaconListener(
+            services=list(services),
+            handlers=[stream.update_services],
+            types_cache=cache,
+            coalesce_window=coalesce_window,
+            ip_version=ip_version,
+            interfaces=interfaces,
+        )
+        try:
+            listener.run_forever()
+        except KeyboardInterrupt:
+            click.echo("Shutting down ...", err=True)
+        finally:
+            listener.stop()
+            stream.close()
+        return
+
+    with Live(
+        console=get_console(), transient=True, auto_refresh=True, refresh_per_second=refresh_rate
+    ) as live:
+        layout = ListenLayout(
+            live=live,
+            show_columns=show_columns,
+            refresh_rate=refresh_rate,
+            sort_by=sort_by,
+            filter_=filter_,
+            page=page - 1,
+            page_size=page_size,
+        )
+        listener = BeaconListener(
+            services=list(services),
+            handlers=[layout.update_services],
+            types_cache=cache,
+            coalesce_window=coalesce_window,
+            ip_version=ip_version,
+            interfaces=interfaces,
+        )
         try:
             listener.run_forever()
         except KeyboardInterrupt:
-            console.print("Shutting down ...")
+            get_console().print("Shutting down ...")
         finally:
             listener.stop()
+            layout.scheduler.cancel()
+
+
+@main.command()
+@click.option(
+    "--service",
+    "services",
+    default=[],
+    multiple=True,
+    help="Service to scan for on the local network.",
+)
+@click.option(
+    "--show",
+    "show_columns",
+    type=click.Choice(list(SERVICE_COLUMNS), case_sensitive=True),
+    callback=lambda ctx, param, value: tuple({v: None for v in value}.keys()),
+    multiple=True,
+    default=DEFAULT_SHOW_COLUMNS,
+    help="Service info to show.",
+)
+@click.option(
+    "--output",
+    "output",
+    type=click.Choice(["table", *OUTPUT_FORMATS], case_sensitive=True),
+    default="table",
+    help="Output format, a table or a record per service printed to stdout (JSON Lines or CSV).",
+)
+@click.option(
+    "--duration",
+    "duration",
+    default=5,
+    type=click.FloatRange(min=0.1),
+    help="Maximum amount of time to scan (in seconds).",
+)
+@click.option(
+    "--max-results",
+    "max_results",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Stop the scan once this number of services is found.",
+)
+@click.option(
+    "--quiet-interval",
+    "quiet_interval",
+    default=None,
+    type=click.FloatRange(min=0.1),
+    help="Stop the scan once no service changed for this amount of time (in seconds).",
+)
+@click.option(
+    "--sort",
+    "sort_by",
+    type=click.Choice(list(SERVICE_COLUMNS), case_sensitive=True),
+    default=None,
+    help="Service info to sort the table by (discovery order by default).",
+)
+@click.option(
+    "--filter",
+    "filter_",
+    default=None,
+    help="Show only the services with a shown info containing the text (case insensitive).",
+)
+@click.option(
+    "--types-cache",
+    "types_cache",
+    default=None,
+    type=click.Path(dir_okay=False),
+    help=(
+        "File caching the service types discovered on the local network between runs, "
+        "refreshed in background."
+    ),
+)
+@click.option(
+    "--ip-version",
+    "ip_version",
+    default=None,
+    type=click.Choice(choices=tuple(IP_VERSIONS), case_sensitive=False),
+    callback=_to_ip_version,
+    is_eager=True,
+    help="IP version to use (IPv4 only by default).",
+)
+@click.option(
+    "--interface",
+    "interfaces",
+    default=[],
+    multiple=True,
+    callback=_check_interfaces,
+    help=(
+        "Network interface name, address or network (CIDR notation) to scan, or 'default' "
+        "(all the interfaces by default)."
+    ),
+)
+def scan(
+    services: Iterable[str],
+    show_columns: Tuple[str],
+    output: str,
+    duration: float,
+    max_results: Optional[int],
+    quiet_interval: Optional[float],
+    sort_by: Optional[str],
+    filter_: Optional[str],
+    types_cache: Optional[str],
+    ip_version: Optional["IPVersion"],
+    interfaces: List[str],
+) -> None:
+    """Scan for services on the local network, for a bounded time."""
+    from rich.live import Live
+
+    from mdns_beacon.cli.layouts import ListenLayout
+    from mdns_beacon.cli.outputs import OUTPUTS
+    from mdns_beacon.listener import BeaconListener
+    from mdns_beacon.service_types import ServiceTypesCache
+    from mdns_beacon.store import ServiceStore
+
+    listener = BeaconListener(
+        services=list(services),
+        handlers=[],
+        types_cache=ServiceTypesCache(path=types_cache) if types_cache else None,
+        ip_version=ip_version,
+        interfaces=interfaces,
+    )
+    try:
+        with get_console().status("Scanning for services ...", spinner="dots"):
+            records = listener.scan(
+                duration=duration, max_results=max_results, quiet_interval=quiet_interval
+            )
+    finally:
+        listener.stop()
+
+    if output in OUTPUTS:
+        stream = OUTPUTS[output](
+            stream=click.get_text_stream("stdout"), columns=show_columns, filter_=filter_
+        )
+        for record in records:
+            stream.write("found", record)
+        stream.close()
+        return
+
+    store = ServiceStore()
+    for record in records:
+        store.upsert(record)
+    layout = ListenLayout(
+        live=Live(console=get_console()),
+        show_columns=show_columns,
+        sort_by=sort_by,
+        filter_=filter_,
+        page_size=max(len(store), 1),
+        store=store,
+    )
+    get_console().print(layout.services_table)
 
 
 if __name__ == "__main__":
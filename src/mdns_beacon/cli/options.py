@@ -0,0 +1,32 @@
+"""Option choices for mdns-beacon.
+
+Kept apart from the layouts and outputs, so the commands can be declared
+without importing rich or zeroconf.
+"""
+
+from typing import Dict, Tuple
+
+SERVICE_COLUMNS: Dict[str, str] = {
+    "type": "Type",
+    "name": "Name",
+    "ipv4_address": "Address IPv4",
+    "ipv6_address": "Address IPv6",
+    "port": "Port",
+    "server": "Server",
+    "ttl": "TTL",
+    "weight": "Weight",
+    "priority": "Priority",
+    "text": "TXT",
+    "properties": "Properties",
+}
+DEFAULT_SHOW_COLUMNS: Tuple[str, ...] = (
+    "type",
+    "name",
+    "ipv4_address",
+    "port",
+    "server",
+    "ttl",
+)
+OUTPUT_FORMATS: Tuple[str, ...] = ("jsonl", "csv")
+# Names of the `zeroconf.IPVersion` members
+IP_VERSIONS: Dict[str, str] = {"v4": "V4Only", "v6": "V6Only", "all": "All"}
@@ -0,0 +1,210 @@
+"""Streaming outputs for mdns-beacon."""
+
+import concurrent.futures
+import csv
+import io
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import IO, Any, ClassVar, Dict, List, Optional, Sequence, Set, Tuple, Type
+
+from zeroconf import ServiceStateChange, Zeroconf
+from zeroconf.asyncio import AsyncServiceInfo
+
+from ..store import ServiceRecord
+from ..tracing import traced
+from .resolving import ResolvingHandler
+
+
+class StreamOutput(ResolvingHandler, ABC):
+    """Base streaming output, writing a record per service state change.
+
+    Records are buffered and written every `flush_interval` seconds (or when
+    the buffer is full), no state of the services is kept but the names of
+    the ones that passed the filter, whose removals are always written.
+
+    Note:
+        Derived outputs must override the `_format` method.
+
+    Attributes:
+        stream: Text stream to write to.
+        columns: Service info of each record.
+        filter_: Case insensitive text that one of the `columns` must contain.
+        flush_interval: Maximum amount of time a record is buffered (in seconds).
+        buffer_size: Maximum number of buffered characters.
+    """
+
+    EVENTS: ClassVar[Dict[ServiceStateChange, str]] = {
+        ServiceStateChange.Added: "added",
+        ServiceStateChange.Updated: "updated",
+        ServiceStateChange.Removed: "removed",
+    }
+
+    def __init__(
+        self,
+        stream: IO[str],
+        columns: Sequence[str],
+        filter_: Optional[str] = None,
+        flush_interval: float = 1,
+        buffer_size: int = 2**16,
+        max_concurrency: int = 32,
+        resolve_timeout: float = 3,
+    ) -> None:
+        """Init a streaming output.
+
+        Args:
+            stream: Text stream to write to.
+            columns: Service info of each record.
+            filter_: Case insensitive text that one of the `columns` must contain.
+            flush_interval: Maximum amount of time a record is buffered (in seconds).
+            buffer_size: Maximum number of buffered characters.
+            max_concurrency: Maximum number of services resolved at the same time.
+            resolve_timeout: Maximum amount of time to resolve a service (in seconds).
+        """
+        self.stream = stream
+        self.columns = columns
+        self.filter_ = filter_.casefold() if filter_ else None
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+        self.max_concurrency = max_concurrency
+        self.resolve_timeout = resolve_timeout
+        self._buffer: List[str] = []
+        self._buffered = 0
+        self._matched: Set[Tuple[str, str]] = set()
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+        self._flusher.start()
+
+    @abstractmethod
+    def _format(self, row: Dict[str, Any]) -> str:
+        """Format a record as text.
+
+        Method that derived outputs must override.
+        """
+
+    def _flush_periodically(self) -> None:
+        """Flush the buffer every `flush_interval` seconds until closed."""
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered records to the stream."""
+        with self._lock:
+            if not self._buffer:
+                return
+            self.stream.write("".join(self._buffer))
+            self._buffer.clear()
+            self._buffered = 0
+            self.stream.flush()
+
+    def close(self) -> None:
+        """Stop the periodic flush, flush the buffer and cancel the pending resolutions."""
+        self._closed.set()
+        self._flusher.join()
+        if self._resolver:
+            self._resolver.cancel_all()
+        self.flush()
+
+    def write(self, event: str, record: ServiceRecord) -> None:
+        """Buffer the record of a service event.
+
+        Args:
+            event: Service event (added, updated or removed).
+            record: Service record.
+        """
+        row = {column: record[column] for column in self.columns}
+        if self.filter_ and not self._matches(self.filter_, event, record, row):
+            return
+        text = self._format({"event": event, "timestamp": time.time(), **row})
+        with self._lock:
+            self._buffer.append(text)
+            self._buffered += len(text)
+            full = self._buffered >= self.buffer_size
+        if full:
+            self.flush()
+
+    def _matches(
+        self, filter_: str, event: str, record: ServiceRecord, row: Dict[str, Any]
+    ) -> bool:
+        """Check whether a record passes the filter.
+
+        The removal of a service that passed the filter always passes it, as
+        the removed records only have the type and name of the service.
+        """
+        key = (record.type, record.name)
+        matches = any(filter_ in str(v).casefold() for v in row.values())
+        with self._lock:
+            if event == "removed" and key in self._matched:
+                self._matched.remove(key)
+                return True
+            if matches and event != "removed":
+                self._matched.add(key)
+            return matches
+
+    @traced()
+    def update_services(
+        self, zeroconf: Zeroconf, service_type: str, name: str, state_change: ServiceStateChange
+    ) -> None:
+        """On service state change handler.
+
+        Returns right away, removed services are written as is and the added
+        and updated ones once resolved.
+        """
+        event = self.EVENTS[state_change]
+        resolver = self._resolver_for(zeroconf)
+        if state_change is ServiceStateChange.Removed:
+            resolver.cancel(service_type, name)
+            self.write(event, ServiceRecord(service_type, name))
+            return
+
+        def _on_resolved(future: "concurrent.futures.Future[Optional[AsyncServiceInfo]]") -> None:
+            if future.cancelled() or future.exception():
+                return
+            info = future.result()
+            if info:
+                self.write(event, ServiceRecord.from_info(info))
+
+        resolver.resolve(service_type, name).add_done_callback(_on_resolved)
+
+
+class JsonLinesOutput(StreamOutput):
+    """JSON Lines output, a JSON object per line."""
+
+    def _format(self, row: Dict[str, Any]) -> str:
+        """Format a record as a JSON line."""
+        return json.dumps(row, separators=(",", ":")) + "\n"
+
+
+class CsvOutput(StreamOutput):
+    """CSV output, with a header row."""
+
+    def __init__(
+        self,
+        stream: IO[str],
+        columns: Sequence[str],
+        *args: Any,  # noqa: ANN401
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        """Init a CSV output, writing the header row.
+
+        Args:
+            stream: Text stream to write to.
+            columns: Service info of each record.
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+        """
+        super().__init__(stream, columns, *args, **kwargs)
+        stream.write(self._format({c: c for c in ("event", "timestamp", *columns)}))
+
+    def _format(self, row: Dict[str, Any]) -> str:
+        """Format a record as a CSV line, with the dict values as JSON."""
+        line = io.StringIO()
+        csv.writer(line, lineterminator="\n").writerow(
+            json.dumps(v) if isinstance(v, dict) else v for v in row.values()
+        )
+        return line.getvalue()
+
+
+OUTPUTS: Dict[str, Type[StreamOutput]] = {"jsonl": JsonLinesOutput, "csv": CsvOutput}
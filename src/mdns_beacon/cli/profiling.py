@@ -0,0 +1,92 @@
+"""Command profiling for mdns-beacon."""
+
+import cProfile
+import pstats
+import sys
+import threading
+from pathlib import Path
+from types import FrameType
+from typing import List, Optional, Union
+
+BINARY_SUFFIXES = (".prof", ".pstats")
+# Since Python 3.12 cProfile is built on sys.monitoring, a single profile sees all the threads
+SINGLE_PROFILE = sys.version_info >= (3, 12)
+
+
+def _collected(profile: cProfile.Profile) -> bool:
+    """Whether a profile collected any data."""
+    profile.create_stats()
+    return bool(profile.stats)  # type: ignore[attr-defined]
+
+
+class Profiler:
+    """Deterministic profiler of all the threads started while profiling.
+
+    The zeroconf engine and the listener handlers run in their own threads.
+    Before Python 3.12 each one gets its own `cProfile.Profile` and all of
+    them are merged in the report, since then a single profile sees all of
+    them.
+
+    Attributes:
+        path: Report file, binary `pstats` data (for tools like snakeviz) if
+            its suffix is `.prof` or `.pstats`, a text report otherwise.
+        limit: Maximum number of functions in the text report.
+    """
+
+    def __init__(self, path: Union[str, Path], limit: int = 50) -> None:
+        """Init a stopped profiler.
+
+        Args:
+            path: Report file, binary `pstats` data (for tools like snakeviz)
+                if its suffix is `.prof` or `.pstats`, a text report otherwise.
+            limit: Maximum number of functions in the text report.
+        """
+        self.path = Path(path)
+        self.limit = limit
+        self._profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def _new_profile(self) -> cProfile.Profile:
+        """Create a profile of the current thread."""
+        profile = cProfile.Profile()
+        with self._lock:
+            self._profiles.append(profile)
+        return profile
+
+    def _profile_thread(self, frame: FrameType, event: str, arg: object) -> None:
+        """Start profiling a new thread, on its first profiling event."""
+        sys.setprofile(None)
+        self._new_profile().enable()
+
+    def start(self) -> None:
+        """Profile the current thread and the threads started from now on."""
+        self._new_profile().enable()
+        if not SINGLE_PROFILE:
+            threading.setprofile(self._profile_thread)
+
+    def stop(self) -> Optional[pstats.Stats]:
+        """Stop profiling and write the report.
+
+        Returns:
+            Merged statistics of all the profiled threads, `None` if nothing
+            was profiled.
+        """
+        if not SINGLE_PROFILE:
+            threading.setprofile(None)  # type: ignore[arg-type]
+        with self._lock:
+            profiles, self._profiles = self._profiles, []
+        if not profiles:
+            return None
+        # Disables the profile of the current thread, the rest only stop with their thread
+        profiles[0].disable()
+        profiles = [profile for profile in profiles if _collected(profile)]
+        if not profiles:
+            return None
+        if self.path.suffix in BINARY_SUFFIXES:
+            stats = pstats.Stats(*profiles)
+            stats.dump_stats(self.path)
+            return stats
+        with self.path.open("w", encoding="utf8") as stream:
+            stats = pstats.Stats(*profiles, stream=stream)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.limit)
+        return stats
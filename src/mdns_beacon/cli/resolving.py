@@ -0,0 +1,31 @@
+"""Service resolution of the listen layouts and outputs."""
+
+from typing import Optional
+
+from zeroconf import Zeroconf
+
+from ..resolver import ServiceResolver
+
+
+class ResolvingHandler:
+    """Mixin of the service state change handlers resolving the services.
+
+    The resolver is created on first use, and again if the handler is called
+    from another zeroconf instance.
+
+    Attributes:
+        max_concurrency: Maximum number of services resolved at the same time.
+        resolve_timeout: Maximum amount of time to resolve a service (in seconds).
+    """
+
+    max_concurrency: int
+    resolve_timeout: float
+    _resolver: Optional[ServiceResolver] = None
+
+    def _resolver_for(self, zeroconf: Zeroconf) -> ServiceResolver:
+        """Get the service resolver of a zeroconf instance."""
+        if not self._resolver or self._resolver.zeroconf is not zeroconf:
+            self._resolver = ServiceResolver(
+                zeroconf, max_concurrency=self.max_concurrency, timeout=self.resolve_timeout
+            )
+        return self._resolver
@@ -0,0 +1,365 @@
+"""Beacons configuration file module.
+
+Configuration files hold a list of beacon definitions, either as the top
+level document or under a `beacons` key (a document may also be a single
+beacon definition)::
+
+    beacons:
+      - name: example
+        aliases: [sub1.example]
+        addresses: [127.0.0.1]
+        port: 8080
+        type: http
+        protocol: tcp
+        properties:
+          path: /
+
+Supported formats are YAML (requires `PyYAML`, installed with the `yaml`
+extra), TOML, JSON and JSON Lines.
+Top level YAML/JSON lists, YAML document streams and JSON Lines files are
+parsed one definition at a time.
+"""
+
+import json
+import re
+from ipaddress import ip_address
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterator, Mapping, Tuple, Union
+
+from .beacon import Beacon
+
+_WHITESPACE = re.compile(r"\s*")
+_CHUNK_SIZE = 64 * 1024
+# Types of the beacon fields, with their description (the list fields hold strings)
+_BEACON_FIELDS: Dict[str, Tuple[Tuple[type, ...], str]] = {
+    "name": ((str,), "a string"),
+    "aliases": ((list,), "a list of strings"),
+    "addresses": ((list,), "a list of strings"),
+    "port": ((int,), "an integer"),
+    "type": ((str,), "a string"),
+    "protocol": ((str,), "a string"),
+    "ttl": ((int,), "an integer"),
+    "weight": ((int,), "an integer"),
+    "priority": ((int,), "an integer"),
+    "txt": ((str,), "a string"),
+    "properties": ((Mapping,), "a mapping"),
+    "reannounce_interval": ((int, float), "a number"),
+}
+
+
+class ConfigError(ValueError):
+    """Invalid beacons configuration."""
+
+
+def _iter_document(document: object) -> Iterator[Any]:
+    """Iterate over the beacon definitions of a loaded document.
+
+    Args:
+        document: Loaded configuration document.
+
+    Yields:
+        Beacon definitions.
+    """
+    if isinstance(document, Mapping):
+        document = document["beacons"] if "beacons" in document else [document]
+    if not isinstance(document, list):
+        raise ConfigError("Expected a list of beacons")
+    yield from document
+
+
+class _JsonReader:
+    """Text of a JSON stream, read chunk by chunk as it is decoded.
+
+    Attributes:
+        stream: Text stream.
+        chunk_size: Number of characters read at once.
+        text: Read text not decoded yet, from `index`.
+        index: Position in `text` of the next character to decode.
+    """
+
+    def __init__(self, stream: IO[str], chunk_size: int = _CHUNK_SIZE) -> None:
+        """Init a reader at the start of a stream.
+
+        Args:
+            stream: Text stream.
+            chunk_size: Number of characters read at once.
+        """
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.text = ""
+        self.index = 0
+        self._offset = 0
+
+    @property
+    def position(self) -> int:
+        """Position in the stream of the next character to decode."""
+        return self._offset + self.index
+
+    def read_more(self, size: int = 0) -> bool:
+        """Read another chunk, dropping the decoded text.
+
+        Args:
+            size: Number of characters to read (`chunk_size` if `0`).
+
+        Returns:
+            Whether anything was read, `False` at the end of the stream.
+        """
+        chunk = self.stream.read(size or self.chunk_size)
+        if not chunk:
+            return False
+        self._offset += self.index
+        self.text = self.text[self.index :] + chunk
+        self.index = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip the whitespace and get the next character (empty at the end of the stream)."""
+        while True:
+            self.index = _WHITESPACE.match(self.text, self.index).end()  # type: ignore[union-attr]
+            if self.index < len(self.text) or not self.read_more():
+                return self.text[self.index : self.index + 1]
+
+    def decode(self, decoder: json.JSONDecoder) -> Any:  # noqa: ANN401
+        """Decode the next value, reading as many chunks as it spans.
+
+        Args:
+            decoder: JSON decoder.
+
+        Returns:
+            Decoded value.
+        """
+        while True:
+            # Chunks grow with the value, so a large value is decoded a few times only
+            size = max(self.chunk_size, len(self.text) - self.index)
+            try:
+                value, end = decoder.raw_decode(self.text, self.index)
+            except json.JSONDecodeError as error:
+                if not self.read_more(size):
+                    raise ConfigError(str(error)) from error
+                continue
+            # A value at the end of the text (e.g. a number) may go on in the next chunk
+            if end < len(self.text) or not self.read_more(size):
+                self.index = end
+                return value
+
+    def read_all(self) -> str:
+        """Read the rest of the stream.
+
+        Returns:
+            Text not decoded yet.
+        """
+        return self.text[self.index :] + self.stream.read()
+
+
+def _iter_json(stream: IO[str], chunk_size: int = _CHUNK_SIZE) -> Iterator[Any]:
+    """Iterate over the beacon definitions of a JSON file.
+
+    Items of a top level array are read and decoded one at a time.
+
+    Args:
+        stream: Text stream.
+        chunk_size: Number of characters read at once.
+
+    Yields:
+        Beacon definitions.
+    """
+    reader = _JsonReader(stream, chunk_size)
+    if reader.peek() != "[":
+        try:
+            document = json.loads(reader.read_all())
+        except json.JSONDecodeError as error:
+            raise ConfigError(str(error)) from error
+        yield from _iter_document(document)
+        return
+
+    decoder = json.JSONDecoder()
+    reader.index += 1
+    while reader.peek() != "]":
+        yield reader.decode(decoder)
+        separator = reader.peek()
+        if separator == ",":
+            reader.index += 1
+        elif separator != "]":
+            raise ConfigError(f"Expected ',' or ']' at position {reader.position}")
+
+
+def _iter_json_lines(stream: IO[str]) -> Iterator[Any]:
+    """Iterate over the beacon definitions of a JSON Lines file.
+
+    Args:
+        stream: Text stream.
+
+    Yields:
+        Beacon definitions.
+    """
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as error:
+            raise ConfigError(f"Line {number}: {error}") from error
+
+
+def _iter_yaml(stream: IO[str]) -> Iterator[Any]:
+    """Iterate over the beacon definitions of a YAML file.
+
+    Items of top level sequences are composed one at a time.
+
+    Args:
+        stream: Text stream.
+
+    Yields:
+        Beacon definitions.
+    """
+    try:
+        import yaml  # type: ignore[import-untyped]
+    except ImportError as error:  # pragma: no cover
+        raise ConfigError("PyYAML is required to load YAML files") from error
+
+    loader = yaml.SafeLoader(stream)
+    try:
+        loader.get_event()  # StreamStartEvent
+        while not loader.check_event(yaml.StreamEndEvent):
+            loader.get_event()  # DocumentStartEvent
+            if loader.check_event(yaml.SequenceStartEvent):
+                loader.get_event()
+                while not loader.check_event(yaml.SequenceEndEvent):
+                    yield loader.construct_document(loader.compose_node(None, None))
+                loader.get_event()
+            elif not loader.check_event(yaml.DocumentEndEvent):
+                yield from _iter_document(
+                    loader.construct_document(loader.compose_node(None, None))
+                )
+            loader.get_event()  # DocumentEndEvent
+    except yaml.YAMLError as error:
+        raise ConfigError(str(error)) from error
+    finally:
+        loader.dispose()
+
+
+def _iter_toml(stream: IO[str]) -> Iterator[Any]:
+    """Iterate over the beacon definitions of a TOML file (`[[beacons]]` tables).
+
+    Args:
+        stream: Text stream.
+
+    Yields:
+        Beacon definitions.
+    """
+    try:
+        import tomllib
+    except ImportError:  # pragma: no cover
+        try:
+            import tomli as tomllib  # type: ignore[no-redef,import-not-found]
+        except ImportError as error:
+            raise ConfigError("tomli is required to load TOML files") from error
+
+    try:
+        document = tomllib.loads(stream.read())
+    except tomllib.TOMLDecodeError as error:
+        raise ConfigError(str(error)) from error
+    yield from _iter_document(document)
+
+
+_LOADERS: Dict[str, Callable[[IO[str]], Iterator[Any]]] = {
+    ".json": _iter_json,
+    ".jsonl": _iter_json_lines,
+    ".ndjson": _iter_json_lines,
+    ".yaml": _iter_yaml,
+    ".yml": _iter_yaml,
+    ".toml": _iter_toml,
+}
+
+
+def iter_definitions(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Iterate over the beacon definitions of a configuration file.
+
+    Args:
+        path: Configuration file path, the format is chosen by its extension.
+
+    Yields:
+        Beacon definitions.
+    """
+    path = Path(path)
+    loader = _LOADERS.get(path.suffix.lower())
+    if not loader:
+        raise ConfigError(f"Unsupported configuration file format {path.suffix!r}")
+    with path.open(encoding="utf8") as stream:
+        for definition in loader(stream):
+            if not isinstance(definition, Mapping):
+                raise ConfigError(f"Expected a beacon definition, got {definition!r}")
+            yield dict(definition)
+
+
+def build_beacon(definition: Mapping[str, Any], **kwargs: Any) -> Beacon:  # noqa: ANN401
+    """Build a beacon from its definition.
+
+    Args:
+        definition: Beacon definition.
+        **kwargs: Extra keyword arguments for the beacon.
+
+    Returns:
+        Beacon instance.
+
+    Raises:
+        ConfigError: If the definition is invalid, naming the invalid field.
+    """
+    unknown = definition.keys() - _BEACON_FIELDS.keys()
+    if unknown:
+        raise ConfigError(f"Unknown beacon fields {sorted(unknown)}")
+    for key, value in definition.items():
+        types, description = _BEACON_FIELDS[key]
+        valid = isinstance(value, types) and not isinstance(value, bool)
+        if valid and isinstance(value, list):
+            valid = all(isinstance(item, str) for item in value)
+        if not valid:
+            raise ConfigError(f"`{key}` must be {description}, got {value!r}")
+    if "name" not in definition:
+        raise ConfigError(f"Missing beacon name in {dict(definition)!r}")
+    if "txt" in definition and "properties" in definition:
+        raise ConfigError("Beacon `txt` and `properties` are mutually exclusive")
+    if definition.get("protocol", "tcp") not in ("tcp", "udp"):
+        raise ConfigError(f"Unknown beacon protocol {definition['protocol']!r}")
+
+    try:
+        addresses = [ip_address(address) for address in definition.get("addresses", [])]
+    except ValueError as error:
+        raise ConfigError(str(error)) from error
+    properties: Union[bytes, Dict[str, Any]] = {
+        str(k): str(v) for k, v in definition.get("properties", {}).items()
+    } or definition.get("txt", "").encode("utf8")
+
+    options = {
+        key: definition[key]
+        for key in ("port", "protocol", "ttl", "weight", "priority", "reannounce_interval")
+        if key in definition
+    }
+    return Beacon(
+        aliases=[definition["name"], *definition.get("aliases", [])],
+        addresses=addresses,
+        type_=definition.get("type", "http"),
+        properties=properties,
+        **options,
+        **kwargs,
+    )
+
+
+def load_beacons(path: Union[str, Path], **kwargs: Any) -> Iterator[Beacon]:  # noqa: ANN401
+    """Load the beacons of a configuration file, one at a time.
+
+    Args:
+        path: Configuration file path, the format is chosen by its extension.
+        **kwargs: Extra keyword arguments for every beacon.
+
+    Yields:
+        Beacons.
+
+    Raises:
+        ConfigError: If a beacon definition is invalid, with its index.
+    """
+    for index, definition in enumerate(iter_definitions(path)):
+        try:
+            yield build_beacon(definition, **kwargs)
+        except ConfigError as error:
+            raise ConfigError(f"Beacon {index}: {error}") from error
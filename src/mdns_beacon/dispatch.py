@@ -0,0 +1,233 @@
+"""Service events dispatch module."""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, ClassVar, Dict, List, Optional, Set, Tuple, Union
+
+from zeroconf import ServiceListener, ServiceStateChange, Zeroconf
+
+from .metrics import metrics
+from .store import ServiceKey
+
+logger = logging.getLogger(__name__)
+
+Handlers = Union[ServiceListener, List[Callable[..., None]]]
+
+
+class _PendingEvent:
+    """Latest state change of a service, waiting to be dispatched."""
+
+    __slots__ = ("due", "state_change", "zeroconf")
+
+    def __init__(self, zeroconf: Zeroconf, state_change: ServiceStateChange, due: float) -> None:
+        self.zeroconf = zeroconf
+        self.state_change = state_change
+        self.due = due
+
+
+def coalesce_state_changes(
+    previous: Optional[ServiceStateChange], state_change: ServiceStateChange
+) -> Optional[ServiceStateChange]:
+    """Coalesce two consecutive state changes of a service.
+
+    Args:
+        previous: Pending state change (`None` if there is nothing pending).
+        state_change: New state change.
+
+    Returns:
+        The state change to dispatch, `None` if there is nothing left to dispatch.
+    """
+    if previous is ServiceStateChange.Added:
+        # The handlers never saw the service
+        return None if state_change is ServiceStateChange.Removed else previous
+    if previous is ServiceStateChange.Removed and state_change is ServiceStateChange.Added:
+        # The handlers saw the service, which may have changed
+        return ServiceStateChange.Updated
+    return state_change
+
+
+def _on_listener_change(
+    listener: ServiceListener,
+    zeroconf: Zeroconf,
+    service_type: str,
+    name: str,
+    state_change: ServiceStateChange,
+) -> None:
+    """Dispatch a service state change to a service listener."""
+    getattr(listener, EventDispatcher.LISTENER_METHODS[state_change])(zeroconf, service_type, name)
+
+
+def listener_callbacks(handlers: Handlers) -> List[Callable[..., None]]:
+    """Get the functions calling a service listener, or the list of functions.
+
+    Args:
+        handlers: Service listener or functions to be called when a service
+            is added, updated or removed.
+
+    Returns:
+        Functions to be called when a service is added, updated or removed.
+    """
+    if isinstance(handlers, list):
+        return list(handlers)
+    return [partial(_on_listener_change, handlers)]
+
+
+class EventDispatcher:
+    """Rate limited, deduplicating, dispatch of service state changes to handlers.
+
+    The state changes of a service (type and name) within `window` seconds are
+    coalesced, keeping its latest state, and the handlers run on a bounded
+    pool of worker threads. While all the workers are busy, the new state
+    changes keep being coalesced instead of queued: slow handlers never block
+    the caller (the zeroconf service browsers), and the backlog never exceeds
+    one state change per service.
+
+    The state changes of a service are dispatched in order, one at a time.
+
+    Attributes:
+        handlers: Service listener or functions to be called when a service
+            is added, updated or removed.
+        window: Amount of time the state changes of a service are coalesced
+            (in seconds).
+        max_workers: Maximum number of handlers running at the same time.
+    """
+
+    LISTENER_METHODS: ClassVar[Dict[ServiceStateChange, str]] = {
+        ServiceStateChange.Added: "add_service",
+        ServiceStateChange.Removed: "remove_service",
+        ServiceStateChange.Updated: "update_service",
+    }
+
+    def __init__(self, handlers: Handlers, window: float = 0.5, max_workers: int = 4) -> None:
+        """Init an event dispatcher.
+
+        Args:
+            handlers: Service listener or functions to be called when a
+                service is added, updated or removed.
+            window: Amount of time the state changes of a service are
+                coalesced (in seconds).
+            max_workers: Maximum number of handlers running at the same time.
+
+        Raises:
+            ValueError: If `window` is negative or `max_workers` is lower than `1`.
+        """
+        if window < 0:
+            raise ValueError("window must not be negative")
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.handlers = handlers
+        self.window = window
+        self.max_workers = max_workers
+        self._callbacks = listener_callbacks(handlers)
+        self._pending: Dict[ServiceKey, _PendingEvent] = {}
+        self._running: Set[ServiceKey] = set()
+        self._closed = False
+        self._condition = threading.Condition()
+        self._slots = threading.Semaphore(max_workers)
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="mdns-beacon-dispatch")
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __call__(
+        self, zeroconf: Zeroconf, service_type: str, name: str, state_change: ServiceStateChange
+    ) -> None:
+        """On service state change handler.
+
+        Returns right away, the handlers are called once the window of the
+        service is over and a worker is available.
+        """
+        key = (service_type, name)
+        with self._condition:
+            if self._closed:
+                return
+            pending = self._pending.get(key)
+            if pending is None:
+                self._pending[key] = _PendingEvent(
+                    zeroconf, state_change, time.monotonic() + self.window
+                )
+                self._condition.notify()
+                return
+            merged = coalesce_state_changes(pending.state_change, state_change)
+            if merged is None:
+                del self._pending[key]
+            else:
+                pending.zeroconf, pending.state_change = zeroconf, merged
+
+    def _next(self) -> Optional[Tuple[ServiceKey, _PendingEvent]]:
+        """Wait for the next due state change, of a service not being dispatched.
+
+        Returns:
+            The service type and name with its state change, `None` once closed
+            and all the state changes are dispatched.
+        """
+        with self._condition:
+            while True:
+                timeout = None
+                for key, event in self._pending.items():
+                    if key in self._running:
+                        continue
+                    delay = event.due - time.monotonic()
+                    if delay <= 0 or self._closed:
+                        del self._pending[key]
+                        self._running.add(key)
+                        return key, event
+                    timeout = delay
+                    break
+                if self._closed and not self._pending:
+                    return None
+                self._condition.wait(timeout)
+
+    def _run(self) -> None:
+        """Submit the due state changes to the workers, as they become available."""
+        while True:
+            self._slots.acquire()
+            item = self._next()
+            if item is None:
+                self._slots.release()
+                return
+            self._executor.submit(self._dispatch, *item)
+
+    def _dispatch(self, key: ServiceKey, event: _PendingEvent) -> None:
+        """Call the handlers with a state change."""
+        service_type, name = key
+        try:
+            for callback in self._callbacks:
+                start = time.perf_counter() if metrics.enabled else 0.0
+                try:
+                    callback(
+                        zeroconf=event.zeroconf,
+                        service_type=service_type,
+                        name=name,
+                        state_change=event.state_change,
+                    )
+                except Exception:
+                    logger.exception(
+                        "Handler of %(name)s %(state_change)s failed",
+                        {"name": name, "state_change": event.state_change},
+                    )
+                if metrics.enabled:
+                    metrics.handler_seconds.observe(time.perf_counter() - start)
+        finally:
+            with self._condition:
+                self._running.discard(key)
+                self._condition.notify()
+            self._slots.release()
+
+    @property
+    def pending(self) -> int:
+        """Number of state changes waiting to be dispatched."""
+        return len(self._pending)
+
+    def close(self) -> None:
+        """Dispatch the pending state changes right away and wait for the handlers.
+
+        Further state changes are ignored.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self._executor.shutdown(wait=True)
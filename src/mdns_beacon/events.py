@@ -0,0 +1,153 @@
+"""Service events queue module."""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Deque, Dict, NamedTuple, Optional, get_args
+
+from typing_extensions import Literal
+from zeroconf import ServiceStateChange, Zeroconf
+
+from .dispatch import coalesce_state_changes
+from .store import ServiceKey
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW = Literal["drop_oldest", "block", "coalesce"]
+
+
+class ServiceEvent(NamedTuple):
+    """Service state change.
+
+    Attributes:
+        service_type: Fully qualified service type name.
+        name: Fully qualified service name.
+        state_change: Service added, updated or removed.
+    """
+
+    service_type: str
+    name: str
+    state_change: ServiceStateChange
+
+
+class EventQueue:
+    """Bounded queue of service events, consumed from an event loop.
+
+    Used as a service browser handler, it returns right away and never
+    blocks its caller (the zeroconf event loop). When the handler is called
+    from the queue event loop the events are queued directly, otherwise they
+    are handed off to it.
+
+    Once the queue is full, the `overflow` policy applies:
+
+    - `drop_oldest`: the oldest event is dropped.
+    - `block`: the new events wait for room, in order, in a buffer of the
+      queue event loop holding at most `max_size` events. Beyond that, the
+      oldest waiting event is dropped.
+    - `coalesce`: the events of a service already queued are merged into its
+      queued event, keeping its latest state, and the oldest event is dropped
+      only once the queue is full of different services.
+
+    Attributes:
+        max_size: Maximum number of queued events.
+        overflow: Policy once the queue is full.
+        loop: Event loop consuming the events.
+        dropped: Number of dropped events.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        overflow: OVERFLOW = "drop_oldest",
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> None:
+        """Init an empty event queue.
+
+        Args:
+            max_size: Maximum number of queued events.
+            overflow: Policy once the queue is full.
+            loop: Event loop consuming the events (the running one if `None`).
+
+        Raises:
+            ValueError: If `max_size` is lower than `1` or `overflow` is unknown.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if overflow not in get_args(OVERFLOW):
+            raise ValueError(f"Unknown overflow policy {overflow!r}")
+        self.max_size = max_size
+        self.overflow = overflow
+        self.loop = loop or asyncio.get_running_loop()
+        self.dropped = 0
+        self._queue: "asyncio.Queue[ServiceEvent]" = asyncio.Queue(max_size)
+        # Latest state change of each queued service (coalesce policy)
+        self._latest: Dict[ServiceKey, Optional[ServiceStateChange]] = {}
+        # Events waiting for room (block policy)
+        self._waiting: Deque[ServiceEvent] = deque()
+
+    def qsize(self) -> int:
+        """Number of queued events."""
+        return self._queue.qsize()
+
+    def __call__(
+        self, zeroconf: Zeroconf, service_type: str, name: str, state_change: ServiceStateChange
+    ) -> None:
+        """On service state change handler."""
+        event = ServiceEvent(service_type, name, state_change)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self.put_nowait(event)
+        else:
+            self.loop.call_soon_threadsafe(self.put_nowait, event)
+
+    def put_nowait(self, event: ServiceEvent) -> None:
+        """Queue an event, from the queue event loop, applying the overflow policy.
+
+        Args:
+            event: Service event.
+        """
+        if self.overflow == "coalesce":
+            key = (event.service_type, event.name)
+            if key in self._latest:
+                self._latest[key] = coalesce_state_changes(self._latest[key], event.state_change)
+                return
+            self._latest[key] = event.state_change
+        if self.overflow == "block":
+            if self._waiting or self._queue.full():
+                # Keep the events order, behind the ones already waiting
+                if len(self._waiting) >= self.max_size:
+                    oldest = self._waiting.popleft()
+                    self.dropped += 1
+                    logger.debug("Event queue full, %(event)s dropped", {"event": oldest})
+                self._waiting.append(event)
+                return
+        elif self._queue.full():
+            oldest = self._queue.get_nowait()
+            self._latest.pop((oldest.service_type, oldest.name), None)
+            self.dropped += 1
+            logger.debug("Event queue full, %(event)s dropped", {"event": oldest})
+        self._queue.put_nowait(event)
+
+    async def get(self) -> ServiceEvent:
+        """Wait for the next event.
+
+        Returns:
+            The oldest queued event, with the latest state of the service
+            with the coalesce policy.
+        """
+        while True:
+            event = await self._queue.get()
+            if self._waiting:
+                self._queue.put_nowait(self._waiting.popleft())
+            if self.overflow != "coalesce":
+                return event
+            state_change = self._latest.pop((event.service_type, event.name), None)
+            if state_change is not None:
+                return event._replace(state_change=state_change)
+
+    def close(self) -> None:
+        """Drop the events waiting for room."""
+        self._waiting.clear()
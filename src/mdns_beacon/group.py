@@ -0,0 +1,226 @@
+"""Beacon group module."""
+
+import asyncio
+import logging
+from typing import Iterable, List, Optional
+
+from zeroconf import InterfacesType, IPVersion
+
+from .base import BaseBeacon
+from .beacon import Beacon
+from .interfaces import select_interfaces
+from .pool import zeroconf_pool
+from .readiness import readiness_gate
+from .tracing import traced
+
+logger = logging.getLogger(__name__)
+
+
+class BeaconGroup(BaseBeacon):
+    """Group of mDNS Beacons served from a single zeroconf instance.
+
+    The group uses the interfaces on the same subnet as any of the addresses
+    of its beacons, see `Beacon`, and the interfaces of the beacons are
+    ignored.
+
+    Attributes:
+        beacons: Beacons of the group.
+        delay_startup: Maximum amount of time to wait for the addresses
+            of the beacons to be bindable before trying to start the zeroconf
+            service (in seconds).
+        interfaces: Network interface names, addresses or networks (CIDR
+            notation) to use, or `default` (all the interfaces if empty).
+        *args: Variable length argument list.
+        **kwargs: Arbitrary keyword arguments.
+    """
+
+    def __init__(
+        self,
+        beacons: Iterable[Beacon],
+        delay_startup: int = 0,
+        *args: Optional[IPVersion],
+        interfaces: Optional[Iterable[str]] = None,
+        **kwargs: Optional[IPVersion],
+    ) -> None:
+        """Init a mDNS Beacon group.
+
+        Args:
+            beacons: Beacons of the group, they must use the same IP
+                version as the group.
+            delay_startup: Maximum amount of time to wait for the addresses
+                of the beacons to be bindable before trying to start the
+                zeroconf service (in seconds).
+            interfaces: Network interface names, addresses or networks (CIDR
+                notation) to use, or `default` (all the interfaces if empty).
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+        """
+        super().__init__(*args, interfaces=interfaces, **kwargs)
+        self.beacons = self._check_beacons(beacons)
+        self.delay_startup = delay_startup
+
+    def _check_beacons(self, beacons: Iterable[Beacon]) -> List[Beacon]:
+        """Check the beacons use the same IP version as the group.
+
+        Args:
+            beacons: Beacons to check.
+
+        Returns:
+            Beacons list.
+        """
+        beacons = list(beacons)
+        if any(beacon.ip_version != self.ip_version for beacon in beacons):
+            raise ValueError("Beacons must use the same IP version as the group")
+        return beacons
+
+    def _select_interfaces(self) -> InterfacesType:
+        """Select the network interfaces on the same subnet as the beacons addresses.
+
+        Returns:
+            Zeroconf interface choice or interface addresses list.
+        """
+        addresses = {address for beacon in self.beacons for address in beacon.addresses}
+        return select_interfaces(self.interfaces, self.ip_version, addresses)
+
+    def _share_zeroconf(self, beacons: Iterable[Beacon]) -> None:
+        """Make the beacons use the group zeroconf instance.
+
+        Args:
+            beacons: Beacons to start.
+        """
+        for beacon in beacons:
+            if not beacon._zeroconf:
+                beacon._zeroconf = zeroconf_pool.share(self.zeroconf)
+
+    async def async_register_services(self) -> None:
+        """Register the services of all the beacons concurrently."""
+        await asyncio.gather(*(beacon.async_register_services() for beacon in self.beacons))
+
+    async def async_unregister_services(self) -> None:
+        """Unregister the services of all the beacons concurrently."""
+        await asyncio.gather(*(beacon.async_unregister_services() for beacon in self.beacons))
+
+    async def async_reload(self, beacons: Iterable[Beacon]) -> None:
+        """Reload the group from a running event loop.
+
+        Beacons replacing a current one (same service type and at least one
+        alias in common) reload it incrementally, the current beacons without
+        replacement are stopped and the rest are started.
+
+        The started beacons failing to register their services are stopped and
+        left out of the group, and the first error is raised once the group
+        is reloaded.
+
+        Args:
+            beacons: New beacons of the group.
+        """
+        beacons = self._check_beacons(beacons)
+        current = {id(beacon): beacon for beacon in self.beacons}
+        index = {
+            (beacon.service_type, alias): beacon
+            for beacon in self.beacons
+            for alias in beacon.aliases
+        }
+        next_beacons: List[Beacon] = []
+        reloads = []
+        started = []
+        for beacon in beacons:
+            candidates = (
+                index[(beacon.service_type, alias)]
+                for alias in beacon.aliases
+                if (beacon.service_type, alias) in index
+            )
+            match = current.pop(id(beacon), None) or next(
+                (c for c in candidates if current.pop(id(c), None)), None
+            )
+            if not match:
+                next_beacons.append(beacon)
+                started.append(beacon)
+                continue
+            next_beacons.append(match)
+            reloads.append(
+                match.async_reload(
+                    aliases=beacon.aliases,
+                    addresses=beacon.addresses,
+                    port=beacon.port,
+                    ttl=beacon.ttl,
+                    weight=beacon.weight,
+                    priority=beacon.priority,
+                    properties=beacon.properties,
+                )
+            )
+        logger.info(
+            "Reloading beacons: %(stopped)s stopped, %(started)s started",
+            {"stopped": len(current), "started": len(started)},
+        )
+        self.beacons = next_beacons
+        await asyncio.gather(*(beacon.async_stop() for beacon in current.values()))
+        await asyncio.gather(*reloads)
+        if self._zeroconf:
+            self._share_zeroconf(started)
+        results = await asyncio.gather(
+            *(beacon.async_register_services() for beacon in started), return_exceptions=True
+        )
+        failed = {
+            id(beacon): result
+            for beacon, result in zip(started, results, strict=True)
+            if isinstance(result, BaseException)
+        }
+        if failed:
+            self.beacons = [beacon for beacon in self.beacons if id(beacon) not in failed]
+            await asyncio.gather(
+                *(beacon.async_stop() for beacon in started if id(beacon) in failed)
+            )
+            raise next(iter(failed.values()))
+
+    def reload(self, beacons: Iterable[Beacon]) -> None:
+        """Reload the group, re-registering only the changed services.
+
+        Args:
+            beacons: New beacons of the group.
+        """
+        if not self._zeroconf:
+            self.beacons = self._check_beacons(beacons)
+            return
+        self._run_coroutine(self.async_reload(beacons))
+
+    async def _async_start_beacon(self, beacon: Beacon) -> None:
+        """Register the services of a beacon as soon as its addresses are bindable.
+
+        Args:
+            beacon: Beacon to start.
+        """
+        await readiness_gate.async_wait(beacon.addresses, timeout=self.delay_startup)
+        await beacon.async_register_services()
+
+    async def async_start(self) -> None:
+        """Start the beacons from a running event loop.
+
+        Each beacon starts as soon as its addresses are bindable, the beacons
+        waiting for the same addresses share the wait.
+        """
+        self._share_zeroconf(self.beacons)
+        await asyncio.gather(*(self._async_start_beacon(beacon) for beacon in self.beacons))
+
+    async def async_stop(self) -> None:
+        """Stop the beacons from a running event loop."""
+        await asyncio.gather(*(beacon.async_stop() for beacon in self.beacons))
+        await super().async_stop()
+
+    @traced()
+    def stop(self) -> None:
+        """Stop the beacons.
+
+        Unregister the services of all the beacons.
+        """
+        if self._zeroconf:
+            self._run_coroutine(self.async_unregister_services())
+        for beacon in self.beacons:
+            beacon.stop()
+        super().stop()
+
+    @traced()
+    def _execute(self) -> None:
+        """Register the services of all the beacons on the local network."""
+        logger.info("Starting %(beacons_len)s beacons", {"beacons_len": len(self.beacons)})
+        self._run_coroutine(self.async_start())
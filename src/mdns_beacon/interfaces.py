@@ -0,0 +1,147 @@
+"""Network interfaces selection module."""
+
+import logging
+from ipaddress import (
+    IPv4Address,
+    IPv4Interface,
+    IPv6Address,
+    IPv6Interface,
+    ip_interface,
+    ip_network,
+)
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Union
+
+import ifaddr
+from zeroconf import InterfaceChoice, InterfacesType, IPVersion
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERFACE = "default"
+
+
+class InterfaceAddress(NamedTuple):
+    """Address of a network interface.
+
+    Attributes:
+        name: Network interface name.
+        ifindex: Network interface index.
+        interface: Address with its network.
+    """
+
+    name: str
+    ifindex: int
+    interface: Union[IPv4Interface, IPv6Interface]
+
+
+def _includes(ip_version: Optional[IPVersion], version: int) -> bool:
+    """Whether an IP version (IPv4 only if `None`) includes the addresses of a version."""
+    if version == 6:
+        return ip_version in (IPVersion.V6Only, IPVersion.All)
+    return ip_version != IPVersion.V6Only
+
+
+def interface_addresses(ip_version: Optional[IPVersion] = None) -> Iterator[InterfaceAddress]:
+    """Iterate over the addresses of the network interfaces.
+
+    Args:
+        ip_version: IP protocol version of the addresses (IPv4 only if `None`,
+            as zeroconf does).
+
+    Yields:
+        Network interface address.
+    """
+    for adapter in ifaddr.get_adapters():
+        for ip in adapter.ips:
+            address = ip.ip[0] if isinstance(ip.ip, tuple) else ip.ip
+            interface = ip_interface(f"{address}/{ip.network_prefix}")
+            if _includes(ip_version, interface.version):
+                yield InterfaceAddress(adapter.name, adapter.index or 0, interface)
+
+
+def _match(spec: str, addresses: Iterable[InterfaceAddress]) -> List[InterfaceAddress]:
+    """Get the addresses matching an interface name, address or network.
+
+    Args:
+        spec: Network interface name, address or network (CIDR notation).
+        addresses: Network interface addresses.
+
+    Returns:
+        Matching addresses.
+    """
+    try:
+        network = ip_network(spec, strict=False)
+    except ValueError:
+        return [address for address in addresses if address.name == spec]
+    return [address for address in addresses if address.interface.ip in network]
+
+
+def _to_interfaces(addresses: Iterable[InterfaceAddress]) -> InterfacesType:
+    """Convert interface addresses to a zeroconf interfaces list.
+
+    IPv4 interfaces are given by address, IPv6 interfaces by index as zeroconf
+    joins their multicast group by index.
+    """
+    interfaces: List[Union[str, int]] = []
+    for address in addresses:
+        interface: Union[str, int] = (
+            address.ifindex if address.interface.version == 6 else str(address.interface.ip)
+        )
+        if interface not in interfaces:
+            interfaces.append(interface)
+    return interfaces
+
+
+def select_interfaces(
+    interfaces: Optional[Iterable[str]] = None,
+    ip_version: Optional[IPVersion] = None,
+    addresses: Iterable[Union[IPv4Address, IPv6Address]] = (),
+) -> InterfacesType:
+    """Select the network interfaces zeroconf sends and receives on.
+
+    Interfaces are given by name (e.g. `eth0`), address or network in CIDR
+    notation (e.g. `192.168.1.0/24`), or `default` for the interface of the
+    default route. Out of the selected interfaces, only the ones on the same
+    subnet as any of the (non loopback) `addresses` are kept, if any.
+
+    Args:
+        interfaces: Network interface names, addresses or networks (all the
+            interfaces if empty).
+        ip_version: IP protocol version.
+        addresses: Announced IP addresses.
+
+    Returns:
+        Zeroconf interface choice or interface addresses list.
+
+    Raises:
+        ValueError: If `default` is combined with other interfaces, or an
+            interface has no address of the IP version.
+    """
+    specs = list(dict.fromkeys(interfaces or []))
+    if DEFAULT_INTERFACE in specs:
+        if len(specs) > 1:
+            raise ValueError(f"{DEFAULT_INTERFACE!r} can not be combined with other interfaces")
+        return InterfaceChoice.Default
+
+    available = list(interface_addresses(ip_version))
+    selected = available
+    if specs:
+        selected = []
+        for spec in specs:
+            matches = _match(spec, available)
+            if not matches:
+                raise ValueError(f"No usable address on network interface {spec!r}")
+            selected.extend(match for match in matches if match not in selected)
+
+    routable = [address for address in addresses if not address.is_loopback]
+    subnet = [
+        address for address in selected if any(ip in address.interface.network for ip in routable)
+    ]
+    if subnet:
+        logger.debug(
+            "Selected interfaces %(interfaces)s matching %(addresses)s",
+            {"interfaces": [str(a.interface) for a in subnet], "addresses": routable},
+        )
+        return _to_interfaces(subnet)
+    if not specs:
+        return InterfaceChoice.All
+    return _to_interfaces(selected)
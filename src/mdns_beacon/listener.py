@@ -1,15 +1,132 @@
 """mDNS listener module."""
 
+import asyncio
 import logging
-from typing import Callable, ClassVar, List, Optional, Set, Union
+from typing import AsyncGenerator, Callable, ClassVar, Dict, Iterable, List, Optional, Set, Union
 
-from zeroconf import IPVersion, ServiceBrowser, ServiceListener, ZeroconfServiceTypes
+from zeroconf import IPVersion, ServiceListener, ServiceStateChange, Zeroconf
+from zeroconf.asyncio import AsyncServiceBrowser
 
 from .base import BaseBeacon
+from .dispatch import EventDispatcher
+from .events import OVERFLOW, EventQueue, ServiceEvent
+from .metrics import metrics
+from .resolver import ServiceResolver
+from .service_types import SERVICE_TYPE_ENUMERATION, ServiceTypesCache, service_types_cache
+from .store import ServiceKey, ServiceRecord, ServiceStore
+from .tracing import traced
 
 logger = logging.getLogger(__name__)
 
 
+class _Browsers:
+    """Async service browsers of service types, in the zeroconf event loop.
+
+    When discovering the service types, `on_found_type` is called with each
+    type the first time it is announced. The types not browsed yet are
+    browsed right away, and `on_new_type` is called with them.
+    """
+
+    def __init__(
+        self,
+        zeroconf: Zeroconf,
+        services: Set[str],
+        handlers: List[Callable[..., None]],
+        discover_types: bool,
+        on_new_type: Optional[Callable[[str], None]] = None,
+        on_found_type: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self.zeroconf = zeroconf
+        self.services = set(services)
+        self.on_new_type = on_new_type
+        self.on_found_type = on_found_type
+        self.found_types: Set[str] = set()
+        self.handlers = handlers
+        self.browsers = [
+            AsyncServiceBrowser(zeroconf, list(self.services), handlers=self.handlers)
+        ]
+        if discover_types:
+            self.browsers.append(
+                AsyncServiceBrowser(
+                    zeroconf, SERVICE_TYPE_ENUMERATION, handlers=[self.on_service_type]
+                )
+            )
+
+    def on_service_type(
+        self, zeroconf: Zeroconf, service_type: str, name: str, state_change: ServiceStateChange
+    ) -> None:
+        """On service type state change handler, browse the new service types."""
+        if state_change is not ServiceStateChange.Added:
+            return
+        if name not in self.found_types:
+            self.found_types.add(name)
+            if self.on_found_type:
+                self.on_found_type(name)
+        if name not in self.services:
+            logger.debug("Browsing new service type %(type)s", {"type": name})
+            self.services.add(name)
+            self.browsers.append(AsyncServiceBrowser(zeroconf, name, handlers=self.handlers))
+            if self.on_new_type:
+                self.on_new_type(name)
+
+    async def async_cancel(self) -> None:
+        """Cancel the service browsers."""
+        for browser in self.browsers:
+            await browser.async_cancel()
+
+
+def _counted(handlers: List[Callable[..., None]]) -> List[Callable[..., None]]:
+    """Count the service events along the handlers, when the metrics are enabled."""
+    return [metrics.on_service_state_change, *handlers] if metrics.enabled else handlers
+
+
+class _Scan:
+    """Services browsed and resolved by a bounded-time scan, in the zeroconf event loop."""
+
+    def __init__(
+        self, zeroconf: Zeroconf, services: Set[str], discover_types: bool, timeout: float
+    ) -> None:
+        self.store = ServiceStore()
+        self.resolver = ServiceResolver(zeroconf, timeout=timeout)
+        self.resolutions: Dict[ServiceKey, "asyncio.Task[None]"] = {}
+        self.activity = asyncio.Event()
+        self.browsers = _Browsers(
+            zeroconf,
+            services,
+            _counted([self.on_change]),
+            discover_types,
+            on_new_type=lambda name: self.activity.set(),
+        )
+
+    async def _async_resolve(self, key: ServiceKey) -> None:
+        """Resolve a service and store it."""
+        info = await self.resolver.async_resolve(*key)
+        if info:
+            self.store.upsert(ServiceRecord.from_info(info))
+        self.resolutions.pop(key, None)
+        self.activity.set()
+
+    def on_change(
+        self, zeroconf: Zeroconf, service_type: str, name: str, state_change: ServiceStateChange
+    ) -> None:
+        """On service state change handler, (re)resolve or remove the service."""
+        key = (service_type, name)
+        previous = self.resolutions.pop(key, None)
+        if previous:
+            previous.cancel()
+        if state_change is ServiceStateChange.Removed:
+            self.store.remove(key)
+        else:
+            self.resolutions[key] = asyncio.ensure_future(self._async_resolve(key))
+        self.activity.set()
+
+    async def async_cancel(self) -> None:
+        """Cancel the service browsers and the pending resolutions."""
+        await self.browsers.async_cancel()
+        for resolution in self.resolutions.values():
+            resolution.cancel()
+
+
 class BeaconListener(BaseBeacon):
     """mDNS Beacon listener.
 
@@ -17,17 +134,31 @@ class BeaconListener(BaseBeacon):
         handlers: Service listeners or functions to be called when a
             service is added, updated or removed.
         services: Fully qualified service type names list.
-        timeout: Seconds to wait for any responses.
+        timeout: Amount of time the service types are discovered before
+            caching them, and minimum time between the later writes of the
+            newly found ones (in seconds).
+        types_cache: Cache of the discovered service types.
+        coalesce_window: Amount of time the state changes of a service are
+            coalesced before calling the handlers (in seconds).
+        max_workers: Maximum number of handlers running at the same time.
     """
 
     _DEFAULT_SERVICES: ClassVar[Set[str]] = {"_http._tcp.local.", "_hap._tcp.local."}
+    _browsers: Optional[_Browsers] = None
+    _types_timer: Optional[asyncio.TimerHandle] = None
+    _types_cached = False
+    _dispatcher: Optional[EventDispatcher] = None
 
     def __init__(
         self,
         handlers: Union[ServiceListener, List[Callable[..., None]]],
         services: Optional[List[str]] = None,
         timeout: Union[int, float] = 5,
+        types_cache: Optional[ServiceTypesCache] = None,
+        coalesce_window: Optional[float] = None,
+        max_workers: int = 4,
         *args: Optional[IPVersion],
+        interfaces: Optional[Iterable[str]] = None,
         **kwargs: Optional[IPVersion],
     ) -> None:
         """Init a mDNS Beacon listener.
@@ -35,24 +166,302 @@ class BeaconListener(BaseBeacon):
         Args:
             handlers: Service listeners or functions to be called when a
                 service is added, updated or removed.
-            services: Fully qualified service type names list.
-            timeout: Seconds to wait for any responses.
+            services: Fully qualified service type names list (the default
+                and discovered ones if `None`).
+            timeout: Amount of time the service types are discovered before
+                caching them, and minimum time between the later writes of the
+                newly found ones (in seconds).
+            types_cache: Cache of the discovered service types (the process
+                wide one if `None`).
+            coalesce_window: Amount of time the state changes of a service
+                are coalesced before calling the handlers, from a pool of
+                `max_workers` threads (in seconds). If `None`, the handlers
+                are called in order from a single thread as soon as possible,
+                and only the state changes of a service received while the
+                handlers are busy are coalesced, see
+                `mdns_beacon.dispatch.EventDispatcher`.
+            max_workers: Maximum number of handlers running at the same time.
+            interfaces: Network interface names, addresses or networks (CIDR
+                notation) to use, or `default` (all the interfaces if empty).
             *args: Variable length argument list.
             **kwargs: Arbitrary keyword arguments.
         """
-        super().__init__(*args, **kwargs)
+        super().__init__(*args, interfaces=interfaces, **kwargs)
         self.handlers = handlers
         self.timeout = timeout
+        self.types_cache = types_cache or service_types_cache
+        self.coalesce_window = coalesce_window
+        self.max_workers = max_workers
+        self.discover_types = not services
         self.services = set(services or self.default_services)
 
     @property
     def default_services(self) -> Set[str]:
-        """Return default services to listen on local networks."""
-        return self._DEFAULT_SERVICES | set(
-            ZeroconfServiceTypes.find(zc=self.zeroconf, timeout=self.timeout)
+        """Return default services to listen on local networks.
+
+        The default service types and the cached ones, the service types
+        announced on the local networks are discovered while listening.
+        """
+        return self._DEFAULT_SERVICES | (self.types_cache.get() or set())
+
+    @property
+    def _browser_handlers(self) -> List[Callable[..., None]]:
+        """Handlers of the service browsers, handing the state changes off to the dispatcher.
+
+        When the metrics are enabled, the events are counted (the dispatcher
+        times the handlers it calls).
+        """
+        return _counted([self._dispatcher]) if self._dispatcher else []
+
+    def _on_found_type(self, name: str) -> None:
+        """On service type found handler, from the zeroconf event loop.
+
+        Once the types found within `timeout` seconds are cached, the types
+        found later are cached at most once every `timeout` seconds.
+        """
+        if not self._types_timer:
+            self._types_timer = asyncio.get_running_loop().call_later(
+                self.timeout, self._cache_types
+            )
+
+    def _cache_types(self) -> None:
+        """Cache the service types discovered so far, from the zeroconf event loop.
+
+        The cache is saved from a worker thread.
+        """
+        self._types_timer = None
+        self._types_cached = True
+        if self._browsers:
+            asyncio.get_running_loop().run_in_executor(
+                None, self.types_cache.update, set(self._browsers.found_types)
+            )
+
+    async def events(
+        self, max_size: int = 1024, overflow: OVERFLOW = "drop_oldest"
+    ) -> AsyncGenerator[ServiceEvent, None]:
+        """Iterate over the service state changes, from a running event loop.
+
+        The events are queued in a bounded queue, see
+        `mdns_beacon.events.EventQueue` for the `overflow` policies. When the
+        listener zeroconf instance is first used from the running event loop,
+        zeroconf runs in it and the events go straight from the service
+        browsers to the queue, without thread handoffs.
+
+        The service browsers are cancelled once the iterator is closed, wrap
+        it in `contextlib.aclosing` to close it as soon as the loop is left.
+
+        Args:
+            max_size: Maximum number of queued events.
+            overflow: Policy once the queue is full (`drop_oldest`, `block`
+                or `coalesce`).
+
+        Yields:
+            Service state changes.
+        """
+        queue = EventQueue(max_size=max_size, overflow=overflow)
+
+        async def _browse() -> _Browsers:
+            return _Browsers(self.zeroconf, self.services, _counted([queue]), self.discover_types)
+
+        browsers = await self._async_run_coroutine(_browse())
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            queue.close()
+            await self._async_run_coroutine(browsers.async_cancel())
+
+    async def async_scan(
+        self,
+        duration: float = 5,
+        max_results: Optional[int] = None,
+        quiet_interval: Optional[float] = None,
+    ) -> List[ServiceRecord]:
+        """Discover the services from the zeroconf event loop, for a bounded time.
+
+        The services are browsed and resolved concurrently until the
+        `duration` deadline, the `max_results` count is reached or no service
+        has changed for `quiet_interval` seconds (with no pending resolution).
+        When discovering the service types, each new type is browsed as soon
+        as it is announced.
+
+        Args:
+            duration: Maximum amount of time to scan (in seconds).
+            max_results: Maximum number of services to return.
+            quiet_interval: Amount of time without changes after which the
+                scan stops early (in seconds).
+
+        Returns:
+            The resolved services, in discovery order.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + duration
+        scan = _Scan(self.zeroconf, self.services, self.discover_types, timeout=min(duration, 3))
+        try:
+            await self._async_wait_scan(
+                scan.activity,
+                deadline,
+                quiet_interval,
+                done=lambda: bool(max_results and len(scan.store) >= max_results),
+                busy=lambda: bool(scan.resolutions),
+            )
+        finally:
+            await scan.async_cancel()
+        # Scans cut short by the number of results may have missed service types
+        if self.discover_types and not (max_results and len(scan.store) >= max_results):
+            self.types_cache.update(scan.browsers.found_types)
+        logger.debug("Scan found %(services_len)s services", {"services_len": len(scan.store)})
+        return list(scan.store)[:max_results]
+
+    @staticmethod
+    async def _async_wait_scan(
+        activity: asyncio.Event,
+        deadline: float,
+        quiet_interval: Optional[float],
+        done: Callable[[], bool],
+        busy: Callable[[], bool],
+    ) -> None:
+        """Wait until a scan is done, its deadline or the network is quiet.
+
+        Args:
+            activity: Event set on every service change.
+            deadline: Event loop time at which the scan ends.
+            quiet_interval: Amount of time without changes after which the
+                scan ends, unless busy.
+            done: Whether enough services were found.
+            busy: Whether services are still being resolved.
+        """
+        loop = asyncio.get_running_loop()
+        last_change = loop.time()
+        while not done():
+            activity.clear()
+            now = loop.time()
+            wake_up = deadline
+            if quiet_interval is not None and not busy():
+                wake_up = min(wake_up, last_change + quiet_interval)
+            if now >= wake_up:
+                return
+            try:
+                await asyncio.wait_for(activity.wait(), wake_up - now)
+            except asyncio.TimeoutError:
+                continue
+            last_change = loop.time()
+
+    def scan(
+        self,
+        duration: float = 5,
+        max_results: Optional[int] = None,
+        quiet_interval: Optional[float] = None,
+    ) -> List[ServiceRecord]:
+        """Discover the services for a bounded time, see `async_scan`.
+
+        Args:
+            duration: Maximum amount of time to scan (in seconds).
+            max_results: Maximum number of services to return.
+            quiet_interval: Amount of time without changes after which the
+                scan stops early (in seconds).
+
+        Returns:
+            The resolved services, in discovery order.
+        """
+        return self._run_coroutine(self.async_scan(duration, max_results, quiet_interval))
+
+    def _start_handlers(self) -> None:
+        """Start the dispatcher calling the handlers.
+
+        Without `coalesce_window`, the handlers are called in order from a
+        single worker, with no coalescing window.
+        """
+        if self._dispatcher:
+            return
+        if self.coalesce_window is None:
+            self._dispatcher = EventDispatcher(self.handlers, window=0, max_workers=1)
+        else:
+            self._dispatcher = EventDispatcher(
+                self.handlers, window=self.coalesce_window, max_workers=self.max_workers
+            )
+
+    async def _async_browse(self) -> None:
+        """Start the service browsers, in the zeroconf event loop."""
+        if self._browsers:
+            return
+        self._browsers = _Browsers(
+            self.zeroconf,
+            self.services,
+            self._browser_handlers,
+            self.discover_types,
+            on_new_type=self.services.add,
+            on_found_type=self._on_found_type,
         )
+        self._types_cached = False
+        if self.discover_types:
+            self._types_timer = asyncio.get_running_loop().call_later(
+                self.timeout, self._cache_types
+            )
 
+    @traced()
     def _execute(self) -> None:
-        """Listen for services on the local network."""
+        """Listen for services on the local network.
+
+        The services are browsed from the zeroconf event loop, and the
+        handlers are called from the dispatcher workers. When discovering the
+        service types, a browser is started for each new type as soon as it
+        is announced. The types found within `timeout` seconds are cached,
+        then the types found later at most once every `timeout` seconds and
+        on stop.
+        """
+        logger.debug("Executing beacon listener")
+        self._start_handlers()
+        self._run_coroutine(self._async_browse())
+
+    async def async_start(self) -> None:
+        """Start listening from a running event loop, see `_execute`."""
         logger.debug("Executing beacon listener")
-        ServiceBrowser(zc=self.zeroconf, type_=list(self.services), handlers=self.handlers)
+        self._start_handlers()
+        await self._async_run_coroutine(self._async_browse())
+
+    async def _async_cancel(self) -> None:
+        """Cancel the service types caching and the browsers, in the zeroconf event loop.
+
+        The types found since the last write are cached, unless the types
+        found within `timeout` seconds were never cached.
+        """
+        timer, self._types_timer = self._types_timer, None
+        if timer:
+            timer.cancel()
+        browsers, self._browsers = self._browsers, None
+        if browsers:
+            await browsers.async_cancel()
+            if timer and self._types_cached:
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self.types_cache.update, set(browsers.found_types)
+                )
+
+    def _close_handlers(self) -> None:
+        """Dispatch the coalesced state changes, and wait for the handlers."""
+        if self._dispatcher:
+            self._dispatcher.close()
+            self._dispatcher = None
+
+    @traced()
+    def stop(self) -> None:
+        """Stop Beacon listener.
+
+        Cancel the service browsers, cache the service types found since the
+        last write, and dispatch the coalesced state changes.
+        """
+        if self._zeroconf and (self._browsers or self._types_timer):
+            self._run_coroutine(self._async_cancel())
+        self._close_handlers()
+        super().stop()
+
+    async def async_stop(self) -> None:
+        """Stop Beacon listener from a running event loop, see `stop`.
+
+        The handlers are waited for from a worker thread, without blocking
+        the event loop.
+        """
+        if self._zeroconf and (self._browsers or self._types_timer):
+            await self._async_run_coroutine(self._async_cancel())
+        await asyncio.get_running_loop().run_in_executor(None, self._close_handlers)
+        await super().async_stop()
@@ -0,0 +1,287 @@
+"""Runtime metrics module.
+
+Metrics are exported in the Prometheus text format from a local HTTP endpoint
+(see `Metrics.serve`), and recorded only once enabled: instrumented code
+checks `metrics.enabled` before measuring anything.
+"""
+
+import logging
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Sequence, Tuple, Union
+
+from zeroconf import ServiceStateChange, Zeroconf
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+Labels = Tuple[str, ...]
+
+
+def _format_value(value: Union[int, float]) -> str:
+    """Format a sample value."""
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Format the labels of a sample, escaping their values."""
+    if not names:
+        return ""
+    pairs = (
+        '{}="{}"'.format(
+            name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+        for name, value in zip(names, values, strict=True)
+    )
+    return "{" + ",".join(pairs) + "}"
+
+
+class _Metric:
+    """Metric family, with a value per set of label values."""
+
+    type_ = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _samples(self) -> Iterator[Tuple[str, Sequence[str], Sequence[str], float]]:
+        """Iterate over the samples as (suffix, label names, label values, value)."""
+        raise NotImplementedError  # pragma: no cover
+
+    def render(self) -> str:
+        """Render the metric family in the Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_}"]
+        with self._lock:
+            samples = list(self._samples())
+        for suffix, names, values, value in samples:
+            lines.append(
+                f"{self.name}{suffix}{_format_labels(names, values)} {_format_value(value)}"
+            )
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter.
+
+    Attributes:
+        name: Metric name.
+        documentation: Metric help text.
+        labelnames: Label names, their values are given in order.
+    """
+
+    type_ = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        """Init a counter without values.
+
+        Args:
+            name: Metric name.
+            documentation: Metric help text.
+            labelnames: Label names, their values are given in order.
+        """
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """Increment the counter of the label values."""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        """Get the counter of the label values."""
+        return self._values.get(labels, 0)
+
+    def _samples(self) -> Iterator[Tuple[str, Sequence[str], Sequence[str], float]]:
+        for labels, value in self._values.items():
+            yield "", self.labelnames, labels, value
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    type_ = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        """Decrement the gauge of the label values."""
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in buckets.
+
+    Attributes:
+        name: Metric name.
+        documentation: Metric help text.
+        labelnames: Label names, their values are given in order.
+        buckets: Upper bounds of the buckets (`+Inf` included).
+    """
+
+    type_ = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Init a histogram without observations.
+
+        Args:
+            name: Metric name.
+            documentation: Metric help text.
+            labelnames: Label names, their values are given in order.
+            buckets: Upper bounds of the buckets (`+Inf` is added).
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = (*sorted(float(bound) for bound in buckets), float("inf"))
+        # Per label values: count of each bucket (not cumulative), sum
+        self._values: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Observe a value for the label values."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(labels, ([0] * len(self.buckets), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def count(self, *labels: str) -> int:
+        """Get the number of observed values for the label values."""
+        counts, _ = self._values.get(labels, ([], [0.0]))
+        return sum(counts)
+
+    def _samples(self) -> Iterator[Tuple[str, Sequence[str], Sequence[str], float]]:
+        names = (*self.labelnames, "le")
+        for labels, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts, strict=True):
+                cumulative += count
+                yield "_bucket", names, (*labels, _format_value(bound)), cumulative
+            yield "_sum", self.labelnames, labels, total[0]
+            yield "_count", self.labelnames, labels, cumulative
+
+
+class _MetricsServer(ThreadingHTTPServer):
+    """HTTP server of the metrics endpoint."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], metrics: "Metrics") -> None:
+        super().__init__(address, _MetricsHandler)
+        self.metrics = metrics
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Metrics endpoint request handler."""
+
+    server: _MetricsServer
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Send the metrics."""
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.server.metrics.render().encode("utf8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        """Log the requests at debug level."""
+        logger.debug("Metrics request: %(request)s", {"request": format % args})
+
+
+class Metrics:
+    """Beacons and listeners runtime metrics.
+
+    Attributes:
+        enabled: Whether the metrics are recorded.
+        services_registered: Services currently registered.
+        registration_seconds: Latency of the registration (probe included),
+            update and unregistration of the services, by operation.
+        service_events: Service events received, by state change.
+        resolution_seconds: Latency of the service resolutions.
+        resolution_failures: Failed service resolutions, by reason.
+        handler_seconds: Execution time of the listener handlers.
+        render_seconds: Render time of the listen layout.
+    """
+
+    def __init__(self) -> None:
+        """Init the disabled metrics."""
+        self.enabled = False
+        self.services_registered = Gauge(
+            "mdns_beacon_services_registered", "Services currently registered."
+        )
+        self.registration_seconds = Histogram(
+            "mdns_beacon_registration_seconds",
+            "Latency of the service registrations, updates and unregistrations.",
+            ("operation",),
+        )
+        self.service_events = Counter(
+            "mdns_beacon_service_events_total", "Service events received.", ("state_change",)
+        )
+        self.resolution_seconds = Histogram(
+            "mdns_beacon_resolution_seconds", "Latency of the service resolutions."
+        )
+        self.resolution_failures = Counter(
+            "mdns_beacon_resolution_failures_total", "Failed service resolutions.", ("reason",)
+        )
+        self.handler_seconds = Histogram(
+            "mdns_beacon_handler_seconds", "Execution time of the listener handlers."
+        )
+        self.render_seconds = Histogram(
+            "mdns_beacon_render_seconds", "Render time of the listen layout."
+        )
+
+    @property
+    def families(self) -> List[_Metric]:
+        """Metric families."""
+        return [value for value in vars(self).values() if isinstance(value, _Metric)]
+
+    def render(self) -> str:
+        """Render all the metrics in the Prometheus text format."""
+        return "\n".join(family.render() for family in self.families) + "\n"
+
+    def on_service_state_change(
+        self, zeroconf: Zeroconf, service_type: str, name: str, state_change: ServiceStateChange
+    ) -> None:
+        """On service state change handler, counting the service events."""
+        self.service_events.inc(state_change.name)
+
+    def serve(self, port: int, address: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Enable the metrics and export them from an HTTP endpoint, in a daemon thread.
+
+        Args:
+            port: Port of the endpoint.
+            address: Address of the endpoint.
+
+        Returns:
+            The endpoint server, to be shut down by the caller.
+        """
+        server = _MetricsServer((address, port), self)
+        self.enabled = True
+        thread = threading.Thread(
+            target=server.serve_forever, name="mdns-beacon-metrics", daemon=True
+        )
+        thread.start()
+        logger.info(
+            "Serving metrics on http://%(address)s:%(port)s/metrics",
+            {"address": address, "port": server.server_address[1]},
+        )
+        return server
+
+
+metrics = Metrics()
@@ -0,0 +1,157 @@
+"""Shared zeroconf engines module."""
+
+import asyncio
+import logging
+import threading
+from typing import Dict, Hashable, Optional, Tuple
+
+from zeroconf import InterfaceChoice, InterfacesType, IPVersion, Zeroconf
+from zeroconf.asyncio import AsyncZeroconf
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[Optional[IPVersion], Hashable, Optional[asyncio.AbstractEventLoop]]
+
+
+class _Engine:
+    """Zeroconf instance with its number of users."""
+
+    __slots__ = ("key", "users", "zeroconf")
+
+    def __init__(self, key: PoolKey, zeroconf: Zeroconf) -> None:
+        self.key = key
+        self.zeroconf = zeroconf
+        self.users = 0
+
+
+class ZeroconfPool:
+    """Process-wide, reference counted, zeroconf instances.
+
+    Beacons and listeners with the same IP version and interfaces share one
+    zeroconf instance (sockets, reader thread and event loop), which is
+    closed when its last user releases it.
+
+    Note:
+        Instances acquired from a running event loop run on that loop, so
+        they are only shared with users of the same loop.
+    """
+
+    def __init__(self) -> None:
+        """Init an empty pool."""
+        self._lock = threading.Lock()
+        self._engines: Dict[PoolKey, _Engine] = {}
+        self._users: Dict[int, _Engine] = {}
+
+    def __len__(self) -> int:
+        """Number of open zeroconf instances."""
+        return len(self._engines)
+
+    def _build_key(self, ip_version: Optional[IPVersion], interfaces: InterfacesType) -> PoolKey:
+        """Build the key of a zeroconf instance.
+
+        Args:
+            ip_version: IP protocol version.
+            interfaces: Zeroconf interface choice or interface addresses list.
+
+        Returns:
+            Pool key.
+        """
+        try:
+            loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop and any(
+            engine.zeroconf.loop is loop for engine in self._engines.values() if not engine.key[2]
+        ):
+            # Running in the thread of a pool instance, same as from outside any loop
+            loop = None
+        if not isinstance(interfaces, InterfaceChoice):
+            interfaces = tuple(sorted({str(interface) for interface in interfaces}))
+        return ip_version, interfaces, loop
+
+    def acquire(
+        self,
+        ip_version: Optional[IPVersion] = None,
+        interfaces: InterfacesType = InterfaceChoice.All,
+    ) -> Zeroconf:
+        """Get a shared zeroconf instance, creating it if needed.
+
+        Args:
+            ip_version: IP protocol version.
+            interfaces: Zeroconf interface choice or interface addresses list.
+
+        Returns:
+            Zeroconf instance that must be given back with `release`.
+        """
+        with self._lock:
+            key = self._build_key(ip_version, interfaces)
+            engine = self._engines.get(key)
+            if not engine:
+                logger.debug("Starting zeroconf engine %(key)s", {"key": key[:2]})
+                engine = _Engine(key, Zeroconf(interfaces=interfaces, ip_version=ip_version))
+                self._engines[key] = engine
+                self._users[id(engine.zeroconf)] = engine
+            engine.users += 1
+            return engine.zeroconf
+
+    def share(self, zeroconf: Zeroconf) -> Zeroconf:
+        """Add a user to a zeroconf instance of the pool.
+
+        Args:
+            zeroconf: Zeroconf instance returned by `acquire`.
+
+        Returns:
+            The same zeroconf instance, that must be given back with `release`.
+
+        Raises:
+            ValueError: If the instance is not managed by the pool.
+        """
+        with self._lock:
+            engine = self._users.get(id(zeroconf))
+            if not engine or engine.zeroconf is not zeroconf:
+                raise ValueError("Zeroconf instance not managed by the pool")
+            engine.users += 1
+            return zeroconf
+
+    def _release(self, zeroconf: Zeroconf) -> bool:
+        """Drop a user of a zeroconf instance.
+
+        Args:
+            zeroconf: Zeroconf instance returned by `acquire`.
+
+        Returns:
+            Whether the instance has no more users and must be closed.
+        """
+        with self._lock:
+            engine = self._users.get(id(zeroconf))
+            if not engine or engine.zeroconf is not zeroconf:
+                # Not managed by the pool, the caller is its only user
+                return True
+            engine.users -= 1
+            if engine.users > 0:
+                return False
+            logger.debug("Stopping zeroconf engine %(key)s", {"key": engine.key[:2]})
+            del self._engines[engine.key]
+            del self._users[id(zeroconf)]
+            return True
+
+    def release(self, zeroconf: Zeroconf) -> None:
+        """Give back a zeroconf instance, closing it if it has no more users.
+
+        Args:
+            zeroconf: Zeroconf instance returned by `acquire`.
+        """
+        if self._release(zeroconf):
+            zeroconf.close()
+
+    async def async_release(self, zeroconf: Zeroconf) -> None:
+        """Give back a zeroconf instance from its running event loop.
+
+        Args:
+            zeroconf: Zeroconf instance returned by `acquire`.
+        """
+        if self._release(zeroconf):
+            await AsyncZeroconf(zc=zeroconf).async_close()
+
+
+zeroconf_pool = ZeroconfPool()
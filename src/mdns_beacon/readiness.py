@@ -0,0 +1,133 @@
+"""Network readiness module.
+
+Beacons may start before the network interfaces of the host are configured
+(e.g. on boot), so the services are announced once their addresses can be
+bound instead of after a fixed delay::
+
+    await readiness_gate.async_wait(addresses, timeout=delay_startup)
+
+The gate polls each address in a single task shared by all the waiters, so
+many beacons waiting for the same addresses share one wait.
+"""
+
+import asyncio
+import errno
+import logging
+import socket
+from ipaddress import IPv4Address, IPv6Address
+from typing import Dict, Iterable, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+Address = Union[IPv4Address, IPv6Address]
+
+
+def is_bindable(address: Address) -> bool:
+    """Check whether an address is configured on a local interface.
+
+    Addresses that can not be checked (e.g. IPv6 link-local addresses without
+    scope) are considered bindable.
+
+    Args:
+        address: IP address to check.
+
+    Returns:
+        `False` only if the address is not available on the host.
+    """
+    family = socket.AF_INET6 if address.version == 6 else socket.AF_INET
+    try:
+        with socket.socket(family, socket.SOCK_DGRAM) as sock:
+            sock.bind((str(address), 0))
+    except OSError as error:
+        if error.errno == errno.EADDRNOTAVAIL:
+            return False
+        logger.debug(
+            "Unable to check address %(address)s: %(error)s",
+            {"address": address, "error": error},
+        )
+    return True
+
+
+class ReadinessGate:
+    """Wait for addresses to become bindable, sharing the polling between waiters.
+
+    Attributes:
+        interval: Amount of time between checks of an address (in seconds).
+    """
+
+    def __init__(self, interval: float = 0.1) -> None:
+        """Init a readiness gate.
+
+        Args:
+            interval: Amount of time between checks of an address (in seconds).
+        """
+        self.interval = interval
+        self._probes: Dict[Tuple[asyncio.AbstractEventLoop, Address], "asyncio.Task[bool]"] = {}
+        self._deadlines: Dict[Tuple[asyncio.AbstractEventLoop, Address], float] = {}
+
+    async def _async_poll(self, key: Tuple[asyncio.AbstractEventLoop, Address]) -> bool:
+        """Poll an address until it is bindable or its deadline is reached.
+
+        Args:
+            key: Event loop and address to poll.
+
+        Returns:
+            Whether the address is bindable.
+        """
+        loop, address = key
+        try:
+            while not is_bindable(address):
+                if loop.time() >= self._deadlines[key]:
+                    return False
+                await asyncio.sleep(self.interval)
+            return True
+        finally:
+            del self._probes[key], self._deadlines[key]
+
+    def _probe(self, address: Address, deadline: float) -> "asyncio.Task[bool]":
+        """Get the polling task of an address, extending its deadline if needed.
+
+        Args:
+            address: IP address to poll.
+            deadline: Event loop time until which the address is polled.
+
+        Returns:
+            The polling task.
+        """
+        key = (asyncio.get_running_loop(), address)
+        self._deadlines[key] = max(deadline, self._deadlines.get(key, deadline))
+        if key not in self._probes:
+            self._probes[key] = asyncio.create_task(self._async_poll(key))
+        return self._probes[key]
+
+    async def async_wait(self, addresses: Iterable[Address], timeout: float) -> bool:
+        """Wait until all the addresses are bindable, at most `timeout` seconds.
+
+        Args:
+            addresses: IP addresses to wait for.
+            timeout: Maximum amount of time to wait (in seconds).
+
+        Returns:
+            Whether all the addresses are bindable.
+        """
+        pending: Set[Address] = {address for address in addresses if not is_bindable(address)}
+        if not pending:
+            return True
+        if timeout <= 0:
+            return False
+        logger.debug(
+            "Waiting up to %(timeout)ss for addresses: %(addresses)s",
+            {"timeout": timeout, "addresses": ", ".join(map(str, sorted(pending, key=str)))},
+        )
+        deadline = asyncio.get_running_loop().time() + timeout
+        probes = {self._probe(address, deadline) for address in pending}
+        done, not_done = await asyncio.wait(probes, timeout=timeout)
+        ready = not not_done and all(probe.result() for probe in done)
+        if not ready:
+            logger.warning(
+                "Addresses not ready after %(timeout)ss, starting anyway", {"timeout": timeout}
+            )
+        return ready
+
+
+readiness_gate = ReadinessGate()
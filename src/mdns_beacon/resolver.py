@@ -0,0 +1,146 @@
+"""Service resolver module."""
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from zeroconf import BadTypeInNameException, Zeroconf
+from zeroconf.asyncio import AsyncServiceInfo
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceResolver:
+    """Resolve services concurrently in the zeroconf event loop.
+
+    Resolutions are scheduled from any thread (e.g. the service browser
+    handlers) without waiting for the responses. A new resolution of a service
+    supersedes the pending one.
+
+    Attributes:
+        zeroconf: Zeroconf instance.
+        max_concurrency: Maximum number of services resolved at the same time.
+        timeout: Maximum amount of time to resolve a service, including the
+            time waiting for a free slot (in seconds).
+    """
+
+    def __init__(self, zeroconf: Zeroconf, max_concurrency: int = 32, timeout: float = 3) -> None:
+        """Init a service resolver.
+
+        Args:
+            zeroconf: Zeroconf instance.
+            max_concurrency: Maximum number of services resolved at the same time.
+            timeout: Maximum amount of time to resolve a service, including the
+                time waiting for a free slot (in seconds).
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be greater than 0")
+        self.zeroconf = zeroconf
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pending: Dict[
+            Tuple[str, str], "concurrent.futures.Future[Optional[AsyncServiceInfo]]"
+        ] = {}
+        self._lock = threading.Lock()
+
+    async def async_resolve(self, service_type: str, name: str) -> Optional[AsyncServiceInfo]:
+        """Resolve a service from the zeroconf event loop.
+
+        Args:
+            service_type: Fully qualified service type name.
+            name: Fully qualified service name.
+
+        Returns:
+            The service info, or `None` if the service was not resolved in time.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        start = time.perf_counter() if metrics.enabled else 0.0
+        if not self._semaphore:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            remaining = int((deadline - loop.time()) * 1000)
+            if remaining <= 0:
+                logger.debug("Resolution of %(name)s timed out", {"name": name})
+                self._record_failure("timeout")
+                return None
+            try:
+                info = AsyncServiceInfo(service_type, name)
+            except BadTypeInNameException as error:
+                logger.debug(
+                    "Unable to resolve %(name)s: %(error)s", {"name": name, "error": error}
+                )
+                self._record_failure("bad_name")
+                return None
+            if await info.async_request(self.zeroconf, remaining):
+                if metrics.enabled:
+                    metrics.resolution_seconds.observe(time.perf_counter() - start)
+                return info
+        logger.debug("Unable to resolve %(name)s", {"name": name})
+        self._record_failure("no_response")
+        return None
+
+    @staticmethod
+    def _record_failure(reason: str) -> None:
+        """Count a failed resolution, if the metrics are enabled."""
+        if metrics.enabled:
+            metrics.resolution_failures.inc(reason)
+
+    def resolve(
+        self, service_type: str, name: str
+    ) -> "concurrent.futures.Future[Optional[AsyncServiceInfo]]":
+        """Schedule the resolution of a service, without waiting for it.
+
+        Args:
+            service_type: Fully qualified service type name.
+            name: Fully qualified service name.
+
+        Returns:
+            Future of the service info (`None` if not resolved in time).
+        """
+        key = (service_type, name)
+        loop = self.zeroconf.loop
+        if loop is None:  # pragma: no cover
+            raise RuntimeError("Zeroconf event loop is not running")
+        future = asyncio.run_coroutine_threadsafe(self.async_resolve(service_type, name), loop)
+        with self._lock:
+            previous = self._pending.get(key)
+            self._pending[key] = future
+        if previous:
+            previous.cancel()
+        future.add_done_callback(lambda done: self._discard(key, done))
+        return future
+
+    def _discard(
+        self, key: Tuple[str, str], future: "concurrent.futures.Future[Optional[AsyncServiceInfo]]"
+    ) -> None:
+        """Forget a finished resolution, unless it was superseded."""
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+    def cancel(self, service_type: str, name: str) -> None:
+        """Cancel the pending resolution of a service.
+
+        Args:
+            service_type: Fully qualified service type name.
+            name: Fully qualified service name.
+        """
+        with self._lock:
+            future = self._pending.pop((service_type, name), None)
+        if future:
+            future.cancel()
+
+    def cancel_all(self) -> None:
+        """Cancel all the pending resolutions."""
+        with self._lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for future in pending:
+            future.cancel()
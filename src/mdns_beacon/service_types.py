@@ -0,0 +1,105 @@
+"""Discovered service types cache module."""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Optional, Set, Union
+
+logger = logging.getLogger(__name__)
+
+SERVICE_TYPE_ENUMERATION = "_services._dns-sd._udp.local."
+
+
+class ServiceTypesCache:
+    """Thread safe cache of the service types discovered on the local networks.
+
+    The types are kept in memory and, optionally, persisted to a JSON file to
+    be reused between runs. Types older than `ttl` are not returned.
+
+    Attributes:
+        ttl: Amount of time the discovered types are valid (in seconds).
+        path: JSON file persisting the discovered types (memory only if `None`).
+    """
+
+    def __init__(self, ttl: float = 3600, path: Optional[Union[str, Path]] = None) -> None:
+        """Init an empty service types cache.
+
+        Args:
+            ttl: Amount of time the discovered types are valid (in seconds).
+            path: JSON file persisting the discovered types (memory only if `None`).
+        """
+        self.ttl = ttl
+        self.path = Path(path) if path else None
+        self._types: Optional[Set[str]] = None
+        self._updated = 0.0
+        self._lock = threading.Lock()
+
+    def _load(self) -> None:
+        """Load the persisted types, if any."""
+        if not self.path:
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf8"))
+            types, updated = set(data["types"]), float(data["updated"])
+        except (OSError, ValueError, TypeError, KeyError) as error:
+            logger.debug(
+                "Service types not loaded from %(path)s: %(error)s",
+                {"path": self.path, "error": error},
+            )
+            return
+        if updated > self._updated:
+            self._types, self._updated = types, updated
+
+    def _save(self) -> None:
+        """Persist the types, replacing the file atomically."""
+        if not self.path or self._types is None:
+            return
+        data = {"updated": self._updated, "types": sorted(self._types)}
+        partial = self.path.with_name(f".{self.path.name}.{os.getpid()}")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            partial.write_text(json.dumps(data), encoding="utf8")
+            os.replace(partial, self.path)
+        except OSError as error:
+            logger.warning(
+                "Service types not saved to %(path)s: %(error)s",
+                {"path": self.path, "error": error},
+            )
+
+    def _is_fresh(self) -> bool:
+        """Whether the cached types are within their TTL."""
+        return self._types is not None and time.time() - self._updated < self.ttl
+
+    def get(self) -> Optional[Set[str]]:
+        """Get the cached service types.
+
+        Returns:
+            The discovered service types, `None` if missing or expired.
+        """
+        with self._lock:
+            if not self._is_fresh():
+                self._load()
+            return set(self._types) if self._is_fresh() and self._types is not None else None
+
+    def update(self, types: Iterable[str]) -> None:
+        """Replace the cached service types.
+
+        Args:
+            types: Discovered service types.
+        """
+        with self._lock:
+            self._types = set(types)
+            self._updated = time.time()
+            self._save()
+
+    def clear(self) -> None:
+        """Forget the cached service types (the persisted ones are kept)."""
+        with self._lock:
+            self._types = None
+            self._updated = 0.0
+
+
+service_types_cache = ServiceTypesCache()
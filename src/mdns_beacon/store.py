@@ -0,0 +1,329 @@
+"""Service store module."""
+
+import sys
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Type
+
+from zeroconf import IPVersion, ServiceInfo
+
+ServiceKey = Tuple[str, str]
+
+
+class ServiceRecord:
+    """Discovered service.
+
+    The TXT record is kept encoded and decoded on first access.
+
+    Attributes:
+        type: Fully qualified service type name.
+        name: Fully qualified service name.
+        ipv4_addresses: IPv4 addresses of the service.
+        ipv6_addresses: IPv6 addresses of the service.
+        port: Port of the service.
+        server: Host name of the service.
+        ttl: TTL of the host records.
+        weight: Weight of the service.
+        priority: Priority of the service.
+        raw_text: Content of the TXT record.
+    """
+
+    __slots__ = (
+        "type",
+        "name",
+        "ipv4_addresses",
+        "ipv6_addresses",
+        "port",
+        "server",
+        "ttl",
+        "weight",
+        "priority",
+        "raw_text",
+        "_text",
+        "_properties",
+    )
+
+    def __init__(
+        self,
+        type_: str,
+        name: str,
+        ipv4_addresses: Tuple[str, ...] = (),
+        ipv6_addresses: Tuple[str, ...] = (),
+        port: Optional[int] = None,
+        server: Optional[str] = None,
+        ttl: Optional[int] = None,
+        weight: int = 0,
+        priority: int = 0,
+        raw_text: bytes = b"",
+    ) -> None:
+        """Init a service record.
+
+        Args:
+            type_: Fully qualified service type name.
+            name: Fully qualified service name.
+            ipv4_addresses: IPv4 addresses of the service.
+            ipv6_addresses: IPv6 addresses of the service.
+            port: Port of the service.
+            server: Host name of the service.
+            ttl: TTL of the host records.
+            weight: Weight of the service.
+            priority: Priority of the service.
+            raw_text: Content of the TXT record.
+        """
+        self.type = sys.intern(type_)
+        self.name = name
+        self.ipv4_addresses = ipv4_addresses
+        self.ipv6_addresses = ipv6_addresses
+        self.port = port
+        self.server = sys.intern(server) if server else server
+        self.ttl = ttl
+        self.weight = weight
+        self.priority = priority
+        self.raw_text = raw_text
+        self._text: Optional[str] = None
+        self._properties: Optional[Dict[str, Optional[str]]] = None
+
+    @classmethod
+    def from_info(cls: Type["ServiceRecord"], info: ServiceInfo) -> "ServiceRecord":
+        """Build a service record from a resolved service info.
+
+        Args:
+            info: Service info.
+
+        Returns:
+            The service record.
+        """
+        return cls(
+            type_=info.type,
+            name=info.name,
+            ipv4_addresses=tuple(info.parsed_addresses(IPVersion.V4Only)),
+            ipv6_addresses=tuple(info.parsed_addresses(IPVersion.V6Only)),
+            port=info.port,
+            server=info.server,
+            ttl=info.host_ttl,
+            weight=info.weight,
+            priority=info.priority,
+            raw_text=info.text or b"",
+        )
+
+    @property
+    def key(self) -> ServiceKey:
+        """Service type and name."""
+        return (self.type, self.name)
+
+    @property
+    def addresses(self) -> Tuple[str, ...]:
+        """IPv4 and IPv6 addresses of the service."""
+        return self.ipv4_addresses + self.ipv6_addresses
+
+    @property
+    def ipv4_address(self) -> str:
+        """Comma separated IPv4 addresses."""
+        return ",".join(self.ipv4_addresses)
+
+    @property
+    def ipv6_address(self) -> str:
+        """Comma separated IPv6 addresses."""
+        return ",".join(self.ipv6_addresses)
+
+    @property
+    def text(self) -> str:
+        """Decoded content of the TXT record."""
+        if self._text is None:
+            self._text = self.raw_text.decode("utf8", errors="replace")
+        return self._text
+
+    @property
+    def properties(self) -> Dict[str, Optional[str]]:
+        """Decoded properties of the TXT record."""
+        if self._properties is None:
+            info = ServiceInfo(self.type, self.name)
+            info.text = self.raw_text
+            self._properties = {
+                key.decode("utf8", errors="replace"): (
+                    value.decode("utf8", errors="replace") if value is not None else None
+                )
+                for key, value in info.properties.items()
+            }
+        return self._properties
+
+    def _fields(self) -> Tuple[Any, ...]:
+        """Announced content of the service."""
+        return (
+            self.type,
+            self.name,
+            self.ipv4_addresses,
+            self.ipv6_addresses,
+            self.port,
+            self.server,
+            self.ttl,
+            self.weight,
+            self.priority,
+            self.raw_text,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the announced content of two services."""
+        if not isinstance(other, ServiceRecord):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __getitem__(self, column: str) -> Any:  # noqa: ANN401
+        """Get a column of the service (an attribute)."""
+        try:
+            return getattr(self, column)
+        except AttributeError:
+            raise KeyError(column) from None
+
+    def __repr__(self) -> str:
+        """Service record representation."""
+        return f"ServiceRecord(type_={self.type!r}, name={self.name!r})"
+
+
+class ServiceStore:
+    """Thread safe store of discovered services, indexed by type, server and address.
+
+    Attributes:
+        sequence: Change counter, increased by each effective upsert or removal.
+    """
+
+    def __init__(self) -> None:
+        """Init an empty service store."""
+        self.sequence = 0
+        self._records: Dict[ServiceKey, ServiceRecord] = {}
+        self._by_type: Dict[str, Set[ServiceKey]] = {}
+        self._by_server: Dict[str, Set[ServiceKey]] = {}
+        self._by_address: Dict[str, Set[ServiceKey]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        """Number of services."""
+        return len(self._records)
+
+    def __contains__(self, key: object) -> bool:
+        """Check whether a service (type and name) is stored."""
+        return key in self._records
+
+    def __iter__(self) -> Iterator[ServiceRecord]:
+        """Iterate over a snapshot of the services, in arrival order."""
+        with self._lock:
+            return iter(list(self._records.values()))
+
+    def get(self, key: ServiceKey) -> Optional[ServiceRecord]:
+        """Get a service.
+
+        Args:
+            key: Service type and name.
+
+        Returns:
+            The service record, if stored.
+        """
+        return self._records.get(key)
+
+    def _index(self, record: ServiceRecord) -> None:
+        """Add a record to the secondary indexes."""
+        key = record.key
+        self._by_type.setdefault(record.type, set()).add(key)
+        if record.server:
+            self._by_server.setdefault(record.server, set()).add(key)
+        for address in record.addresses:
+            self._by_address.setdefault(address, set()).add(key)
+
+    def _unindex(self, record: ServiceRecord) -> None:
+        """Remove a record from the secondary indexes."""
+        key = record.key
+        indexes = [(self._by_type, record.type)]
+        if record.server:
+            indexes.append((self._by_server, record.server))
+        indexes.extend((self._by_address, address) for address in record.addresses)
+        for index, value in indexes:
+            keys = index.get(value)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[value]
+
+    def upsert(self, record: ServiceRecord) -> bool:
+        """Add or replace a service.
+
+        Args:
+            record: Service record.
+
+        Returns:
+            Whether the store changed.
+        """
+        with self._lock:
+            previous = self._records.get(record.key)
+            if previous == record:
+                return False
+            if previous:
+                self._unindex(previous)
+            self._records[record.key] = record
+            self._index(record)
+            self.sequence += 1
+            return True
+
+    def remove(self, key: ServiceKey) -> Optional[ServiceRecord]:
+        """Remove a service.
+
+        Args:
+            key: Service type and name.
+
+        Returns:
+            The removed service record, if it was stored.
+        """
+        with self._lock:
+            record = self._records.pop(key, None)
+            if record:
+                self._unindex(record)
+                self.sequence += 1
+            return record
+
+    def clear(self) -> None:
+        """Remove all the services."""
+        with self._lock:
+            if self._records:
+                self.sequence += 1
+            self._records.clear()
+            self._by_type.clear()
+            self._by_server.clear()
+            self._by_address.clear()
+
+    def _lookup(self, index: Dict[str, Set[ServiceKey]], value: str) -> List[ServiceRecord]:
+        """Get the services of an index value."""
+        with self._lock:
+            return [self._records[key] for key in index.get(value, ())]
+
+    def by_type(self, type_: str) -> List[ServiceRecord]:
+        """Get the services of a type.
+
+        Args:
+            type_: Fully qualified service type name.
+
+        Returns:
+            Service records.
+        """
+        return self._lookup(self._by_type, type_)
+
+    def by_server(self, server: str) -> List[ServiceRecord]:
+        """Get the services of a host.
+
+        Args:
+            server: Host name.
+
+        Returns:
+            Service records.
+        """
+        return self._lookup(self._by_server, server)
+
+    def by_address(self, address: str) -> List[ServiceRecord]:
+        """Get the services of an IP address.
+
+        Args:
+            address: IPv4 or IPv6 address.
+
+        Returns:
+            Service records.
+        """
+        return self._lookup(self._by_address, address)
@@ -0,0 +1,140 @@
+"""Span tracing module.
+
+Spans record the wall time of the hot callbacks (e.g. `update_services`,
+`_execute` and `stop`) while the tracer is enabled, and are dumped in the
+Chrome trace event format (viewable in `chrome://tracing` or Perfetto).
+"""
+
+import contextlib
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, TypeVar, Union, cast
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Tracer:
+    """Recorder of spans in the Chrome trace event format.
+
+    Only the latest `max_spans` spans are kept, so tracing a long running
+    command does not grow without bounds.
+
+    Attributes:
+        enabled: Whether the spans are recorded.
+        max_spans: Maximum number of recorded spans.
+    """
+
+    def __init__(self, max_spans: int = 100_000) -> None:
+        """Init a disabled tracer.
+
+        Args:
+            max_spans: Maximum number of recorded spans.
+        """
+        self.enabled = False
+        self.max_spans = max_spans
+        self._spans: Deque[Dict[str, Any]] = deque(maxlen=max_spans)
+        self._origin = time.perf_counter_ns()
+
+    def start(self) -> None:
+        """Drop the recorded spans and start recording."""
+        self._spans.clear()
+        self._origin = time.perf_counter_ns()
+        self.enabled = True
+
+    def stop(self) -> None:
+        """Stop recording, the recorded spans are kept."""
+        self.enabled = False
+
+    def __len__(self) -> int:
+        """Number of recorded spans."""
+        return len(self._spans)
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str = "mdns_beacon") -> Iterator[None]:
+        """Record the wall time of a block, as a complete event.
+
+        Args:
+            name: Span name.
+            category: Span category.
+        """
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            self._spans.append(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": (start - self._origin) / 1000,
+                    "dur": (end - start) / 1000,
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                }
+            )
+
+    def trace(self) -> Dict[str, Any]:
+        """Get the recorded spans as a Chrome trace.
+
+        Returns:
+            Chrome trace (JSON object format).
+        """
+        events = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": os.getpid(),
+                "tid": thread.ident,
+                "args": {"name": thread.name},
+            }
+            for thread in threading.enumerate()
+        ]
+        return {"traceEvents": [*events, *list(self._spans)], "displayTimeUnit": "ms"}
+
+    def dump(self, path: Union[str, Path]) -> None:
+        """Write the recorded spans to a Chrome trace JSON file.
+
+        Args:
+            path: Trace file path.
+        """
+        Path(path).write_text(json.dumps(self.trace()), encoding="utf8")
+        logger.info(
+            "Trace of %(spans)s spans written to %(path)s", {"spans": len(self), "path": path}
+        )
+
+
+tracer = Tracer()
+
+
+def traced(name: Optional[str] = None) -> Callable[[F], F]:
+    """Decorate a function to record a span per call while the tracer is enabled.
+
+    Args:
+        name: Span name, the function qualified name by default.
+
+    Returns:
+        Function decorator.
+    """
+
+    def decorator(func: F) -> F:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.span(span_name):
+                return func(*args, **kwargs)
+
+        return cast(F, wrapper)
+
+    return decorator
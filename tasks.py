@@ -21,9 +21,11 @@ COVERAGE_DIR = ROOT_DIR.joinpath("htmlcov")
 COVERAGE_REPORT = COVERAGE_DIR.joinpath("index.html")
 SOURCE_DIR = ROOT_DIR.joinpath("src/mdns_beacon")
 TEST_DIR = ROOT_DIR.joinpath("tests")
+BENCHMARKS_DIR = ROOT_DIR.joinpath("benchmarks")
 PYTHON_TARGETS = [
     SOURCE_DIR,
     TEST_DIR,
+    BENCHMARKS_DIR,
     DOCS_DIR.joinpath("conf.py"),
     ROOT_DIR.joinpath("noxfile.py"),
     Path(__file__),
@@ -128,6 +130,23 @@ def tests(c: Context) -> None:
     _run(c, f"poetry run pytest {' '.join(pytest_options)} {TEST_DIR} {SOURCE_DIR}")
 
 
+@task(
+    help={
+        "aliases": "Number of aliases of each run, comma separated (default: 10,100).",
+        "output": "JSON results file (default: stdout).",
+    }
+)
+def bench(c: Context, aliases: str = "10,100", output: Optional[str] = None) -> None:
+    """Run the benchmark suite."""
+    bench_options = ["--aliases", *aliases.split(",")]
+    if output:
+        bench_options.extend(["--output", output])
+    _run(
+        c,
+        f"poetry run python {BENCHMARKS_DIR.joinpath('bench_suite.py')} {' '.join(bench_options)}",
+    )
+
+
 @task(
     help={
         "fmt": "Build a local report: report, html, json, annotate, html, xml.",
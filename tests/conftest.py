@@ -1,21 +1,41 @@
 """Conftest module."""
 
-import asyncio
-from asyncio import AbstractEventLoop
-from typing import Generator
+from typing import List
+from unittest.mock import MagicMock
 
+import ifaddr
 import pytest
 from pytest_mock import MockerFixture
+from zeroconf._services.registry import ServiceRegistry
+
+from mdns_beacon.beacon import Beacon
+
+
+@pytest.fixture
+def beacon_zeroconf(mocker: MockerFixture) -> MagicMock:
+    """Mocked beacons zeroconf instance with a real service registry."""
+    zeroconf: MagicMock = mocker.MagicMock()
+    zeroconf.async_wait_for_start = mocker.AsyncMock()
+    zeroconf.async_check_service = mocker.AsyncMock()
+    zeroconf.registry = ServiceRegistry()
+    mocker.patch.object(
+        Beacon, "zeroconf", new_callable=mocker.PropertyMock, return_value=zeroconf
+    )
+    return zeroconf
 
 
 @pytest.fixture
-def safe_loop(
-    event_loop: AbstractEventLoop, mocker: MockerFixture
-) -> Generator[AbstractEventLoop, None, None]:
-    """Safe event loop fixture."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    asyncio.set_event_loop(loop)
-    _close = loop.close
-    loop.close = mocker.Mock()  # type: ignore
-    yield loop
-    _close()
+def adapters(mocker: MockerFixture) -> List[ifaddr.Adapter]:
+    """Mocked network interfaces."""
+    adapters = [
+        ifaddr.Adapter("lo", "lo", [ifaddr.IP("127.0.0.1", 8, "lo")], index=1),
+        ifaddr.Adapter(
+            "eth0",
+            "eth0",
+            [ifaddr.IP("192.168.1.10", 24, "eth0"), ifaddr.IP(("fe80::1", 0, 2), 64, "eth0")],
+            index=2,
+        ),
+        ifaddr.Adapter("eth1", "eth1", [ifaddr.IP("10.0.0.5", 8, "eth1")], index=3),
+    ]
+    mocker.patch("mdns_beacon.interfaces.ifaddr.get_adapters", return_value=adapters)
+    return adapters
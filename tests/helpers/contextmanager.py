@@ -5,16 +5,23 @@ import os
 import signal
 import threading
 import time
-from typing import Generator
+from typing import Callable, Generator, Optional
 
 
 @contextlib.contextmanager
-def raise_keyboard_interrupt(*, timeout: float) -> Generator[None, None, None]:
-    """Start a thread that raise a KeyboardInterrupt in `timeout`."""
+def raise_keyboard_interrupt(
+    *, timeout: float, before: Optional[Callable[[], None]] = None, signum: int = signal.SIGINT
+) -> Generator[None, None, None]:
+    """Start a thread that raise a KeyboardInterrupt in `timeout`.
+
+    Calls `before` right before sending the `signum` signal.
+    """
 
     def _send_signal() -> None:
         time.sleep(timeout)
-        os.kill(os.getpid(), signal.SIGINT)
+        if before:
+            before()
+        os.kill(os.getpid(), signum)
 
     thread = threading.Thread(target=_send_signal, daemon=True)
     thread.start()
@@ -0,0 +1,152 @@
+"""Tests for `announcer` module."""
+
+import asyncio
+from typing import List
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+from zeroconf import DNSIncoming, DNSPointer, NonUniqueNameException, ServiceInfo
+from zeroconf._services.registry import ServiceRegistry
+
+from mdns_beacon.announcer import _BROADCASTS, Announcer, async_bulk_unregister
+
+
+def build_infos(count: int, server: str = "") -> List[ServiceInfo]:
+    """Build `count` services."""
+    return [
+        ServiceInfo(
+            type_="_http._tcp.local.",
+            name=f"example-{i}._http._tcp.local.",
+            parsed_addresses=["127.0.0.1"],
+            port=80,
+            server=server or f"example-{i}.local.",
+        )
+        for i in range(count)
+    ]
+
+
+def mock_zeroconf(mocker: MockerFixture) -> MagicMock:
+    """Mock a zeroconf instance with a real registry."""
+    zeroconf: MagicMock = mocker.MagicMock()
+    zeroconf.async_wait_for_start = mocker.AsyncMock()
+    zeroconf.async_check_service = mocker.AsyncMock()
+    zeroconf.registry = ServiceRegistry()
+    return zeroconf
+
+
+@pytest.mark.parametrize("count", [1, 10, 500])
+async def test_bulk_unregister(mocker: MockerFixture, count: int) -> None:
+    """Test goodbyes for many services are packed in a single burst."""
+    infos = build_infos(count)
+    zeroconf = mock_zeroconf(mocker)
+    for info in infos:
+        zeroconf.registry.async_add(info)
+
+    await async_bulk_unregister(zeroconf, infos)
+
+    assert not zeroconf.registry.async_get_service_infos()
+    assert zeroconf.async_send.call_count == _BROADCASTS
+
+    out = zeroconf.async_send.call_args.args[0]
+    packets = out.packets()
+    answers = [answer for packet in packets for answer in DNSIncoming(packet).answers()]
+    assert len(packets) < count or count == 1
+    assert all(answer.ttl == 0 for answer in answers)
+    assert {info.name for info in infos} == {
+        answer.alias for answer in answers if isinstance(answer, DNSPointer)
+    }
+
+
+async def test_bulk_unregister_not_registered(mocker: MockerFixture) -> None:
+    """Test unregistered services are skipped."""
+    zeroconf = mock_zeroconf(mocker)
+
+    await async_bulk_unregister(zeroconf, build_infos(3))
+
+    zeroconf.async_send.assert_not_called()
+
+
+async def test_bulk_unregister_shared_server(mocker: MockerFixture) -> None:
+    """Test address records are kept alive while the server is still in use."""
+    infos = build_infos(2, server="shared.local.")
+    zeroconf = mock_zeroconf(mocker)
+    for info in infos:
+        zeroconf.registry.async_add(info)
+
+    await async_bulk_unregister(zeroconf, infos[:1])
+
+    out = zeroconf.async_send.call_args.args[0]
+    answers = [answer for packet in out.packets() for answer in DNSIncoming(packet).answers()]
+    assert not [answer for answer in answers if answer.name == "shared.local."]
+    assert zeroconf.registry.async_get_service_infos() == infos[1:]
+
+
+@pytest.mark.parametrize("count", [1, 10, 500])
+async def test_announcer_register(mocker: MockerFixture, count: int) -> None:
+    """Test the records of many services are announced in a single burst."""
+    infos = build_infos(count)
+    zeroconf = mock_zeroconf(mocker)
+    announcer = Announcer(zeroconf)
+
+    await announcer.async_register(infos)
+
+    assert zeroconf.async_check_service.await_count == count
+    assert announcer.infos == infos
+    assert zeroconf.registry.async_get_service_infos() == infos
+    assert zeroconf.async_send.call_count == _BROADCASTS
+
+    out = zeroconf.async_send.call_args.args[0]
+    packets = out.packets()
+    answers = [answer for packet in packets for answer in DNSIncoming(packet).answers()]
+    assert len(packets) < count or count == 1
+    assert {info.name for info in infos} == {
+        answer.alias for answer in answers if isinstance(answer, DNSPointer)
+    }
+
+    await announcer.async_unregister(infos)
+
+    assert not announcer.infos
+    assert not zeroconf.registry.async_get_service_infos()
+
+
+async def test_announcer_register_rollback(mocker: MockerFixture) -> None:
+    """Test the services already added are removed if another one fails to register."""
+    infos = build_infos(5)
+    zeroconf = mock_zeroconf(mocker)
+
+    async def _check_service(info: ServiceInfo, allow_name_change: bool) -> None:
+        if info is infos[2]:
+            raise NonUniqueNameException
+
+    zeroconf.async_check_service.side_effect = _check_service
+    announcer = Announcer(zeroconf, max_concurrency=2, reannounce_interval=60)
+
+    with pytest.raises(NonUniqueNameException):
+        await announcer.async_register(infos)
+
+    assert zeroconf.async_check_service.await_count == len(infos)
+    assert not announcer.infos
+    assert not zeroconf.registry.async_get_service_infos()
+    assert not announcer._reannounce_task
+    zeroconf.async_send.assert_not_called()
+
+
+async def test_announcer_reannounce(mocker: MockerFixture) -> None:
+    """Test services are re-announced periodically until unregistered."""
+    infos = build_infos(3)
+    zeroconf = mock_zeroconf(mocker)
+    announcer = Announcer(zeroconf, reannounce_interval=0.05)
+    mocker.patch("mdns_beacon.announcer._REGISTER_TIME", 0)
+
+    await announcer.async_register(infos)
+    zeroconf.async_send.reset_mock()
+    await asyncio.sleep(0.12)
+
+    assert zeroconf.async_send.call_count == 2
+
+    await announcer.async_unregister(infos[:1])
+    assert announcer._reannounce_task
+
+    await announcer.async_unregister(infos[1:])
+    assert not announcer._reannounce_task
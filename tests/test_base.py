@@ -1,6 +1,7 @@
 """Tests for `base` module."""
 
-from asyncio import AbstractEventLoop
+import asyncio
+import signal
 from typing import Optional
 
 import pytest
@@ -26,17 +27,70 @@ class DummyBeacon(BaseBeacon):
         IPVersion.V6Only,
     ],
 )
-def test_run_forever(safe_loop: AbstractEventLoop, ip_version: Optional[IPVersion]) -> None:
-    """Test run forever."""
+def test_run_forever(ip_version: Optional[IPVersion]) -> None:
+    """Test run forever shares its event loop with zeroconf, until interrupted."""
     beacon = DummyBeacon(ip_version=ip_version)
+    loops = []
 
-    with raise_keyboard_interrupt(timeout=0.5):
+    with (
+        raise_keyboard_interrupt(timeout=0.5, before=lambda: loops.append(beacon.zeroconf.loop)),
+        pytest.raises(KeyboardInterrupt),
+    ):
         beacon.run_forever()
+
+    assert loops[0] and loops[0].is_closed()
+    assert not beacon._zeroconf
     beacon.stop()
 
+
+def test_run_forever_terminate() -> None:
+    """Test run forever stops on SIGTERM."""
+    beacon = DummyBeacon()
+
+    with raise_keyboard_interrupt(timeout=0.5, signum=signal.SIGTERM):
+        beacon.run_forever()
+
+    assert not beacon._zeroconf
+    assert signal.getsignal(signal.SIGTERM) is signal.SIG_DFL
+
+
+async def test_serve() -> None:
+    """Test serve runs in the caller event loop, until stopped."""
+    beacon = DummyBeacon()
+    stop = asyncio.Event()
+    serving = asyncio.ensure_future(beacon.serve(stop))
+    await asyncio.sleep(0.1)
+
+    assert beacon.zeroconf.loop is asyncio.get_running_loop()
+    stop.set()
+    await asyncio.wait_for(serving, 5)
     assert not beacon._zeroconf
 
-    # asserting the loop is stopped but not closed
-    assert not safe_loop.is_running()
-    assert not safe_loop.is_closed()
-    safe_loop.close.assert_called_once_with()  # type: ignore
+    serving = asyncio.ensure_future(beacon.serve())
+    await asyncio.sleep(0.1)
+    serving.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await serving
+    assert not beacon._zeroconf
+
+
+async def test_context_manager() -> None:
+    """Test the beacon is started and stopped as an async context manager."""
+    async with DummyBeacon() as beacon:
+        zeroconf = beacon.zeroconf
+        assert zeroconf.loop is asyncio.get_running_loop()
+
+    assert zeroconf.done
+    assert not beacon._zeroconf
+
+
+async def test_context_manager_thread_zeroconf() -> None:
+    """Test a beacon using zeroconf from its own thread is stopped from it."""
+    beacon = DummyBeacon()
+    zeroconf = await asyncio.get_running_loop().run_in_executor(None, lambda: beacon.zeroconf)
+
+    async with beacon:
+        assert zeroconf.loop is not asyncio.get_running_loop()
+
+    assert zeroconf.done
+    assert not beacon._zeroconf
@@ -1,13 +1,17 @@
 """Tests for `beacon` module."""
 
-from asyncio import AbstractEventLoop
-from typing import Any, Dict, Set
+import asyncio
+from ipaddress import ip_address
+from typing import Any, Dict, List, Set, Union
+from unittest.mock import MagicMock
 from uuid import uuid4
 
+import ifaddr
 import pytest
-from zeroconf import IPVersion
+from pytest_mock import MockerFixture
+from zeroconf import IPVersion, ServiceInfo
 
-from mdns_beacon.beacon import Beacon
+from mdns_beacon.beacon import Beacon, _build_host
 
 from .helpers.contextmanager import raise_keyboard_interrupt
 
@@ -41,7 +45,6 @@ from .helpers.contextmanager import raise_keyboard_interrupt
     ],
 )
 def test_beacon(
-    safe_loop: AbstractEventLoop,
     beacon_params: Dict[str, Any],
     expected_services: Set[str],
 ) -> None:
@@ -61,9 +64,175 @@ def test_beacon(
 
     assert expected_services == {s.server for s in beacon.services}
 
+    assert not beacon._announcer
+    assert not beacon._zeroconf
+
     beacon.stop()
 
-    # asserting the loop is stopped but not closed
-    assert not safe_loop.is_running()
-    assert not safe_loop.is_closed()
-    safe_loop.close.assert_called_once_with()  # type: ignore
+
+@pytest.mark.parametrize("max_concurrency", [1, 4, 32])
+async def test_beacon_max_concurrency(beacon_zeroconf: MagicMock, max_concurrency: int) -> None:
+    """Test beacon probes services up to `max_concurrency` at a time."""
+    in_flight = 0
+    peak = 0
+
+    async def _check_service(*args: object, **kwargs: object) -> None:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    beacon_zeroconf.async_check_service = _check_service
+
+    beacon = Beacon(aliases=[f"example-{i}" for i in range(10)], max_concurrency=max_concurrency)
+    await beacon.async_register_services()
+
+    assert peak == min(max_concurrency, 10)
+    assert len(beacon_zeroconf.registry.async_get_service_infos()) == 10
+
+
+def test_beacon_positional_ip_version() -> None:
+    """Test the `ip_version` is still the first positional argument after `delay_startup`."""
+    beacon = Beacon(None, None, 80, "http", "tcp", 60, 0, 0, None, 0, IPVersion.V4Only)
+
+    assert beacon.ip_version == IPVersion.V4Only
+    assert beacon.max_concurrency == 32
+    assert beacon.reannounce_interval == 0
+
+
+def test_beacon_invalid_max_concurrency() -> None:
+    """Test beacon rejects a non positive `max_concurrency`."""
+    with pytest.raises(ValueError):
+        Beacon(max_concurrency=0)
+
+
+@pytest.mark.slow
+async def test_beacon_async() -> None:
+    """Test beacon running in the caller event loop."""
+    uuid = uuid4()
+    aliases = [f"example-{uuid}", f"sub{{}}.example-{uuid}"]
+    aliases = [aliases[0], *[aliases[1].format(i) for i in range(5)]]
+
+    beacon = Beacon(aliases=aliases)
+    await beacon.async_start()
+
+    assert beacon.zeroconf.loop is asyncio.get_running_loop()
+    assert {f"{a}.local." for a in aliases} == {
+        s.server for s in beacon.zeroconf.registry.async_get_service_infos()
+    }
+
+    await beacon.async_stop()
+
+    assert not beacon._zeroconf
+
+
+@pytest.mark.parametrize(
+    "changes,probed,updated",
+    [
+        ({}, set(), set()),
+        ({"aliases": ["example", "sub2.example"]}, {"sub2.example"}, set()),
+        ({"port": 8080}, set(), {"example", "sub1.example"}),
+        ({"aliases": ["example"], "properties": {"path": "/"}}, set(), {"example"}),
+        ({"addresses": [ip_address("127.0.0.2")]}, set(), {"example", "sub1.example"}),
+    ],
+)
+async def test_beacon_reload(
+    beacon_zeroconf: MagicMock, changes: Dict[str, Any], probed: Set[str], updated: Set[str]
+) -> None:
+    """Test beacon reload only re-registers the changed services."""
+    beacon = Beacon(aliases=["example", "sub1.example"])
+    await beacon.async_register_services()
+    beacon_zeroconf.async_check_service.reset_mock()
+    beacon_zeroconf.async_send.reset_mock()
+
+    await beacon.async_reload(**changes)
+
+    aliases = set(changes.get("aliases", beacon.aliases))
+    assert {f"{a}.local." for a in aliases} == {
+        s.server for s in beacon_zeroconf.registry.async_get_service_infos()
+    }
+    assert {f"{a}.local." for a in probed} == {
+        c.args[0].server for c in beacon_zeroconf.async_check_service.await_args_list
+    }
+    assert {info.key for info in beacon.services} == {
+        info.key for info in beacon_zeroconf.registry.async_get_service_infos()
+    }
+    if updated:
+        announced = {
+            answer.name
+            for call in beacon_zeroconf.async_send.call_args_list
+            for answer, _ in call.args[0].answers
+            if answer.ttl
+        }
+        assert {f"{a}.local." for a in updated} <= announced
+    elif not probed:
+        beacon_zeroconf.async_send.assert_not_called()
+
+
+def test_beacon_reload_not_started() -> None:
+    """Test reload a beacon that is not running."""
+    beacon = Beacon(aliases=["example"])
+    assert {s.server for s in beacon.services} == {"example.local."}
+
+    beacon.reload(aliases=["other"], port=8080)
+
+    assert {s.server for s in beacon.services} == {"other.local."}
+    assert beacon.services[0].port == 8080
+
+
+def test_beacon_services_cache() -> None:
+    """Test beacon services are built once and rebuilt when an attribute changes."""
+    empty = Beacon()
+    assert empty.services == []
+    assert empty.services is empty.services
+
+    beacon = Beacon(aliases=["Example Host"])
+    services = beacon.services
+    assert services is beacon.services
+    assert services[0].server == "example-host.local."
+
+    hits = _build_host.cache_info().hits
+    beacon.port = 8080
+    assert beacon.services is not services
+    assert beacon.services[0].port == 8080
+    assert _build_host.cache_info().hits == hits + 1
+
+    services = beacon.services
+    beacon.max_concurrency = 2
+    assert beacon.services is services
+
+
+@pytest.mark.parametrize(
+    "properties",
+    [None, {}, b"", b"\x04path", {"path": "/", "version": 1}, {b"path": b"/", b"flag": None}],
+)
+def test_beacon_services_share_buffers(properties: Union[None, bytes, Dict[Any, Any]]) -> None:
+    """Test beacon services share the type, TXT buffer and address objects."""
+    beacon = Beacon(
+        aliases=["example", "sub1.example"],
+        addresses=[ip_address("127.0.0.1"), ip_address("::1")],
+        properties=properties,
+    )
+
+    first, second = beacon.services
+
+    assert first.type is second.type
+    assert first.text is second.text
+    expected = ServiceInfo(beacon.service_type, first.name, properties=properties or b"")
+    assert first.text == expected.text
+    assert first.dns_text() == expected.dns_text()
+    assert set(first.parsed_addresses()) == {"127.0.0.1", "::1"}
+    first_addresses = first.ip_addresses_by_version(IPVersion.All)
+    second_addresses = second.ip_addresses_by_version(IPVersion.All)
+    assert len(first_addresses) == 2
+    assert all(a is b for a, b in zip(first_addresses, second_addresses, strict=True))
+
+
+def test_beacon_interfaces(mocker: MockerFixture, adapters: List[ifaddr.Adapter]) -> None:
+    """Test beacons use the interfaces on the subnet of their addresses."""
+    pool = mocker.patch("mdns_beacon.base.zeroconf_pool")
+    beacon = Beacon(addresses=[ip_address("192.168.1.20")], interfaces=["eth0", "eth1"])
+
+    assert beacon.zeroconf is pool.acquire.return_value
+    pool.acquire.assert_called_once_with(ip_version=None, interfaces=["192.168.1.10"])
@@ -1,17 +1,28 @@
 """Tests for `mdns_beacon.cli.layouts` module."""
 
+import asyncio
+import threading
+import time
 from contextlib import ExitStack
 from io import StringIO
-from typing import ContextManager, Optional, Tuple, Type
+from typing import ContextManager, Generator, List, Optional, Tuple, Type
 
 import pytest
 from pytest_mock import MockerFixture
 from rich.console import Console, RenderableType
 from rich.live import Live
 from rich.spinner import Spinner
-from zeroconf import ServiceStateChange
+from zeroconf import ServiceInfo, ServiceStateChange
+from zeroconf.asyncio import AsyncServiceInfo
 
-from mdns_beacon.cli.layouts import BaseLayout, BlinkLayout, ListenLayout
+from mdns_beacon.cli.layouts import (
+    BaseLayout,
+    BlinkLayout,
+    ListenLayout,
+    RenderScheduler,
+    ServiceWindow,
+)
+from mdns_beacon.store import ServiceRecord, ServiceStore
 
 
 def render(renderable: RenderableType) -> str:
@@ -29,6 +40,18 @@ def render(renderable: RenderableType) -> str:
     return console.file.getvalue()  # type: ignore
 
 
+@pytest.fixture
+def zeroconf_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
+    """Event loop running in a thread, as the zeroconf one."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield loop
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
 class DummyLayout(BaseLayout):
     """Dummy Layout for purpose."""
 
@@ -73,23 +96,188 @@ def test_render_layout(layout_class: Type[BaseLayout], expected: str) -> None:
 )
 def test_listen_layout(
     mocker: MockerFixture,
+    zeroconf_loop: asyncio.AbstractEventLoop,
     show_columns: Optional[Tuple[str]],
     raises: ContextManager,
     state_change: ServiceStateChange,
 ) -> None:
     """Text listen layout."""
-    zeroconf = mocker.MagicMock()
-    zeroconf.get_service_info = mocker.MagicMock(return_value=None)  # Never returns a service info
+    zeroconf = mocker.MagicMock(loop=zeroconf_loop)
+    # Never returns a service info
+    mocker.patch.object(AsyncServiceInfo, "async_request", return_value=False)
 
     with Live("") as live, raises:
         layout = ListenLayout(live=live, show_columns=show_columns)
-        assert layout.services == {}
+        assert not len(layout.services)
         layout.update_services(
             zeroconf=zeroconf,
             service_type="._some._type.local.",
             name="some_name",
             state_change=state_change,
         )
-        assert layout.services == {}
+        if layout._resolver:
+            for future in list(layout._resolver._pending.values()):
+                future.result(timeout=5)
+        assert not len(layout.services)
+
+    assert not live._started
+
+
+def test_listen_layout_resolves_without_blocking(
+    mocker: MockerFixture, zeroconf_loop: asyncio.AbstractEventLoop
+) -> None:
+    """Test services are resolved concurrently after the handler returns."""
+    zeroconf = mocker.MagicMock(loop=zeroconf_loop)
+    released = threading.Event()
+
+    async def _request(info: AsyncServiceInfo, *args: object) -> bool:
+        await asyncio.get_running_loop().run_in_executor(None, released.wait)
+        info.text = b"\x04path"
+        info.port = 80
+        return True
+
+    mocker.patch.object(AsyncServiceInfo, "async_request", new=_request)
+    service_type = "_http._tcp.local."
+    names = [f"sub{i}.{service_type}" for i in range(3)]
+
+    with Live("") as live:
+        layout = ListenLayout(live=live, show_columns=["name", "port", "text"])
+        for name in names:
+            layout.update_services(zeroconf, service_type, name, ServiceStateChange.Added)
+        assert not len(layout.services)
+        assert layout._resolver
+        futures = list(layout._resolver._pending.values())
+        assert len(futures) == len(names)
+
+        layout.update_services(zeroconf, service_type, names[0], ServiceStateChange.Removed)
+        released.set()
+        for future in futures[1:]:
+            assert isinstance(future.result(timeout=5), ServiceInfo)
+        while len(layout.services) < len(names) - 1:
+            time.sleep(0.01)
+
+        assert sorted(service.name for service in layout.services) == names[1:]
+        assert {service["text"] for service in layout.services} == {"\x04path"}
 
     assert not live._started
+
+
+def test_render_scheduler_coalesces(mocker: MockerFixture) -> None:
+    """Test render requests are coalesced at the refresh rate."""
+    render = mocker.MagicMock()
+    scheduler = RenderScheduler(render, refresh_rate=10)
+
+    for _ in range(1000):
+        scheduler.request()
+    assert render.call_count == 1
+
+    time.sleep(0.2)
+    assert render.call_count == 2
+
+    time.sleep(0.2)
+    scheduler.request()
+    scheduler.request()
+    assert render.call_count == 3
+    scheduler.cancel()
+    time.sleep(0.2)
+    assert render.call_count == 3
+
+
+def test_render_scheduler_invalid_refresh_rate(mocker: MockerFixture) -> None:
+    """Test the refresh rate must be positive."""
+    with pytest.raises(ValueError):
+        RenderScheduler(mocker.MagicMock(), refresh_rate=0)
+
+
+def test_listen_layout_throttled_render(
+    mocker: MockerFixture, zeroconf_loop: asyncio.AbstractEventLoop
+) -> None:
+    """Test a discovery storm renders the table at the refresh rate."""
+    zeroconf = mocker.MagicMock(loop=zeroconf_loop)
+    service_type = "_http._tcp.local."
+
+    store = ServiceStore()
+    names = [f"sub{i}.{service_type}" for i in range(500)]
+    for name in names:
+        store.upsert(ServiceRecord(service_type, name))
+
+    with Live("", auto_refresh=False) as live:
+        layout = ListenLayout(live=live, refresh_rate=5, store=store)
+        update = mocker.spy(live, "update")
+        for name in names:
+            layout.update_services(zeroconf, service_type, name, ServiceStateChange.Removed)
+
+        assert update.call_count == 1
+        time.sleep(0.3)
+        assert update.call_count == 2
+        layout.scheduler.cancel()
+
+
+def service_record(name: str, port: int) -> ServiceRecord:
+    """Build the record of a service."""
+    return ServiceRecord("_http._tcp.local.", name, port=port)
+
+
+@pytest.mark.parametrize(
+    "sort_by,filter_,expected",
+    [
+        (None, None, ["c", "a", "b", "d"]),
+        ("name", None, ["a", "b", "c", "d"]),
+        ("port", None, ["d", "b", "a", "c"]),
+        ("name", "B", ["b"]),
+    ],
+)
+def test_service_window(
+    sort_by: Optional[str], filter_: Optional[str], expected: List[str]
+) -> None:
+    """Test the services view keeps its order through updates and removals."""
+    window = ServiceWindow(sort_by=sort_by, filter_=filter_, columns=("name",))
+    for name, port in [("c", 10), ("a", 5), ("x", 1), ("b", 2), ("d", 1)]:
+        window.update(("_http._tcp.local.", name), service_record(name, port))
+    window.update(("_http._tcp.local.", "x"), None)
+    window.update(("_http._tcp.local.", "c"), service_record("c", 80))
+
+    assert [name for _, name in window.window(0, 10)] == expected
+    assert len(window) == len(expected)
+    assert [name for _, name in window.window(1, 2)] == expected[1:3]
+
+
+@pytest.mark.parametrize(
+    "page,expected_rows,expected_caption",
+    [
+        (0, ["sub000", "sub009"], "1-10 of 95 services (page 1/10)"),
+        (3, ["sub030", "sub039"], "31-40 of 95 services (page 4/10)"),
+        (99, ["sub090", "sub094"], "91-95 of 95 services (page 10/10)"),
+    ],
+)
+def test_listen_layout_pages(page: int, expected_rows: List[str], expected_caption: str) -> None:
+    """Test only the rows of the current page are rendered."""
+    store = ServiceStore()
+    for i in reversed(range(95)):
+        store.upsert(service_record(f"sub{i:03}", i))
+
+    with Live("", auto_refresh=False) as live:
+        layout = ListenLayout(
+            live=live, show_columns=["name"], sort_by="name", page=page, page_size=10, store=store
+        )
+        table = layout.services_table
+        output = render(table)
+
+    assert table.row_count == (5 if page == 99 else 10)
+    assert all(name in output for name in expected_rows)
+    assert table.caption == expected_caption
+
+
+def test_listen_layout_fits_console() -> None:
+    """Test the page size fits the console height by default."""
+    console = Console(height=30, file=StringIO())
+    with Live("", console=console, auto_refresh=False) as live:
+        layout = ListenLayout(live=live)
+
+        assert layout.rows == 30 - ListenLayout.RESERVED_LINES
+
+
+def test_listen_layout_invalid_sort() -> None:
+    """Test sort by an unknown column."""
+    with Live("", auto_refresh=False) as live, pytest.raises(ValueError):
+        ListenLayout(live=live, sort_by="wrong_column")
@@ -1,18 +1,58 @@
 """Tests for `mdns_beacon.cli.main` module."""
 
-from asyncio import AbstractEventLoop
-from typing import List
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List, Set
 from uuid import uuid4
 
+import ifaddr
 import pytest
 from click.testing import CliRunner
 from pytest_mock import MockerFixture
+from zeroconf import NonUniqueNameException
 
 import mdns_beacon
-from mdns_beacon.cli.main import main
+from mdns_beacon.cli.main import _reload_group, main
 
 from ..helpers.contextmanager import raise_keyboard_interrupt
 
+# Dependencies only the commands need, not loaded by `--help` nor `--version`
+HEAVY_MODULES = (
+    "rich",
+    "zeroconf",
+    "slugify",
+    "ifaddr",
+    "mdns_beacon.beacon",
+    "mdns_beacon.listener",
+)
+
+
+def imported_modules(*args: str) -> Set[str]:
+    """Run the CLI with `python -X importtime`.
+
+    Returns:
+        Modules imported by the CLI.
+    """
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-m", "mdns_beacon.cli.main", *args],
+        capture_output=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        text=True,
+    )
+    # Lines as "import time: self [us] | cumulative | imported package", after a header line
+    return {
+        line.rsplit("|", 1)[1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and not line.endswith("imported package")
+    }
+
 
 @pytest.mark.parametrize(
     "options,expected",
@@ -30,6 +70,15 @@ def test_command_line_interface(options: List[str], expected: str) -> None:
     assert expected in result.output
 
 
+@pytest.mark.parametrize("options", [["--help"], ["--version"], ["scan", "--help"]])
+def test_startup_imports(options: List[str]) -> None:
+    """Test the CLI starts without importing the heavy dependencies."""
+    modules = imported_modules(*options)
+
+    assert "click" in modules
+    assert not {m for m in modules if m in HEAVY_MODULES or m.split(".")[0] in HEAVY_MODULES}
+
+
 @pytest.mark.slow
 @pytest.mark.parametrize(
     "options,expected",
@@ -44,11 +93,10 @@ def test_command_line_interface(options: List[str], expected: str) -> None:
             ["example", "--alias", "sub1.example", "--address", "127.0.0.1", "--address", "::1"],
             "Shutting down",
         ),
+        (["example", "--reannounce-interval", "1"], "Shutting down"),
     ],
 )
-def test_blink(
-    mocker: MockerFixture, safe_loop: AbstractEventLoop, options: List[str], expected: str
-) -> None:
+def test_blink(mocker: MockerFixture, options: List[str], expected: str) -> None:
     """Test beacon blink."""
     # Ugly hack to prevent collisions during parallel tests
     uuid = uuid4()
@@ -63,6 +111,97 @@ def test_blink(
     assert expected in result.output
 
 
+@pytest.mark.parametrize(
+    "options,expected",
+    [
+        ([], "Missing argument 'NAME' or option '--config'."),
+        (["--config", "beacons.ini"], "Unsupported configuration file format"),
+    ],
+)
+def test_blink_usage_error(options: List[str], expected: str) -> None:
+    """Test beacon blink usage errors."""
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        Path("beacons.ini").touch()
+        result = runner.invoke(main, ["blink", *options])
+
+    assert result.exit_code == 2
+    assert expected in result.output
+
+
+@pytest.mark.slow
+def test_blink_config(tmp_path: Path) -> None:
+    """Test beacon blink from a configuration file."""
+    uuid = uuid4()
+    config = tmp_path / "beacons.jsonl"
+    config.write_text("\n".join(f'{{"name": "example-{i}-{uuid}"}}' for i in range(20)))
+
+    runner = CliRunner()
+    with raise_keyboard_interrupt(timeout=6):
+        result = runner.invoke(main, ["blink", f"extra-{uuid}", "--config", str(config)])
+
+    assert result.exit_code == 0
+    assert "Shutting down" in result.output
+
+
+async def test_reload_group_error(mocker: MockerFixture) -> None:
+    """Test the errors of a reload scheduled in the group event loop are printed."""
+    group = mocker.MagicMock()
+    group.async_reload = mocker.AsyncMock(side_effect=NonUniqueNameException)
+    console = mocker.patch("mdns_beacon.cli.main.get_console")
+
+    _reload_group(group, [])
+    await asyncio.sleep(0.1)
+
+    console.return_value.print.assert_called_once_with(
+        "Configuration not fully reloaded: NonUniqueNameException()"
+    )
+
+
+@pytest.mark.parametrize("command", ["blink", "listen", "scan"])
+def test_interfaces_ip_version(
+    mocker: MockerFixture, adapters: List[ifaddr.Adapter], command: str
+) -> None:
+    """Test the network interfaces are checked for the IP version of the command."""
+    execute = mocker.patch("mdns_beacon.base.BaseBeacon.run_forever")
+    mocker.patch("mdns_beacon.listener.BeaconListener.scan", return_value=[])
+    runner = CliRunner()
+    args = [command, "example"] if command == "blink" else [command]
+
+    result = runner.invoke(main, [*args, "--interface", "eth1", "--ip-version", "v6"])
+    assert result.exit_code == 2
+    assert "--interface" in result.output
+
+    result = runner.invoke(main, [*args, "--interface", "eth1", "--ip-version", "v4"])
+    assert result.exit_code == 0, result.output
+    assert execute.called or command == "scan"
+
+
+@pytest.mark.slow
+def test_blink_config_reload(tmp_path: Path) -> None:
+    """Test beacon blink reloads the configuration file on SIGHUP."""
+    uuid = uuid4()
+    config = tmp_path / "beacons.jsonl"
+    config.write_text(f'{{"name": "example-{uuid}"}}')
+
+    def _hangup() -> None:
+        time.sleep(3)
+        config.write_text(f'{{"name": "example-{uuid}", "aliases": ["sub1.example-{uuid}"]}}')
+        os.kill(os.getpid(), signal.SIGHUP)
+        time.sleep(1)
+        config.write_text("[")
+        os.kill(os.getpid(), signal.SIGHUP)
+
+    threading.Thread(target=_hangup, daemon=True).start()
+    runner = CliRunner()
+    with raise_keyboard_interrupt(timeout=6):
+        result = runner.invoke(main, ["blink", "--config", str(config)])
+
+    assert result.exit_code == 0
+    assert "Configuration reloaded" in result.output
+    assert "Configuration not reloaded" in result.output
+
+
 @pytest.mark.slow
 @pytest.mark.parametrize(
     "options,timeout,expected",
@@ -74,11 +213,28 @@ def test_blink(
             2,
             "Shutting down",
         ),
+        (["--service", "_http._tcp.local.", "--refresh-rate", "10"], 2, "Shutting down"),
+        (
+            ["--service", "_http._tcp.local.", "--sort", "name", "--filter", "example"],
+            2,
+            "Shutting down",
+        ),
+        (
+            ["--service", "_http._tcp.local.", "--page", "2", "--page-size", "5"],
+            2,
+            "Shutting down",
+        ),
+        (["--service", "_http._tcp.local.", "--output", "jsonl"], 2, "Shutting down"),
+        (
+            ["--service", "_http._tcp.local.", "--output", "jsonl", "--coalesce-window", "0.5"],
+            2,
+            "Shutting down",
+        ),
+        (["--service", "_http._tcp.local.", "--output", "csv", "--show", "name"], 2, "event,"),
     ],
 )
 def test_listen(
     mocker: MockerFixture,
-    safe_loop: AbstractEventLoop,
     options: List[str],
     timeout: float,
     expected: str,
@@ -91,3 +247,110 @@ def test_listen(
 
     assert result.exit_code == 0
     assert expected in result.output
+
+
+@pytest.mark.parametrize(
+    "option,value",
+    [
+        ("--refresh-rate", "0"),
+        ("--refresh-rate", "100"),
+        ("--refresh-rate", "fast"),
+        ("--sort", "wrong_column"),
+        ("--page", "0"),
+        ("--page-size", "0"),
+        ("--output", "xml"),
+        ("--flush-interval", "0"),
+        ("--coalesce-window", "-1"),
+        ("--interface", "missing-interface"),
+        ("--ip-version", "v5"),
+    ],
+)
+def test_listen_invalid_options(option: str, value: str) -> None:
+    """Test listen with invalid options."""
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["listen", option, value])
+
+    assert result.exit_code == 2
+    assert option in result.output
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize(
+    "options,expected",
+    [
+        (["--service", "_http._tcp.local.", "--duration", "0.5"], "mDNS Beacon Listener"),
+        (
+            ["--service", "_http._tcp.local.", "--quiet-interval", "0.2", "--sort", "name"],
+            "mDNS Beacon Listener",
+        ),
+        (["--service", "_http._tcp.local.", "--duration", "0.5", "--output", "csv"], "event,"),
+        (
+            ["--service", "_http._tcp.local.", "--duration", "0.5", "--interface", "default"],
+            "mDNS Beacon Listener",
+        ),
+    ],
+)
+def test_scan(options: List[str], expected: str) -> None:
+    """Test beacon scan."""
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["scan", *options])
+
+    assert result.exit_code == 0
+    assert expected in result.output
+
+
+@pytest.mark.slow
+def test_scan_types_cache(tmp_path: Path) -> None:
+    """Test scan caches the discovered service types to a file."""
+    runner = CliRunner()
+    types_cache = tmp_path / "service-types.json"
+
+    for _ in range(2):
+        result = runner.invoke(
+            main, ["scan", "--duration", "0.5", "--types-cache", str(types_cache)]
+        )
+        assert result.exit_code == 0
+
+    assert "types" in types_cache.read_text()
+
+
+@pytest.mark.slow
+def test_scan_profile_trace(tmp_path: Path) -> None:
+    """Test profile and trace a command."""
+    runner = CliRunner()
+    profile, trace = tmp_path / "profile.txt", tmp_path / "trace.json"
+
+    result = runner.invoke(
+        main,
+        [
+            *("--profile", str(profile), "--trace", str(trace)),
+            *("scan", "--service", "_http._tcp.local.", "--duration", "0.5"),
+        ],
+    )
+
+    assert result.exit_code == 0
+    assert "function calls" in profile.read_text()
+    assert "BeaconListener.stop" in trace.read_text()
+
+
+@pytest.mark.parametrize(
+    "option,value",
+    [
+        ("--duration", "0"),
+        ("--max-results", "0"),
+        ("--quiet-interval", "0"),
+        ("--output", "xml"),
+        ("--sort", "wrong_column"),
+        ("--interface", "missing-interface"),
+    ],
+)
+def test_scan_invalid_options(option: str, value: str) -> None:
+    """Test scan with invalid options."""
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["scan", option, value])
+
+    assert result.exit_code == 2
+    assert option in result.output
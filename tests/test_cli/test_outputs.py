@@ -0,0 +1,142 @@
+"""Tests for `mdns_beacon.cli.outputs` module."""
+
+import asyncio
+import csv
+import json
+import threading
+import time
+from io import StringIO
+from typing import Generator
+
+import pytest
+from pytest_mock import MockerFixture
+from zeroconf import ServiceStateChange
+from zeroconf.asyncio import AsyncServiceInfo
+
+from mdns_beacon.cli.options import OUTPUT_FORMATS
+from mdns_beacon.cli.outputs import OUTPUTS, CsvOutput, JsonLinesOutput
+from mdns_beacon.store import ServiceRecord
+
+SERVICE_TYPE = "_http._tcp.local."
+
+
+@pytest.fixture
+def zeroconf_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
+    """Event loop running in a thread, as the zeroconf one."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield loop
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def test_jsonl_output_buffered() -> None:
+    """Test the records are buffered until flushed."""
+    stream = StringIO()
+    output = JsonLinesOutput(stream, columns=["name", "port", "properties"], flush_interval=60)
+
+    output.write("added", ServiceRecord(SERVICE_TYPE, f"a.{SERVICE_TYPE}", port=80))
+    output.write("removed", ServiceRecord(SERVICE_TYPE, f"b.{SERVICE_TYPE}"))
+    assert stream.getvalue() == ""
+
+    output.close()
+    rows = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [(row["event"], row["name"], row["port"]) for row in rows] == [
+        ("added", f"a.{SERVICE_TYPE}", 80),
+        ("removed", f"b.{SERVICE_TYPE}", None),
+    ]
+    assert rows[0]["properties"] == {}
+    assert all(isinstance(row["timestamp"], float) for row in rows)
+
+
+def test_output_flush_interval() -> None:
+    """Test the records are written every flush interval."""
+    stream = StringIO()
+    output = JsonLinesOutput(stream, columns=["name"], flush_interval=0.05)
+
+    output.write("added", ServiceRecord(SERVICE_TYPE, f"a.{SERVICE_TYPE}"))
+    time.sleep(0.2)
+
+    assert len(stream.getvalue().splitlines()) == 1
+    output.close()
+
+
+def test_output_buffer_size() -> None:
+    """Test a full buffer is written right away."""
+    stream = StringIO()
+    output = JsonLinesOutput(stream, columns=["name"], flush_interval=60, buffer_size=150)
+
+    for i in range(9):
+        output.write("added", ServiceRecord(SERVICE_TYPE, f"sub{i}.{SERVICE_TYPE}"))
+
+    assert 0 < len(stream.getvalue().splitlines()) < 9
+    output.close()
+    assert len(stream.getvalue().splitlines()) == 9
+
+
+def test_csv_output_filter() -> None:
+    """Test CSV records with a header, filtered by the shown columns."""
+    stream = StringIO()
+    output = CsvOutput(stream, columns=["name", "properties"], filter_="EXAMPLE")
+
+    record = ServiceRecord(SERVICE_TYPE, f"example.{SERVICE_TYPE}", raw_text=b"\x04path")
+    output.write("added", record)
+    output.write("added", ServiceRecord(SERVICE_TYPE, f"other.{SERVICE_TYPE}"))
+    output.close()
+
+    rows = list(csv.reader(StringIO(stream.getvalue())))
+    assert rows[0] == ["event", "timestamp", "name", "properties"]
+    assert len(rows) == 2
+    assert rows[1][0] == "added"
+    assert rows[1][2:] == [record.name, '{"path": null}']
+
+
+def test_output_filter_removed() -> None:
+    """Test the removals of the services that passed the filter are always written."""
+    stream = StringIO()
+    output = JsonLinesOutput(stream, columns=["name", "port"], filter_="8080")
+
+    kept = f"example.{SERVICE_TYPE}"
+    output.write("added", ServiceRecord(SERVICE_TYPE, kept, port=8080))
+    output.write("added", ServiceRecord(SERVICE_TYPE, f"other.{SERVICE_TYPE}", port=80))
+    output.write("removed", ServiceRecord(SERVICE_TYPE, f"other.{SERVICE_TYPE}"))
+    output.write("removed", ServiceRecord(SERVICE_TYPE, kept))
+    output.write("removed", ServiceRecord(SERVICE_TYPE, kept))
+    output.close()
+
+    rows = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [(row["event"], row["name"]) for row in rows] == [("added", kept), ("removed", kept)]
+
+
+def test_output_update_services(
+    mocker: MockerFixture, zeroconf_loop: asyncio.AbstractEventLoop
+) -> None:
+    """Test service events are written once resolved, and removals right away."""
+
+    async def _request(info: AsyncServiceInfo, *args: object) -> bool:
+        info.port = 8080
+        return True
+
+    mocker.patch.object(AsyncServiceInfo, "async_request", new=_request)
+    zeroconf = mocker.MagicMock(loop=zeroconf_loop)
+    stream = StringIO()
+    output = JsonLinesOutput(stream, columns=["name", "port"], flush_interval=60)
+
+    name = f"example.{SERVICE_TYPE}"
+    output.update_services(zeroconf, SERVICE_TYPE, name, ServiceStateChange.Added)
+    assert output._resolver
+    for future in list(output._resolver._pending.values()):
+        future.result(timeout=5)
+    time.sleep(0.05)
+    output.update_services(zeroconf, SERVICE_TYPE, name, ServiceStateChange.Removed)
+    output.close()
+
+    rows = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [(row["event"], row["port"]) for row in rows] == [("added", 8080), ("removed", None)]
+
+
+def test_output_formats() -> None:
+    """Test the output format choices of the commands match the outputs."""
+    assert tuple(OUTPUTS) == OUTPUT_FORMATS
@@ -0,0 +1,46 @@
+"""Tests for `profiling` module."""
+
+import pstats
+import threading
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from mdns_beacon.cli.profiling import Profiler
+
+
+def _busy(results: List[int]) -> None:
+    """Function to profile."""
+    results.append(sum(range(1000)))
+
+
+@pytest.mark.parametrize("filename", ["profile.txt", "profile.prof"])
+def test_profiler(tmp_path: Path, filename: str) -> None:
+    """Test the threads started while profiling are merged in the report."""
+    path = tmp_path / filename
+    profiler = Profiler(path)
+
+    results: List[int] = []
+
+    profiler.start()
+    thread = threading.Thread(target=_busy, args=(results,))
+    thread.start()
+    thread.join()
+    stats = profiler.stop()
+
+    assert results, "the profiled thread did not run"
+    assert stats
+    assert any(function == "_busy" for _, _, function in stats.stats)  # type: ignore[attr-defined]
+    if path.suffix == ".prof":
+        assert pstats.Stats(str(path)).total_calls  # type: ignore[attr-defined]
+    else:
+        assert "cumulative" in path.read_text()
+
+
+def test_profiler_not_started(tmp_path: Path) -> None:
+    """Test stopping a profiler that was not started."""
+    path = tmp_path / "profile.txt"
+
+    assert Profiler(path).stop() is None
+    assert not path.exists()
@@ -0,0 +1,190 @@
+"""Tests for `config` module."""
+
+import io
+import json
+from contextlib import ExitStack
+from ipaddress import ip_address
+from pathlib import Path
+from typing import Any, ContextManager, Dict
+
+import pytest
+
+from mdns_beacon.config import (
+    ConfigError,
+    _iter_json,
+    build_beacon,
+    iter_definitions,
+    load_beacons,
+)
+
+YAML_CONFIG = """
+- name: example
+  aliases: [sub1.example]
+  addresses: [127.0.0.1, "::1"]
+  port: 8080
+  properties:
+    path: /
+- name: other
+  type: ipp
+  protocol: udp
+  txt: some text
+"""
+
+YAML_STREAM_CONFIG = """
+name: example
+aliases: [sub1.example]
+addresses: [127.0.0.1, "::1"]
+port: 8080
+properties:
+  path: /
+---
+beacons:
+  - name: other
+    type: ipp
+    protocol: udp
+    txt: some text
+"""
+
+JSON_CONFIG = """[
+  {"name": "example", "aliases": ["sub1.example"], "addresses": ["127.0.0.1", "::1"],
+   "port": 8080, "properties": {"path": "/"}},
+  {"name": "other", "type": "ipp", "protocol": "udp", "txt": "some text"}
+]"""
+
+JSON_OBJECT_CONFIG = f'{{"beacons": {JSON_CONFIG}}}'
+
+JSON_LINES_CONFIG = """
+{"name": "example", "aliases": ["sub1.example"], "addresses": ["127.0.0.1", "::1"], \
+"port": 8080, "properties": {"path": "/"}}
+
+{"name": "other", "type": "ipp", "protocol": "udp", "txt": "some text"}
+"""
+
+TOML_CONFIG = """
+[[beacons]]
+name = "example"
+aliases = ["sub1.example"]
+addresses = ["127.0.0.1", "::1"]
+port = 8080
+properties = {path = "/"}
+
+[[beacons]]
+name = "other"
+type = "ipp"
+protocol = "udp"
+txt = "some text"
+"""
+
+
+@pytest.mark.parametrize(
+    "filename,content",
+    [
+        ("beacons.yaml", YAML_CONFIG),
+        ("beacons.yml", YAML_STREAM_CONFIG),
+        ("beacons.json", JSON_CONFIG),
+        ("beacons.json", JSON_OBJECT_CONFIG),
+        ("beacons.jsonl", JSON_LINES_CONFIG),
+        ("beacons.toml", TOML_CONFIG),
+    ],
+)
+def test_load_beacons(tmp_path: Path, filename: str, content: str) -> None:
+    """Test load beacons from every supported format."""
+    path = tmp_path / filename
+    path.write_text(content)
+
+    example, other = load_beacons(path)
+
+    assert example.aliases == {"example", "sub1.example"}
+    assert example.addresses == {ip_address("127.0.0.1"), ip_address("::1")}
+    assert example.port == 8080
+    assert example.service_type == "_http._tcp.local."
+    assert example.services[0].properties == {b"path": b"/"}
+    assert other.aliases == {"other"}
+    assert other.service_type == "_ipp._udp.local."
+    assert other.properties == b"some text"
+
+
+@pytest.mark.parametrize("filename", ["beacons.json", "beacons.yaml", "beacons.jsonl"])
+def test_iter_definitions_streaming(tmp_path: Path, filename: str) -> None:
+    """Test definitions are parsed one at a time."""
+    path = tmp_path / filename
+    if filename.endswith(".jsonl"):
+        path.write_text('{"name": "example"}\n{"name": \n')
+    elif filename.endswith(".json"):
+        path.write_text('[{"name": "example"}, {"name": ]')
+    else:
+        path.write_text("- name: example\n- name: [\n")
+
+    definitions = iter_definitions(path)
+
+    assert next(definitions) == {"name": "example"}
+    with pytest.raises(ValueError):
+        next(definitions)
+
+
+def test_iter_json_chunks() -> None:
+    """Test JSON arrays are read chunk by chunk, with values spanning chunks."""
+    definitions = [{"name": f"example-{i}", "port": 10**i} for i in range(8)]
+    stream = io.StringIO(json.dumps(definitions))
+
+    items = _iter_json(stream, chunk_size=4)
+
+    assert next(items) == definitions[0]
+    assert stream.tell() < len(stream.getvalue())
+    assert [definitions[0], *items] == definitions
+    assert list(_iter_json(io.StringIO(" [1, 23456 ,] "), chunk_size=2)) == [1, 23456]
+
+
+@pytest.mark.parametrize(
+    "filename,content",
+    [
+        ("beacons.ini", ""),
+        ("beacons.json", '{"beacons": {}}'),
+        ("beacons.json", "[1]"),
+        ("beacons.json", '[{"name": "example"} {"name": "other"}]'),
+        ("beacons.json", '[{"name": "example"}'),
+        ("beacons.toml", "beacons = "),
+        ("beacons.yaml", "- [\n"),
+    ],
+)
+def test_iter_definitions_invalid(tmp_path: Path, filename: str, content: str) -> None:
+    """Test invalid configuration files."""
+    path = tmp_path / filename
+    path.write_text(content)
+
+    with pytest.raises(ConfigError):
+        list(iter_definitions(path))
+
+
+def test_load_beacons_invalid(tmp_path: Path) -> None:
+    """Test the invalid beacon definitions are reported with their index."""
+    path = tmp_path / "beacons.jsonl"
+    path.write_text('{"name": "example"}\n{"name": "other", "port": "80"}\n')
+
+    with pytest.raises(ConfigError, match=r"^Beacon 1: `port` must be an integer"):
+        list(load_beacons(path))
+
+
+@pytest.mark.parametrize(
+    "definition,raises",
+    [
+        ({"name": "example"}, ExitStack()),
+        ({"aliases": ["example"]}, pytest.raises(ConfigError)),
+        ({"name": "example", "unknown": 1}, pytest.raises(ConfigError)),
+        ({"name": "example", "txt": "a", "properties": {"b": "c"}}, pytest.raises(ConfigError)),
+        ({"name": "example", "protocol": "sctp"}, pytest.raises(ConfigError)),
+        ({"name": "example", "addresses": ["wrong address"]}, pytest.raises(ConfigError)),
+        ({"name": "example", "properties": ["path"]}, pytest.raises(ConfigError)),
+        ({"name": "example", "aliases": "web"}, pytest.raises(ConfigError, match="`aliases`")),
+        ({"name": "example", "aliases": [1]}, pytest.raises(ConfigError, match="`aliases`")),
+        ({"name": "example", "port": "80"}, pytest.raises(ConfigError, match="`port`")),
+        ({"name": "example", "ttl": True}, pytest.raises(ConfigError, match="`ttl`")),
+        ({"name": 1}, pytest.raises(ConfigError, match="`name`")),
+        ({"name": "example", "reannounce_interval": 0.5}, ExitStack()),
+        ({"name": "example", "reannounce_interval": "1"}, pytest.raises(ConfigError)),
+    ],
+)
+def test_build_beacon(definition: Dict[str, Any], raises: ContextManager) -> None:
+    """Test build beacon from its definition."""
+    with raises:
+        assert build_beacon(definition, max_concurrency=2).max_concurrency == 2
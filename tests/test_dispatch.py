@@ -0,0 +1,135 @@
+"""Tests for `dispatch` module."""
+
+import threading
+import time
+from typing import Any, List, Tuple
+
+import pytest
+from pytest_mock import MockerFixture
+from zeroconf import ServiceStateChange
+
+from mdns_beacon.dispatch import EventDispatcher
+
+SERVICE_TYPE = "_http._tcp.local."
+NAME = f"example.{SERVICE_TYPE}"
+
+Added, Updated, Removed = (
+    ServiceStateChange.Added,
+    ServiceStateChange.Updated,
+    ServiceStateChange.Removed,
+)
+
+
+class Recorder:
+    """Handler recording the dispatched state changes."""
+
+    def __init__(self) -> None:
+        """Init an empty recorder."""
+        self.events: List[Tuple[str, ServiceStateChange]] = []
+
+    def __call__(self, **kwargs: Any) -> None:  # noqa: ANN401
+        """Record a state change."""
+        self.events.append((kwargs["name"], kwargs["state_change"]))
+
+
+@pytest.mark.parametrize(
+    "state_changes,expected",
+    [
+        ([Added, Updated, Updated], [Added]),
+        ([Added, Removed], []),
+        ([Added, Removed, Added], [Added]),
+        ([Updated, Updated], [Updated]),
+        ([Updated, Removed], [Removed]),
+        ([Removed, Added], [Updated]),
+    ],
+)
+def test_dispatcher_coalesce(
+    mocker: MockerFixture,
+    state_changes: List[ServiceStateChange],
+    expected: List[ServiceStateChange],
+) -> None:
+    """Test the state changes of a service are coalesced within the window."""
+    recorder = Recorder()
+    dispatcher = EventDispatcher([recorder], window=0.1)
+    zeroconf = mocker.MagicMock()
+
+    for state_change in state_changes:
+        dispatcher(zeroconf, SERVICE_TYPE, NAME, state_change)
+    time.sleep(0.3)
+
+    assert recorder.events == [(NAME, state_change) for state_change in expected]
+    dispatcher.close()
+
+
+def test_dispatcher_backpressure(mocker: MockerFixture) -> None:
+    """Test slow handlers don't block the caller, and services are dispatched one at a time."""
+    release = threading.Event()
+    running = []
+    recorder = Recorder()
+
+    def _slow(**kwargs: Any) -> None:  # noqa: ANN401
+        running.append(kwargs["name"])
+        release.wait(5)
+
+    dispatcher = EventDispatcher([_slow, recorder], window=0, max_workers=2)
+    zeroconf = mocker.MagicMock()
+    names = [f"sub{i}.{SERVICE_TYPE}" for i in range(5)]
+
+    start = time.perf_counter()
+    for _ in range(100):
+        for name in names:
+            dispatcher(zeroconf, SERVICE_TYPE, name, Updated)
+    assert time.perf_counter() - start < 1
+    time.sleep(0.1)
+
+    assert len(running) == 2
+    assert dispatcher.pending <= len(names)
+    release.set()
+    dispatcher.close()
+
+    assert sorted({name for name, _ in recorder.events}) == names
+    assert len(recorder.events) <= 2 * len(names)
+
+
+def test_dispatcher_close(mocker: MockerFixture) -> None:
+    """Test the pending state changes are dispatched on close, and later ones ignored."""
+    recorder = Recorder()
+    dispatcher = EventDispatcher([recorder], window=60)
+    zeroconf = mocker.MagicMock()
+
+    dispatcher(zeroconf, SERVICE_TYPE, NAME, Added)
+    dispatcher.close()
+    dispatcher(zeroconf, SERVICE_TYPE, NAME, Removed)
+
+    assert recorder.events == [(NAME, Added)]
+
+
+def test_dispatcher_listener(mocker: MockerFixture) -> None:
+    """Test the state changes are dispatched to a service listener."""
+    listener = mocker.MagicMock()
+    dispatcher = EventDispatcher(listener, window=0)
+    zeroconf = mocker.MagicMock()
+
+    dispatcher(zeroconf, SERVICE_TYPE, NAME, Added)
+    dispatcher.close()
+
+    listener.add_service.assert_called_once_with(zeroconf, SERVICE_TYPE, NAME)
+
+
+def test_dispatcher_handler_error(mocker: MockerFixture, caplog: pytest.LogCaptureFixture) -> None:
+    """Test a failing handler doesn't prevent the other handlers from being called."""
+    recorder = Recorder()
+    dispatcher = EventDispatcher([mocker.MagicMock(side_effect=RuntimeError), recorder], window=0)
+
+    dispatcher(mocker.MagicMock(), SERVICE_TYPE, NAME, Added)
+    dispatcher.close()
+
+    assert recorder.events == [(NAME, Added)]
+    assert "failed" in caplog.text
+
+
+@pytest.mark.parametrize("params", [{"window": -1}, {"max_workers": 0}])
+def test_dispatcher_invalid(params: Any) -> None:  # noqa: ANN401
+    """Test invalid dispatcher parameters."""
+    with pytest.raises(ValueError):
+        EventDispatcher([], **params)
@@ -0,0 +1,131 @@
+"""Tests for `events` module."""
+
+import asyncio
+import threading
+from typing import List
+
+import pytest
+from pytest_mock import MockerFixture
+from zeroconf import ServiceStateChange
+
+from mdns_beacon.events import OVERFLOW, EventQueue, ServiceEvent
+
+SERVICE_TYPE = "_http._tcp.local."
+
+Added, Updated, Removed = (
+    ServiceStateChange.Added,
+    ServiceStateChange.Updated,
+    ServiceStateChange.Removed,
+)
+
+
+def _event(index: int, state_change: ServiceStateChange = Added) -> ServiceEvent:
+    """Build the event of a service."""
+    return ServiceEvent(SERVICE_TYPE, f"sub{index}.{SERVICE_TYPE}", state_change)
+
+
+async def _drain(queue: EventQueue) -> List[ServiceEvent]:
+    """Get the queued events."""
+    events = []
+    while queue.qsize():
+        events.append(await queue.get())
+    return events
+
+
+async def test_queue_drop_oldest() -> None:
+    """Test the oldest events are dropped once the queue is full."""
+    queue = EventQueue(max_size=2)
+
+    for i in range(4):
+        queue.put_nowait(_event(i))
+
+    assert await _drain(queue) == [_event(2), _event(3)]
+    assert queue.dropped == 2
+
+
+async def test_queue_block() -> None:
+    """Test the events wait for room in order, up to `max_size` of them, once the queue is full."""
+    queue = EventQueue(max_size=2, overflow="block")
+
+    for i in range(4):
+        queue.put_nowait(_event(i))
+    assert queue.qsize() == 2
+
+    events = [await queue.get() for _ in range(4)]
+    assert events == [_event(i) for i in range(4)]
+    assert not queue.dropped
+
+    for i in range(5):
+        queue.put_nowait(_event(i))
+    assert queue.dropped == 1
+    assert [await queue.get() for _ in range(4)] == [_event(i) for i in (0, 1, 3, 4)]
+
+    queue.put_nowait(_event(0))
+    queue.put_nowait(_event(1))
+    queue.put_nowait(_event(2))
+    queue.close()
+    assert await _drain(queue) == [_event(0), _event(1)]
+
+
+async def test_queue_block_threads(mocker: MockerFixture) -> None:
+    """Test the threads queuing events are never blocked, the events wait in the event loop."""
+    queue = EventQueue(max_size=2, overflow="block")
+    zeroconf = mocker.MagicMock()
+
+    def _produce() -> None:
+        for i in range(4):
+            queue(zeroconf, SERVICE_TYPE, f"sub{i}.{SERVICE_TYPE}", Added)
+
+    thread = threading.Thread(target=_produce)
+    thread.start()
+    thread.join(1)
+    assert not thread.is_alive()
+
+    events = [await asyncio.wait_for(queue.get(), 1) for _ in range(4)]
+    assert events == [_event(i) for i in range(4)]
+    assert not queue.dropped
+
+
+async def test_queue_coalesce() -> None:
+    """Test the events of a queued service are merged, keeping its latest state."""
+    queue = EventQueue(max_size=2, overflow="coalesce")
+
+    for state_change in (Added, Updated, Updated):
+        queue.put_nowait(_event(0, state_change))
+    queue.put_nowait(_event(1, Added))
+    queue.put_nowait(_event(1, Removed))
+    queue.put_nowait(_event(1, Updated))
+
+    assert await _drain(queue) == [_event(0, Added), _event(1, Updated)]
+
+    queue.put_nowait(_event(0, Added))
+    queue.put_nowait(_event(0, Removed))
+    for i in (1, 2):
+        queue.put_nowait(_event(i, Updated))
+    assert queue.dropped == 1
+    assert await _drain(queue) == [_event(1, Updated), _event(2, Updated)]
+
+
+async def test_queue_handler(mocker: MockerFixture) -> None:
+    """Test the events are handed off from other threads to the queue event loop."""
+    queue = EventQueue()
+    zeroconf = mocker.MagicMock()
+
+    queue(zeroconf, SERVICE_TYPE, f"sub0.{SERVICE_TYPE}", Added)
+    thread = threading.Thread(
+        target=queue,
+        args=(zeroconf, SERVICE_TYPE, f"sub1.{SERVICE_TYPE}"),
+        kwargs={"state_change": Added},
+    )
+    thread.start()
+    thread.join()
+
+    assert await asyncio.wait_for(queue.get(), 1) == _event(0)
+    assert await asyncio.wait_for(queue.get(), 1) == _event(1)
+
+
+@pytest.mark.parametrize("max_size,overflow", [(0, "block"), (1, "wrong_policy")])
+async def test_queue_invalid(max_size: int, overflow: OVERFLOW) -> None:
+    """Test invalid queue parameters."""
+    with pytest.raises(ValueError):
+        EventQueue(max_size=max_size, overflow=overflow)
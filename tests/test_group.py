@@ -0,0 +1,159 @@
+"""Tests for `group` module."""
+
+import asyncio
+from ipaddress import ip_address
+from typing import Any, Dict, List
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import ifaddr
+import pytest
+from pytest_mock import MockerFixture
+from zeroconf import IPVersion, NonUniqueNameException, ServiceInfo
+
+from mdns_beacon.beacon import Beacon
+from mdns_beacon.group import BeaconGroup
+
+from .helpers.contextmanager import raise_keyboard_interrupt
+
+
+def test_group_ip_version() -> None:
+    """Test beacons must use the group IP version."""
+    with pytest.raises(ValueError):
+        BeaconGroup(beacons=[Beacon(ip_version=IPVersion.V4Only)])
+
+
+async def test_group_interfaces(mocker: MockerFixture, adapters: List[ifaddr.Adapter]) -> None:
+    """Test groups use the interfaces on the subnet of any beacon, shared with the beacons."""
+    pool = mocker.patch("mdns_beacon.group.zeroconf_pool")
+    mocker.patch("mdns_beacon.base.zeroconf_pool", pool)
+    beacons = [
+        Beacon(addresses=[ip_address("192.168.1.20")]),
+        Beacon(addresses=[ip_address("10.1.2.3")], interfaces=["default"]),
+    ]
+    group = BeaconGroup(beacons=beacons)
+    mocker.patch.object(group, "_async_start_beacon", mocker.AsyncMock())
+
+    await group.async_start()
+
+    pool.acquire.assert_called_once_with(ip_version=None, interfaces=["192.168.1.10", "10.0.0.5"])
+    assert all(beacon._zeroconf is pool.share.return_value for beacon in beacons)
+    pool.share.assert_called_with(pool.acquire.return_value)
+
+
+@pytest.mark.slow
+def test_group() -> None:
+    """Test beacon group."""
+    uuid = uuid4()
+    beacons = [
+        Beacon(aliases=[f"example-{uuid}", f"sub1.example-{uuid}"]),
+        Beacon(aliases=[f"other-{uuid}"], type_="ipp", port=631),
+    ]
+    group = BeaconGroup(beacons=beacons)
+    running: Dict[str, Any] = {}
+
+    def _snapshot() -> None:
+        zeroconf = group._zeroconf
+        assert zeroconf
+        running["zeroconf"] = zeroconf
+        running["shared"] = all(beacon.zeroconf is zeroconf for beacon in beacons)
+        running["services"] = {s.key for s in zeroconf.registry.async_get_service_infos()}
+
+    with raise_keyboard_interrupt(timeout=4, before=_snapshot):
+        group.run_forever()
+
+    assert running["shared"]
+    assert {s.key for b in beacons for s in b.services} == running["services"]
+    assert running["zeroconf"].done
+    assert not group._zeroconf
+
+    group.stop()
+
+
+@pytest.mark.slow
+async def test_group_async() -> None:
+    """Test beacon group running in the caller event loop."""
+    uuid = uuid4()
+    group = BeaconGroup(beacons=[Beacon(aliases=[f"example-{uuid}"]), Beacon()])
+
+    await group.async_start()
+    zeroconf = group.zeroconf
+    assert len(zeroconf.registry.async_get_service_infos()) == 1
+
+    await group.async_stop()
+    assert zeroconf.done
+
+
+async def test_group_reload(beacon_zeroconf: MagicMock) -> None:
+    """Test group reload matches beacons by service type and aliases."""
+    kept = Beacon(aliases=["example", "sub1.example"])
+    removed = Beacon(aliases=["printer"], type_="ipp")
+    group = BeaconGroup(beacons=[kept, removed])
+    await group.async_register_services()
+    beacon_zeroconf.async_check_service.reset_mock()
+
+    added = Beacon(aliases=["printer"], type_="ipps")
+    await group.async_reload(
+        [Beacon(aliases=["example", "sub2.example"], port=8080), added, Beacon()]
+    )
+
+    assert group.beacons[0] is kept
+    assert group.beacons[1] is added
+    assert kept.port == 8080
+    assert kept.aliases == {"example", "sub2.example"}
+    assert {
+        "example._http._tcp.local.",
+        "sub2.example._http._tcp.local.",
+        "printer._ipps._tcp.local.",
+    } == {s.name for s in beacon_zeroconf.registry.async_get_service_infos()}
+    assert {"sub2.example.local.", "printer.local."} == {
+        c.args[0].server for c in beacon_zeroconf.async_check_service.await_args_list
+    }
+
+
+async def test_group_reload_register_error(beacon_zeroconf: MagicMock) -> None:
+    """Test the started beacons failing to register are left out of the reloaded group."""
+    kept = Beacon(aliases=["example"])
+    removed = Beacon(aliases=["printer"], type_="ipp")
+    group = BeaconGroup(beacons=[kept, removed])
+    await group.async_register_services()
+
+    async def _check_service(info: ServiceInfo, allow_name_change: bool) -> None:
+        if info.name.startswith("conflict"):
+            raise NonUniqueNameException
+
+    beacon_zeroconf.async_check_service.side_effect = _check_service
+    added = Beacon(aliases=["scanner"], type_="scanner")
+    with pytest.raises(NonUniqueNameException):
+        await group.async_reload([kept, Beacon(aliases=["conflict"], type_="ipps"), added])
+
+    assert group.beacons == [kept, added]
+    assert {"example._http._tcp.local.", "scanner._scanner._tcp.local."} == {
+        s.name for s in beacon_zeroconf.registry.async_get_service_infos()
+    }
+
+
+def test_group_reload_not_started() -> None:
+    """Test reload a group that is not running."""
+    group = BeaconGroup(beacons=[Beacon()])
+    beacons = [Beacon(aliases=["example"])]
+
+    group.reload(beacons)
+
+    assert group.beacons == beacons
+
+
+async def test_group_async_start_readiness(beacon_zeroconf: MagicMock) -> None:
+    """Test beacons with bindable addresses start without waiting for the rest."""
+    ready = Beacon(aliases=["ready"])
+    waiting = Beacon(aliases=["waiting"], addresses=[ip_address("203.0.113.1")])
+    group = BeaconGroup(beacons=[ready, waiting], delay_startup=1)
+
+    start = asyncio.create_task(group.async_start())
+    await asyncio.sleep(0.5)
+
+    assert ready.announcer.infos
+    assert not waiting.announcer.infos
+    await start
+    assert waiting.announcer.infos
+    await group.async_stop()
@@ -0,0 +1,20 @@
+"""Tests for `mdns_beacon` package."""
+
+import pytest
+
+import mdns_beacon
+from mdns_beacon.beacon import Beacon
+from mdns_beacon.listener import BeaconListener
+
+
+def test_lazy_attributes() -> None:
+    """Test the beacon and listener classes are exported on first access."""
+    assert mdns_beacon.Beacon is Beacon
+    assert mdns_beacon.BeaconListener is BeaconListener
+    assert {"Beacon", "BeaconListener", "__version__"} <= set(dir(mdns_beacon))
+
+
+def test_missing_attribute() -> None:
+    """Test accessing a missing attribute of the package."""
+    with pytest.raises(AttributeError, match="no attribute 'Missing'"):
+        mdns_beacon.Missing  # type: ignore[attr-defined]  # noqa: B018
@@ -0,0 +1,89 @@
+"""Tests for `interfaces` module."""
+
+from ipaddress import ip_address
+from typing import List, Optional
+
+import ifaddr
+import pytest
+from zeroconf import InterfaceChoice, InterfacesType, IPVersion
+
+from mdns_beacon.interfaces import interface_addresses, select_interfaces
+
+
+@pytest.mark.parametrize(
+    "ip_version,expected",
+    [
+        (None, ["127.0.0.1/8", "192.168.1.10/24", "10.0.0.5/8"]),
+        (IPVersion.V6Only, ["fe80::1/64"]),
+        (IPVersion.All, ["127.0.0.1/8", "192.168.1.10/24", "fe80::1/64", "10.0.0.5/8"]),
+    ],
+)
+def test_interface_addresses(
+    adapters: List[ifaddr.Adapter], ip_version: Optional[IPVersion], expected: List[str]
+) -> None:
+    """Test the network interface addresses of an IP version."""
+    assert [str(address.interface) for address in interface_addresses(ip_version)] == expected
+
+
+@pytest.mark.parametrize(
+    "interfaces,ip_version,expected",
+    [
+        ([], None, InterfaceChoice.All),
+        (["default"], None, InterfaceChoice.Default),
+        (["eth0"], None, ["192.168.1.10"]),
+        (["eth0"], IPVersion.All, ["192.168.1.10", 2]),
+        (["10.0.0.0/8", "lo", "lo"], None, ["10.0.0.5", "127.0.0.1"]),
+        (["192.168.1.10"], None, ["192.168.1.10"]),
+    ],
+)
+def test_select_interfaces(
+    adapters: List[ifaddr.Adapter],
+    interfaces: List[str],
+    ip_version: Optional[IPVersion],
+    expected: InterfacesType,
+) -> None:
+    """Test select network interfaces by name, address or network."""
+    assert select_interfaces(interfaces, ip_version) == expected
+
+
+@pytest.mark.parametrize(
+    "interfaces,addresses,expected",
+    [
+        ([], ["192.168.1.20"], ["192.168.1.10"]),
+        ([], ["192.168.1.20", "10.1.2.3"], ["192.168.1.10", "10.0.0.5"]),
+        ([], ["127.0.0.1"], InterfaceChoice.All),
+        ([], ["203.0.113.1"], InterfaceChoice.All),
+        (["eth1"], ["192.168.1.20"], ["10.0.0.5"]),
+        (["eth0", "eth1"], ["10.1.2.3"], ["10.0.0.5"]),
+    ],
+)
+def test_select_interfaces_subnet(
+    adapters: List[ifaddr.Adapter],
+    interfaces: List[str],
+    addresses: List[str],
+    expected: InterfacesType,
+) -> None:
+    """Test only the interfaces on the subnet of the addresses are selected."""
+    assert (
+        select_interfaces(interfaces, addresses=[ip_address(address) for address in addresses])
+        == expected
+    )
+
+
+@pytest.mark.parametrize(
+    "interfaces,ip_version,match",
+    [
+        (["wlan0"], None, "wlan0"),
+        (["fe80::/64"], None, "fe80::/64"),
+        (["default", "eth0"], None, "combined"),
+    ],
+)
+def test_select_interfaces_invalid(
+    adapters: List[ifaddr.Adapter],
+    interfaces: List[str],
+    ip_version: Optional[IPVersion],
+    match: str,
+) -> None:
+    """Test select unknown or incompatible network interfaces."""
+    with pytest.raises(ValueError, match=match):
+        select_interfaces(interfaces, ip_version)
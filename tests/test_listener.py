@@ -1,12 +1,18 @@
 """Tests for `listener` module."""
 
-from asyncio import AbstractEventLoop
-from typing import Any, Dict, Set
+import asyncio
+import contextlib
+import threading
+import time
+from typing import Any, Dict, List, Set, Tuple
 
 import pytest
-from zeroconf import IPVersion
+from pytest_mock import MockerFixture
+from zeroconf import IPVersion, ServiceStateChange
 
+from mdns_beacon.beacon import Beacon
 from mdns_beacon.listener import BeaconListener
+from mdns_beacon.service_types import ServiceTypesCache
 
 from .helpers.contextmanager import raise_keyboard_interrupt
 
@@ -47,7 +53,6 @@ from .helpers.contextmanager import raise_keyboard_interrupt
     ],
 )
 def test_beacon_listener(
-    safe_loop: AbstractEventLoop,
     beacon_params: Dict[str, Any],
     expected_services: Set[str],
 ) -> None:
@@ -62,9 +67,303 @@ def test_beacon_listener(
 
     assert expected_services.issubset(listener.services)
 
+    assert not listener._browsers
+    assert not listener._zeroconf
+
     listener.stop()
 
-    # asserting the loop is stopped but not closed
-    assert not safe_loop.is_running()
-    assert not safe_loop.is_closed()
-    safe_loop.close.assert_called_once_with()  # type: ignore
+
+@pytest.mark.slow
+def test_beacon_listener_scan() -> None:
+    """Test the scan stops once the maximum number of services is found."""
+    beacon = Beacon(aliases=["scan-a", "scan-b"], type_="scantest")
+    beacon._execute()
+    listener = BeaconListener(handlers=[], services=["_scantest._tcp.local."])
+    try:
+        start = time.perf_counter()
+        records = listener.scan(duration=10, max_results=2)
+        elapsed = time.perf_counter() - start
+    finally:
+        listener.stop()
+        beacon.stop()
+
+    assert sorted(record.name for record in records) == [
+        "scan-a._scantest._tcp.local.",
+        "scan-b._scantest._tcp.local.",
+    ]
+    assert all(record.port == 80 for record in records)
+    assert elapsed < 10
+
+
+def test_beacon_listener_scan_quiet() -> None:
+    """Test the scan stops early once the network is quiet."""
+    listener = BeaconListener(handlers=[], services=["_nothing._tcp.local."])
+    try:
+        start = time.perf_counter()
+        records = listener.scan(duration=10, quiet_interval=0.2)
+        elapsed = time.perf_counter() - start
+    finally:
+        listener.stop()
+
+    assert records == []
+    assert elapsed < 2
+
+
+async def test_wait_scan_busy() -> None:
+    """Test the quiet interval is not applied while services are being resolved."""
+    loop = asyncio.get_running_loop()
+    activity = asyncio.Event()
+    start = loop.time()
+
+    await BeaconListener._async_wait_scan(
+        activity, start + 0.3, 0.05, done=lambda: False, busy=lambda: True
+    )
+    assert loop.time() - start >= 0.3
+
+    loop.call_later(0.05, activity.set)
+    await BeaconListener._async_wait_scan(
+        activity, loop.time() + 5, 0.2, done=lambda: activity.is_set(), busy=lambda: False
+    )
+    assert loop.time() - start < 1
+
+
+@pytest.mark.slow
+def test_beacon_listener_discover_types() -> None:
+    """Test the cached service types are browsed right away, and new types on the fly."""
+    types_cache = ServiceTypesCache()
+    types_cache.update({"_cached._tcp.local."})
+    beacon = Beacon(aliases=["discover"], type_="discovertest")
+    beacon._execute()
+    listener = BeaconListener(
+        handlers=[lambda *args, **kwargs: None], timeout=1, types_cache=types_cache
+    )
+    assert listener.discover_types
+    assert "_cached._tcp.local." in listener.services
+    try:
+        start = time.perf_counter()
+        listener._execute()
+        while "_discovertest._tcp.local." not in listener.services:
+            assert time.perf_counter() - start < 1
+            time.sleep(0.01)
+
+        assert listener._browsers
+        assert len(listener._browsers.browsers) >= 3
+        time.sleep(1.5)
+        assert "_discovertest._tcp.local." in (types_cache.get() or ())
+    finally:
+        listener.stop()
+        beacon.stop()
+    assert not listener._browsers
+
+
+async def test_beacon_listener_cache_types(mocker: MockerFixture) -> None:
+    """Test the service types found later are cached at most every `timeout`, and on stop."""
+    types_cache = ServiceTypesCache()
+    listener = BeaconListener(handlers=[], timeout=0.05, types_cache=types_cache)
+    browsers = mocker.MagicMock(found_types={"_a._tcp.local."}, async_cancel=mocker.AsyncMock())
+    listener._browsers = browsers
+    listener._on_found_type("_a._tcp.local.")
+    await asyncio.sleep(0.2)
+    assert types_cache.get() == {"_a._tcp.local."}
+
+    for name in ("_b._tcp.local.", "_c._tcp.local."):
+        browsers.found_types.add(name)
+        listener._on_found_type(name)
+    assert listener._types_timer
+    await asyncio.sleep(0.2)
+    assert types_cache.get() == {"_a._tcp.local.", "_b._tcp.local.", "_c._tcp.local."}
+
+    browsers.found_types.add("_d._tcp.local.")
+    listener._on_found_type("_d._tcp.local.")
+    await listener._async_cancel()
+    assert types_cache.get() == browsers.found_types
+    assert not listener._types_timer
+
+
+async def test_beacon_listener_cache_types_cut_short(mocker: MockerFixture) -> None:
+    """Test the service types are not cached when stopped within the first `timeout`."""
+    types_cache = ServiceTypesCache()
+    listener = BeaconListener(handlers=[], timeout=60, types_cache=types_cache)
+    listener._browsers = mocker.MagicMock(
+        found_types={"_a._tcp.local."}, async_cancel=mocker.AsyncMock()
+    )
+    listener._on_found_type("_a._tcp.local.")
+
+    await listener._async_cancel()
+
+    assert types_cache.get() is None
+
+
+@pytest.mark.slow
+def test_beacon_listener_scan_discover_types() -> None:
+    """Test the scan browses the service types as they are discovered."""
+    types_cache = ServiceTypesCache()
+    beacon = Beacon(aliases=["scan-discover"], type_="scandiscover")
+    beacon._execute()
+    listener = BeaconListener(handlers=[], types_cache=types_cache)
+    try:
+        records = listener.scan(duration=5, quiet_interval=0.5)
+    finally:
+        listener.stop()
+        beacon.stop()
+
+    assert "scan-discover._scandiscover._tcp.local." in [record.name for record in records]
+    assert "_scandiscover._tcp.local." in (types_cache.get() or ())
+
+
+@pytest.mark.slow
+def test_beacon_listener_coalesce() -> None:
+    """Test the handlers are called from the dispatcher, once per coalesced service change."""
+    events = []
+    beacon = Beacon(aliases=["coalesce-a", "coalesce-b"], type_="coalescetest")
+    beacon._execute()
+    listener = BeaconListener(
+        handlers=[lambda **kwargs: events.append((kwargs["name"], kwargs["state_change"]))],
+        services=["_coalescetest._tcp.local."],
+        coalesce_window=0.2,
+        max_workers=1,
+    )
+    try:
+        listener._execute()
+        assert listener._dispatcher
+        time.sleep(1.5)
+    finally:
+        listener.stop()
+        beacon.stop()
+
+    assert sorted(events) == [
+        ("coalesce-a._coalescetest._tcp.local.", ServiceStateChange.Added),
+        ("coalesce-b._coalescetest._tcp.local.", ServiceStateChange.Added),
+    ]
+    assert not listener._dispatcher
+
+
+def test_beacon_listener_handler_thread(mocker: MockerFixture) -> None:
+    """Test the handlers are called in order from a single worker, off the zeroconf event loop."""
+    calls: List[Tuple[str, str]] = []
+
+    def _failing(**kwargs: object) -> None:
+        raise RuntimeError("handler failure")
+
+    listener = BeaconListener(
+        handlers=[
+            _failing,
+            lambda **kwargs: calls.append((threading.current_thread().name, kwargs["name"])),
+        ],
+        services=["_http._tcp.local."],
+    )
+    names = [f"service-{i}._http._tcp.local." for i in range(10)]
+
+    listener._start_handlers()
+    for name in names:
+        for handler in listener._browser_handlers:
+            handler(mocker.MagicMock(), "_http._tcp.local.", name, ServiceStateChange.Added)
+    listener._close_handlers()
+
+    assert [name for _, name in calls] == names
+    assert len({thread for thread, _ in calls}) == 1
+    assert calls[0][0].startswith("mdns-beacon-dispatch")
+    assert not listener._dispatcher
+
+
+def test_beacon_listener_handlers_bounded(mocker: MockerFixture) -> None:
+    """Test the state changes received while a handler is busy are coalesced, not queued."""
+    released = threading.Event()
+
+    def _slow(**kwargs: object) -> None:
+        released.wait(5)
+
+    listener = BeaconListener(handlers=[_slow], services=["_http._tcp.local."])
+    names = [f"service-{i}._http._tcp.local." for i in range(3)]
+
+    listener._start_handlers()
+    for _ in range(1000):
+        for name in names:
+            for state_change in (ServiceStateChange.Updated, ServiceStateChange.Removed):
+                for handler in listener._browser_handlers:
+                    handler(mocker.MagicMock(), "_http._tcp.local.", name, state_change)
+
+    assert listener._dispatcher
+    assert listener._dispatcher.pending <= len(names)
+    released.set()
+    listener._close_handlers()
+
+
+async def test_beacon_listener_async_stop(mocker: MockerFixture) -> None:
+    """Test stopping waits for the handlers without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    results: List[int] = []
+
+    async def _answer() -> int:
+        return 42
+
+    def _handler(**kwargs: object) -> None:
+        # The handler waits for a coroutine of the event loop being stopped
+        results.append(asyncio.run_coroutine_threadsafe(_answer(), loop).result(timeout=5))
+
+    listener = BeaconListener(handlers=[_handler], services=["_http._tcp.local."])
+    listener._start_handlers()
+    for handler in listener._browser_handlers:
+        handler(
+            mocker.MagicMock(),
+            "_http._tcp.local.",
+            "a._http._tcp.local.",
+            ServiceStateChange.Added,
+        )
+    await listener.async_stop()
+
+    assert results == [42]
+
+
+@pytest.mark.slow
+async def test_beacon_listener_events() -> None:
+    """Test the service events are iterated from the zeroconf event loop."""
+    beacon = Beacon(aliases=["events-a", "events-b"], type_="eventstest")
+    await beacon.async_start()
+    listener = BeaconListener(handlers=[], services=["_eventstest._tcp.local."])
+    names = []
+    try:
+        async with contextlib.aclosing(listener.events(overflow="coalesce")) as events:
+            async for event in events:
+                assert event.state_change is ServiceStateChange.Added
+                names.append(event.name)
+                if len(names) == 2:
+                    break
+        assert listener.zeroconf.loop is asyncio.get_running_loop()
+    finally:
+        await listener.async_stop()
+        await beacon.async_stop()
+
+    assert sorted(names) == [
+        "events-a._eventstest._tcp.local.",
+        "events-b._eventstest._tcp.local.",
+    ]
+
+
+@pytest.mark.slow
+async def test_beacon_listener_events_block_foreign_loop() -> None:
+    """Test the block policy never blocks zeroconf running in another thread."""
+    loop = asyncio.get_running_loop()
+    beacon = Beacon(aliases=[f"block-{i}" for i in range(6)], type_="blocktest")
+    listener = BeaconListener(handlers=[], services=["_blocktest._tcp.local."])
+    # Acquired outside the running event loop, zeroconf runs in its own thread
+    zeroconf = await loop.run_in_executor(None, lambda: listener.zeroconf)
+    assert zeroconf.loop and zeroconf.loop is not loop
+    await loop.run_in_executor(None, beacon._execute)
+    try:
+        events = listener.events(max_size=1, overflow="block")
+        first = await asyncio.wait_for(events.__anext__(), 10)
+        # Let the other events overflow the queue while it is not consumed
+        await asyncio.sleep(1)
+
+        async def _ping() -> bool:
+            return True
+
+        future = asyncio.run_coroutine_threadsafe(_ping(), zeroconf.loop)
+        assert await asyncio.wait_for(asyncio.wrap_future(future), 1)
+        await asyncio.wait_for(events.aclose(), 5)
+    finally:
+        await loop.run_in_executor(None, listener.stop)
+        await loop.run_in_executor(None, beacon.stop)
+
+    assert first.state_change is ServiceStateChange.Added
@@ -0,0 +1,202 @@
+"""Tests for `metrics` module."""
+
+import time
+import urllib.error
+import urllib.request
+from typing import Any, Generator, List
+
+import pytest
+from click.testing import CliRunner
+from pytest_mock import MockerFixture
+from zeroconf import ServiceStateChange
+from zeroconf._services.registry import ServiceRegistry
+from zeroconf.asyncio import AsyncServiceInfo
+
+from mdns_beacon.announcer import Announcer
+from mdns_beacon.cli.main import main
+from mdns_beacon.dispatch import EventDispatcher
+from mdns_beacon.listener import BeaconListener
+from mdns_beacon.metrics import CONTENT_TYPE, Counter, Gauge, Histogram, Metrics, metrics
+from mdns_beacon.resolver import ServiceResolver
+
+from .test_announcer import build_infos
+
+SERVICE_TYPE = "_http._tcp.local."
+
+
+@pytest.fixture
+def enabled_metrics() -> Generator[Metrics, None, None]:
+    """Enable the metrics of the process."""
+    metrics.enabled = True
+    yield metrics
+    metrics.enabled = False
+
+
+def test_counter_render() -> None:
+    """Test counters and gauges render a sample per label values."""
+    counter = Counter("events_total", "Events.", ("kind",))
+    counter.inc("a")
+    counter.inc('say "hi"\n', amount=2)
+    gauge = Gauge("running", "Running.")
+    gauge.inc(amount=3)
+    gauge.dec()
+
+    assert counter.render().splitlines() == [
+        "# HELP events_total Events.",
+        "# TYPE events_total counter",
+        'events_total{kind="a"} 1',
+        'events_total{kind="say \\"hi\\"\\n"} 2',
+    ]
+    assert gauge.render().splitlines()[-1] == "running 2"
+
+
+def test_histogram_render() -> None:
+    """Test histograms render cumulative buckets, sum and count."""
+    histogram = Histogram("latency_seconds", "Latency.", ("op",), buckets=(0.25, 1))
+    for value in (0.125, 0.25, 0.5, 3):
+        histogram.observe(value, "register")
+
+    assert histogram.count("register") == 4
+    assert histogram.render().splitlines()[2:] == [
+        'latency_seconds_bucket{op="register",le="0.25"} 2',
+        'latency_seconds_bucket{op="register",le="1.0"} 3',
+        'latency_seconds_bucket{op="register",le="+Inf"} 4',
+        'latency_seconds_sum{op="register"} 3.875',
+        'latency_seconds_count{op="register"} 4',
+    ]
+
+
+def test_metrics_serve() -> None:
+    """Test the metrics are exported from an HTTP endpoint."""
+    exported = Metrics()
+    server = exported.serve(0)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        assert exported.enabled
+        exported.service_events.inc("Added")
+        with urllib.request.urlopen(f"{url}/metrics") as response:  # noqa: S310
+            assert response.headers["Content-Type"] == CONTENT_TYPE
+            body = response.read().decode()
+        assert 'mdns_beacon_service_events_total{state_change="Added"} 1' in body
+        assert "# TYPE mdns_beacon_render_seconds histogram" in body
+
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"{url}/other")  # noqa: S310
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+async def test_metrics_announcer(mocker: MockerFixture, enabled_metrics: Metrics) -> None:
+    """Test the registered services and the registration latencies are recorded."""
+    zeroconf = mocker.MagicMock()
+    zeroconf.async_wait_for_start = mocker.AsyncMock()
+    zeroconf.async_check_service = mocker.AsyncMock()
+    zeroconf.registry = ServiceRegistry()
+    mocker.patch("mdns_beacon.announcer._REGISTER_TIME", 0)
+    mocker.patch("mdns_beacon.announcer._UNREGISTER_TIME", 0)
+    announcer = Announcer(zeroconf)
+    infos = build_infos(3)
+    registered = enabled_metrics.services_registered.value()
+    latencies = enabled_metrics.registration_seconds
+
+    await announcer.async_register(infos)
+    assert enabled_metrics.services_registered.value() == registered + 3
+    await announcer.async_update(infos[:1])
+    await announcer.async_unregister([*infos, *infos])
+
+    assert enabled_metrics.services_registered.value() == registered
+    assert latencies.count("register") >= 3
+    assert latencies.count("update") >= 1
+    assert latencies.count("unregister") >= 1
+
+
+async def test_metrics_resolver(mocker: MockerFixture, enabled_metrics: Metrics) -> None:
+    """Test the resolution latencies and failures are recorded."""
+    mocker.patch.object(AsyncServiceInfo, "async_request", side_effect=[True, False])
+    resolver = ServiceResolver(mocker.MagicMock())
+    failures = enabled_metrics.resolution_failures
+    resolved = enabled_metrics.resolution_seconds.count()
+    no_response, bad_name = failures.value("no_response"), failures.value("bad_name")
+
+    assert await resolver.async_resolve(SERVICE_TYPE, f"example.{SERVICE_TYPE}")
+    assert not await resolver.async_resolve(SERVICE_TYPE, f"other.{SERVICE_TYPE}")
+    assert not await resolver.async_resolve(SERVICE_TYPE, "wrong")
+
+    assert enabled_metrics.resolution_seconds.count() == resolved + 1
+    assert failures.value("no_response") == no_response + 1
+    assert failures.value("bad_name") == bad_name + 1
+
+
+def test_metrics_dispatcher(mocker: MockerFixture, enabled_metrics: Metrics) -> None:
+    """Test the execution time of the dispatched handlers is recorded."""
+    handled = enabled_metrics.handler_seconds.count()
+    dispatcher = EventDispatcher([lambda **kwargs: time.sleep(0.01)], window=0)
+
+    dispatcher(
+        mocker.MagicMock(), SERVICE_TYPE, f"example.{SERVICE_TYPE}", ServiceStateChange.Added
+    )
+    dispatcher.close()
+
+    assert enabled_metrics.handler_seconds.count() == handled + 1
+
+
+@pytest.mark.parametrize("coalesce_window", [None, 0])
+def test_metrics_listener_handlers(
+    mocker: MockerFixture, enabled_metrics: Metrics, coalesce_window: Any  # noqa: ANN401
+) -> None:
+    """Test the listener counts the events and times the handlers."""
+    events: List[ServiceStateChange] = []
+    listener = BeaconListener(
+        handlers=[lambda **kwargs: events.append(kwargs["state_change"])],
+        services=[SERVICE_TYPE],
+        coalesce_window=coalesce_window,
+    )
+    listener._start_handlers()
+    added = enabled_metrics.service_events.value("Added")
+    handled = enabled_metrics.handler_seconds.count()
+
+    for handler in listener._browser_handlers:
+        handler(
+            zeroconf=mocker.MagicMock(),
+            service_type=SERVICE_TYPE,
+            name=f"example.{SERVICE_TYPE}",
+            state_change=ServiceStateChange.Added,
+        )
+    listener._close_handlers()
+
+    assert events == [ServiceStateChange.Added]
+    assert enabled_metrics.service_events.value("Added") == added + 1
+    assert enabled_metrics.handler_seconds.count() == handled + 1
+
+
+def test_metrics_disabled(mocker: MockerFixture) -> None:
+    """Test the listener events are not counted while the metrics are disabled."""
+    listener = BeaconListener(handlers=[mocker.MagicMock()])
+    listener._start_handlers()
+
+    assert listener._browser_handlers == [listener._dispatcher]
+    listener._close_handlers()
+
+
+def test_cli_metrics_port(mocker: MockerFixture) -> None:
+    """Test the metrics endpoint is served while the command runs."""
+    serve = mocker.patch("mdns_beacon.metrics.metrics.serve")
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["--metrics-port", "9100", "listen", "--page", "0"])
+
+    serve.assert_called_once_with(9100)
+    serve.return_value.shutdown.assert_called_once_with()
+    assert result.exit_code == 2
+
+
+def test_cli_metrics_port_in_use(mocker: MockerFixture) -> None:
+    """Test the metrics port must be available."""
+    mocker.patch("mdns_beacon.metrics.metrics.serve", side_effect=OSError("in use"))
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["--metrics-port", "9100", "listen"])
+
+    assert result.exit_code == 2
+    assert "--metrics-port" in result.output
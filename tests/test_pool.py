@@ -0,0 +1,111 @@
+"""Tests for `pool` module."""
+
+from typing import Optional
+
+import pytest
+from pytest_mock import MockerFixture
+from zeroconf import InterfaceChoice, IPVersion
+
+from mdns_beacon.beacon import Beacon
+from mdns_beacon.listener import BeaconListener
+from mdns_beacon.pool import ZeroconfPool, zeroconf_pool
+
+
+@pytest.mark.parametrize("ip_version", [None, IPVersion.V4Only])
+def test_pool_reference_count(mocker: MockerFixture, ip_version: Optional[IPVersion]) -> None:
+    """Test zeroconf instances are shared and closed by the last user."""
+    zeroconf_class = mocker.patch("mdns_beacon.pool.Zeroconf")
+    zeroconf_class.side_effect = lambda **kwargs: mocker.MagicMock()
+    pool = ZeroconfPool()
+
+    first = pool.acquire(ip_version=ip_version)
+    second = pool.acquire(ip_version=ip_version)
+    other = pool.acquire(ip_version=IPVersion.V6Only)
+    assert first is second
+    assert first is not other
+    assert len(pool) == 2
+
+    pool.release(first)
+    first.close.assert_not_called()  # type: ignore[attr-defined]
+
+    pool.release(second)
+    first.close.assert_called_once_with()  # type: ignore[attr-defined]
+    assert len(pool) == 1
+
+    pool.release(other)
+    other.close.assert_called_once_with()  # type: ignore[attr-defined]
+    assert not len(pool)
+
+
+def test_pool_interfaces_key(mocker: MockerFixture) -> None:
+    """Test zeroconf instances are keyed by interface set."""
+    zeroconf_class = mocker.patch("mdns_beacon.pool.Zeroconf")
+    zeroconf_class.side_effect = lambda **kwargs: mocker.MagicMock()
+    pool = ZeroconfPool()
+
+    assert pool.acquire(interfaces=["127.0.0.1", "::1"]) is pool.acquire(
+        interfaces=["::1", "127.0.0.1"]
+    )
+    assert pool.acquire(interfaces=["127.0.0.1"]) is not pool.acquire(
+        interfaces=InterfaceChoice.All
+    )
+
+
+def test_pool_release_unmanaged(mocker: MockerFixture) -> None:
+    """Test zeroconf instances not created by the pool are closed on release."""
+    zeroconf = mocker.MagicMock()
+
+    ZeroconfPool().release(zeroconf)
+
+    zeroconf.close.assert_called_once_with()
+
+
+def test_pool_share(mocker: MockerFixture) -> None:
+    """Test sharing a zeroconf instance adds a user to it."""
+    zeroconf_class = mocker.patch("mdns_beacon.pool.Zeroconf")
+    zeroconf_class.side_effect = lambda **kwargs: mocker.MagicMock()
+    pool = ZeroconfPool()
+    zeroconf = pool.acquire()
+
+    assert pool.share(zeroconf) is zeroconf
+    pool.release(zeroconf)
+    zeroconf.close.assert_not_called()  # type: ignore[attr-defined]
+    pool.release(zeroconf)
+    zeroconf.close.assert_called_once_with()  # type: ignore[attr-defined]
+
+    with pytest.raises(ValueError, match="not managed"):
+        pool.share(zeroconf)
+
+
+async def test_pool_async_release(mocker: MockerFixture) -> None:
+    """Test zeroconf instances acquired in a running loop are closed asynchronously."""
+    pool = ZeroconfPool()
+
+    zeroconf = pool.acquire()
+    assert pool.acquire() is zeroconf
+
+    await pool.async_release(zeroconf)
+    assert not zeroconf.done
+
+    await pool.async_release(zeroconf)
+    assert zeroconf.done
+    assert not len(pool)
+
+
+@pytest.mark.slow
+def test_beacons_share_zeroconf() -> None:
+    """Test beacons and listeners share a zeroconf instance."""
+    beacon = Beacon()
+    listener = BeaconListener(
+        handlers=[lambda *args, **kwargs: None], services=["_http._tcp.local."]
+    )
+
+    assert beacon.zeroconf is listener.zeroconf
+
+    zeroconf = beacon.zeroconf
+    beacon.stop()
+    assert not zeroconf.done
+
+    listener.stop()
+    assert zeroconf.done
+    assert not len(zeroconf_pool)
@@ -0,0 +1,81 @@
+"""Tests for `readiness` module."""
+
+import asyncio
+import time
+from ipaddress import ip_address
+from typing import Set
+
+import pytest
+from pytest_mock import MockerFixture
+
+from mdns_beacon.beacon import Beacon
+from mdns_beacon.readiness import Address, ReadinessGate, is_bindable
+
+# TEST-NET-3 address, never configured on the test hosts
+UNAVAILABLE = ip_address("203.0.113.1")
+
+
+def test_is_bindable() -> None:
+    """Test the availability of local addresses."""
+    assert is_bindable(ip_address("127.0.0.1"))
+    assert not is_bindable(UNAVAILABLE)
+
+
+async def test_gate_ready() -> None:
+    """Test available addresses do not wait."""
+    gate = ReadinessGate()
+
+    start = time.monotonic()
+    assert await gate.async_wait([ip_address("127.0.0.1")], timeout=10)
+    assert time.monotonic() - start < 1
+
+
+async def test_gate_timeout() -> None:
+    """Test the timeout is an upper bound of the wait."""
+    gate = ReadinessGate(interval=0.01)
+
+    start = time.monotonic()
+    assert not await gate.async_wait([UNAVAILABLE], timeout=0.2)
+    assert 0.2 <= time.monotonic() - start < 1
+    assert not await gate.async_wait([UNAVAILABLE], timeout=0)
+
+
+async def test_gate_shared_wait(mocker: MockerFixture) -> None:
+    """Test waiters of the same address share its polling and start once it is bindable."""
+    available: Set[Address] = set()
+    is_bindable = mocker.patch(
+        "mdns_beacon.readiness.is_bindable", side_effect=lambda address: address in available
+    )
+    gate = ReadinessGate(interval=0.01)
+
+    waiters = asyncio.gather(*(gate.async_wait([UNAVAILABLE], timeout=10) for _ in range(50)))
+    await asyncio.sleep(0.1)
+    assert len(gate._probes) == 1
+    checks = is_bindable.call_count
+    assert checks < 50 + 20
+
+    start = time.monotonic()
+    available.add(UNAVAILABLE)
+    assert await waiters == [True] * 50
+    assert time.monotonic() - start < 1
+    assert not gate._probes
+
+
+async def test_beacon_async_start_waits_ready(mocker: MockerFixture) -> None:
+    """Test beacons register their services once the addresses are bindable."""
+    wait = mocker.patch("mdns_beacon.beacon.readiness_gate.async_wait", return_value=True)
+    register = mocker.patch.object(Beacon, "async_register_services")
+    beacon = Beacon(aliases=["example"], addresses=[UNAVAILABLE], delay_startup=30)
+
+    await beacon.async_start()
+
+    wait.assert_awaited_once_with({UNAVAILABLE}, timeout=30)
+    register.assert_awaited_once_with()
+
+
+@pytest.mark.parametrize("delay_startup", [0, 5])
+async def test_beacon_async_wait_ready(delay_startup: int) -> None:
+    """Test a beacon on the loopback address is ready immediately."""
+    beacon = Beacon(aliases=["example"], delay_startup=delay_startup)
+
+    assert await beacon.async_wait_ready()
@@ -0,0 +1,104 @@
+"""Tests for `resolver` module."""
+
+import asyncio
+import threading
+import time
+from typing import Generator, List
+
+import pytest
+from pytest_mock import MockerFixture
+from zeroconf.asyncio import AsyncServiceInfo
+
+from mdns_beacon.resolver import ServiceResolver
+
+SERVICE_TYPE = "_http._tcp.local."
+
+
+@pytest.fixture
+def zeroconf_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
+    """Event loop running in a thread, as the zeroconf one."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield loop
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def test_resolver_invalid_max_concurrency(mocker: MockerFixture) -> None:
+    """Test the resolver needs at least one concurrent resolution."""
+    with pytest.raises(ValueError):
+        ServiceResolver(mocker.MagicMock(), max_concurrency=0)
+
+
+async def test_resolver_bounded_concurrency(mocker: MockerFixture) -> None:
+    """Test services are resolved in parallel, at most `max_concurrency` at once."""
+    running: List[str] = []
+    peak = 0
+
+    async def _request(info: AsyncServiceInfo, *args: object) -> bool:
+        nonlocal peak
+        running.append(info.name)
+        peak = max(peak, len(running))
+        await asyncio.sleep(0.05)
+        running.remove(info.name)
+        return True
+
+    mocker.patch.object(AsyncServiceInfo, "async_request", new=_request)
+    resolver = ServiceResolver(mocker.MagicMock(), max_concurrency=4)
+
+    infos = await asyncio.gather(
+        *(resolver.async_resolve(SERVICE_TYPE, f"sub{i}.{SERVICE_TYPE}") for i in range(20))
+    )
+
+    assert all(infos)
+    assert peak == 4
+
+
+async def test_resolver_deadline(mocker: MockerFixture) -> None:
+    """Test the deadline includes the time waiting for a free slot."""
+    timeouts: List[int] = []
+
+    async def _request(info: AsyncServiceInfo, zeroconf: object, timeout: int) -> bool:
+        timeouts.append(timeout)
+        await asyncio.sleep(timeout / 1000)
+        return False
+
+    mocker.patch.object(AsyncServiceInfo, "async_request", new=_request)
+    resolver = ServiceResolver(mocker.MagicMock(), max_concurrency=1, timeout=0.1)
+
+    start = time.monotonic()
+    infos = await asyncio.gather(
+        *(resolver.async_resolve(SERVICE_TYPE, f"sub{i}.{SERVICE_TYPE}") for i in range(3))
+    )
+
+    assert infos == [None, None, None]
+    assert 0 < timeouts[0] <= 100
+    assert time.monotonic() - start < 0.2
+
+
+def test_resolver_supersede_and_cancel(
+    mocker: MockerFixture, zeroconf_loop: asyncio.AbstractEventLoop
+) -> None:
+    """Test a new resolution supersedes the pending one, and pending ones can be cancelled."""
+
+    async def _request(info: AsyncServiceInfo, *args: object) -> bool:
+        await asyncio.sleep(10)
+        return True  # pragma: no cover
+
+    mocker.patch.object(AsyncServiceInfo, "async_request", new=_request)
+    resolver = ServiceResolver(mocker.MagicMock(loop=zeroconf_loop))
+    name = f"example.{SERVICE_TYPE}"
+
+    first = resolver.resolve(SERVICE_TYPE, name)
+    second = resolver.resolve(SERVICE_TYPE, name)
+    other = resolver.resolve(SERVICE_TYPE, f"other.{SERVICE_TYPE}")
+
+    assert first.cancelled()
+    assert not second.done()
+    resolver.cancel(SERVICE_TYPE, name)
+    assert second.cancelled()
+    resolver.cancel_all()
+    assert other.cancelled()
+    assert not resolver._pending
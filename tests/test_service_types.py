@@ -0,0 +1,63 @@
+"""Tests for `service_types` module."""
+
+import json
+from pathlib import Path
+
+from pytest_mock import MockerFixture
+
+from mdns_beacon.service_types import ServiceTypesCache
+
+SERVICE_TYPES = {"_http._tcp.local.", "_ipp._tcp.local."}
+
+
+def test_cache_ttl(mocker: MockerFixture) -> None:
+    """Test the cached types expire after the TTL."""
+    now = mocker.patch("mdns_beacon.service_types.time.time", return_value=1000.0)
+    cache = ServiceTypesCache(ttl=60)
+    assert cache.get() is None
+
+    cache.update(SERVICE_TYPES)
+    now.return_value = 1059.0
+    assert cache.get() == SERVICE_TYPES
+
+    now.return_value = 1060.0
+    assert cache.get() is None
+
+    cache.update([])
+    assert cache.get() == set()
+    cache.clear()
+    assert cache.get() is None
+
+
+def test_cache_persisted(tmp_path: Path) -> None:
+    """Test the cached types are reused between runs."""
+    path = tmp_path / "cache" / "service-types.json"
+    ServiceTypesCache(path=path).update(SERVICE_TYPES)
+
+    assert json.loads(path.read_text())["types"] == sorted(SERVICE_TYPES)
+    assert ServiceTypesCache(path=path).get() == SERVICE_TYPES
+    assert ServiceTypesCache(ttl=0, path=path).get() is None
+    assert [p.name for p in path.parent.iterdir()] == [path.name]
+
+
+def test_cache_invalid_file(tmp_path: Path) -> None:
+    """Test a missing or invalid cache file is ignored."""
+    path = tmp_path / "service-types.json"
+    assert ServiceTypesCache(path=path).get() is None
+
+    path.write_text('{"types": ')
+    assert ServiceTypesCache(path=path).get() is None
+
+    path.write_text('{"types": ["_http._tcp.local."]}')
+    assert ServiceTypesCache(path=path).get() is None
+
+
+def test_cache_not_saved(tmp_path: Path) -> None:
+    """Test the types are kept in memory when the cache file can't be written."""
+    path = tmp_path / "file"
+    path.write_text("")
+    cache = ServiceTypesCache(path=path / "service-types.json")
+
+    cache.update(SERVICE_TYPES)
+
+    assert cache.get() == SERVICE_TYPES
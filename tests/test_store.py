@@ -0,0 +1,87 @@
+"""Tests for `store` module."""
+
+from ipaddress import ip_address
+
+import pytest
+
+from mdns_beacon.beacon import Beacon
+from mdns_beacon.store import ServiceRecord, ServiceStore
+
+SERVICE_TYPE = "_http._tcp.local."
+
+
+def test_record_from_info() -> None:
+    """Test a record keeps the resolved service info."""
+    beacon = Beacon(
+        aliases=["example"],
+        addresses=[ip_address("127.0.0.1"), ip_address("::1")],
+        properties={"path": "/", "flag": None},
+    )
+    info = beacon.services[0]
+
+    record = ServiceRecord.from_info(info)
+
+    assert record.key == (SERVICE_TYPE, f"example.{SERVICE_TYPE}")
+    assert record.ipv4_address == "127.0.0.1"
+    assert record.ipv6_address == "::1"
+    assert record.addresses == ("127.0.0.1", "::1")
+    assert (record.port, record.server, record.ttl) == (80, "example.local.", 60)
+    assert record.text == info.text.decode("utf8")
+    assert record.properties == {"path": "/", "flag": None}
+    assert record["port"] == 80
+    assert record == ServiceRecord.from_info(info)
+    with pytest.raises(KeyError):
+        record["wrong_column"]
+    with pytest.raises(AttributeError):
+        record.extra = True  # type: ignore[attr-defined]
+
+
+def test_store_upsert_remove() -> None:
+    """Test the store changes and its sequence counter."""
+    store = ServiceStore()
+    record = ServiceRecord(SERVICE_TYPE, f"a.{SERVICE_TYPE}", ipv4_addresses=("10.0.0.1",))
+
+    assert store.upsert(record)
+    assert not store.upsert(ServiceRecord(SERVICE_TYPE, record.name, ipv4_addresses=("10.0.0.1",)))
+    assert store.sequence == 1
+    assert record.key in store
+    assert store.get(record.key) is record
+    assert list(store) == [record]
+
+    assert store.remove(record.key) is record
+    assert store.remove(record.key) is None
+    assert store.sequence == 2
+    assert not len(store)
+
+
+def test_store_indexes() -> None:
+    """Test the services are looked up by type, server and address."""
+    store = ServiceStore()
+    a = ServiceRecord(SERVICE_TYPE, f"a.{SERVICE_TYPE}", ("10.0.0.1",), server="host.local.")
+    b = ServiceRecord(
+        "_hap._tcp.local.", "b._hap._tcp.local.", ("10.0.0.1",), ("fe80::1",), server="host.local."
+    )
+    for record in (a, b):
+        store.upsert(record)
+
+    assert store.by_type(SERVICE_TYPE) == [a]
+    assert sorted(r.name for r in store.by_server("host.local.")) == [a.name, b.name]
+    assert store.by_address("fe80::1") == [b]
+    assert len(store.by_address("10.0.0.1")) == 2
+
+    moved = ServiceRecord(SERVICE_TYPE, a.name, ("10.0.0.2",), server="other.local.")
+    store.upsert(moved)
+
+    assert store.by_address("10.0.0.1") == [b]
+    assert store.by_address("10.0.0.2") == [moved]
+    assert store.by_server("host.local.") == [b]
+
+    store.remove(b.key)
+    store.remove(moved.key)
+    assert not store._by_type and not store._by_server and not store._by_address
+
+    store.upsert(a)
+    store.clear()
+    assert not len(store)
+    assert store.by_type(SERVICE_TYPE) == []
+    assert store.sequence == 7
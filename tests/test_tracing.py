@@ -0,0 +1,57 @@
+"""Tests for `tracing` module."""
+
+import json
+import threading
+from pathlib import Path
+from typing import Generator
+
+import pytest
+
+from mdns_beacon.tracing import Tracer, traced, tracer
+
+
+@pytest.fixture
+def enabled_tracer() -> Generator[Tracer, None, None]:
+    """Enable the tracer of the process."""
+    tracer.start()
+    yield tracer
+    tracer.stop()
+
+
+@traced()
+def _double(value: int) -> int:
+    """Traced function."""
+    return value * 2
+
+
+def test_tracer_span() -> None:
+    """Test spans are recorded as complete events, keeping the latest ones."""
+    local = Tracer(max_spans=2)
+    for name in ("first", "second", "third"):
+        with local.span(name):
+            pass
+
+    events = [event for event in local.trace()["traceEvents"] if event["ph"] == "X"]
+    assert [event["name"] for event in events] == ["second", "third"]
+    assert all(event["dur"] >= 0 for event in events)
+    assert events[0]["tid"] == threading.get_ident()
+
+
+def test_traced_disabled() -> None:
+    """Test traced functions record nothing while the tracer is disabled."""
+    spans = len(tracer)
+
+    assert _double(2) == 4
+    assert len(tracer) == spans
+
+
+def test_traced(enabled_tracer: Tracer, tmp_path: Path) -> None:
+    """Test traced functions record a span per call, dumped as Chrome trace JSON."""
+    assert _double(2) == 4
+    path = tmp_path / "trace.json"
+
+    enabled_tracer.dump(path)
+
+    trace = json.loads(path.read_text())
+    assert [event["name"] for event in trace["traceEvents"] if event["ph"] == "X"] == ["_double"]
+    assert any(event["ph"] == "M" for event in trace["traceEvents"])